@@ -8,8 +8,13 @@ Core Modules:
 
 Execution:
     n8n_executor.py - N8N workflow format executor
+    compiled_workflow.py - Compiled, content-hash cached execution plans
+    result_cache.py - Memoized results of pure plugins
+    checkpoint.py - Checkpoint and resume of long-running executions
+    execution_report.py - Per-node NodeResult timing and run reports
     node_executor.py - Individual node execution
-    execution_order.py - Topological sort for node execution order
+    execution_order.py - Topological planner with levels and cycle detection
+    parallel_scheduler.py - Concurrent execution of independent branches
     loop_executor.py - Loop iteration execution
 
 N8N Support:
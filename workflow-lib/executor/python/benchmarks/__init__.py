@@ -0,0 +1,7 @@
+"""Benchmarks for the Python workflow executor.
+
+Scripts in this package use only the standard library. Standalone scripts
+can be run directly, e.g. ``python benchmarks/serve_vs_spawn.py``; the hot
+path suite imports the executor and runs as a module:
+``python -m autometabuilder.workflow.benchmarks.hot_paths run``.
+"""
@@ -0,0 +1,145 @@
+"""Measure blob download throughput for the ways blob_get can be served.
+
+Each blob is written to a temporary blob store and sent over a local
+socket pair to a reader thread that discards the bytes:
+
+``read``      read the whole file into memory, then sendall (the old way)
+``chunked``   RangeFile reads in BUFFER_SIZE chunks, as WSGI file wrappers
+              without sendfile do
+``sendfile``  os.sendfile straight from the page cache
+
+    python -m autometabuilder.workflow.benchmarks.blob_serving [--sizes 1,100,1024] [--repeat 3]
+
+Sizes are in MiB. The first pass over each blob warms the page cache, so
+the numbers compare copying costs rather than disk speed.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from ..plugins.packagerepo.blob_serving import BUFFER_SIZE, RangeFile, sendfile_range
+from ..plugins.packagerepo.blob_store import BlobStore
+
+MIB = 1024 * 1024
+
+
+def _send_read(sock: socket.socket, path: str, size: int) -> None:
+    sock.sendall(Path(path).read_bytes())
+
+
+def _send_chunked(sock: socket.socket, path: str, size: int) -> None:
+    source = RangeFile(path, 0, size)
+    try:
+        for chunk in iter(lambda: source.read(BUFFER_SIZE), b""):
+            sock.sendall(chunk)
+    finally:
+        source.close()
+
+
+def _send_sendfile(sock: socket.socket, path: str, size: int) -> None:
+    sendfile_range(sock, path, 0, size)
+
+
+STRATEGIES: Dict[str, Callable[[socket.socket, str, int], None]] = {
+    "read": _send_read,
+    "chunked": _send_chunked,
+    "sendfile": _send_sendfile,
+}
+
+
+def _drain(sock: socket.socket, expected: int, received: List[int]) -> None:
+    buffer = bytearray(BUFFER_SIZE)
+    total = 0
+    while total < expected:
+        count = sock.recv_into(buffer)
+        if not count:
+            break
+        total += count
+    received.append(total)
+
+
+def time_transfer(send: Callable[[socket.socket, str, int], None], path: str, size: int) -> float:
+    """Send one blob through a socket pair and return seconds elapsed."""
+    sender, receiver = socket.socketpair()
+    received: List[int] = []
+    reader = threading.Thread(target=_drain, args=(receiver, size, received))
+    try:
+        reader.start()
+        started = time.perf_counter()
+        send(sender, path, size)
+        reader.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        sender.close()
+        receiver.close()
+    if received != [size]:
+        raise RuntimeError(f"expected {size} bytes, received {received}")
+    return elapsed
+
+
+def _write_blob(store: BlobStore, size: int) -> str:
+    """Store size bytes of incompressible data and return the blob path."""
+    block = os.urandom(MIB)
+    chunks = (block[:min(MIB, size - offset)] for offset in range(0, size, MIB))
+    return str(store.put(chunks).path)
+
+
+def run(sizes_mib: List[int], repeat: int, directory: str = None) -> List[Dict[str, object]]:
+    """Benchmark every strategy for each size; returns best-of-repeat results."""
+    root = tempfile.mkdtemp(prefix="blob-bench-", dir=directory)
+    results = []
+    try:
+        store = BlobStore(root)
+        for size_mib in sizes_mib:
+            size = size_mib * MIB
+            path = _write_blob(store, size)
+            time_transfer(_send_sendfile, path, size)
+            for name, send in STRATEGIES.items():
+                best = min(time_transfer(send, path, size) for _ in range(repeat))
+                results.append({
+                    "sizeMiB": size_mib,
+                    "strategy": name,
+                    "seconds": best,
+                    "mibPerSecond": size_mib / best if best else float("inf"),
+                })
+            os.unlink(path)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Blob serving throughput")
+    parser.add_argument("--sizes", default="1,100,1024", help="Comma-separated blob sizes in MiB")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dir", default=None, help="Directory for the temporary blob store")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    results = run(sizes, max(args.repeat, 1), args.dir)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'size':>8}  {'strategy':<10}{'time':>12}{'throughput':>14}")
+    for result in results:
+        print(
+            f"{result['sizeMiB']:>5}MiB  {result['strategy']:<10}"
+            f"{result['seconds'] * 1e3:>10.1f}ms{result['mibPerSecond']:>9.0f}MiB/s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
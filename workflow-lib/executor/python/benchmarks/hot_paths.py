@@ -0,0 +1,258 @@
+"""Benchmark the executor hot paths and compare runs against a JSON baseline.
+
+Run from an environment where the package is importable:
+
+    python -m autometabuilder.workflow.benchmarks.hot_paths run --output baseline.json
+    python -m autometabuilder.workflow.benchmarks.hot_paths run --output current.json
+    python -m autometabuilder.workflow.benchmarks.hot_paths compare baseline.json current.json
+
+``compare`` exits with status 1 when any metric regressed by more than
+``--threshold`` (default 20%).
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from ..compiled_workflow import WorkflowPlanCache, compile_workflow
+from ..execution_order import build_execution_order
+from ..input_resolver import InputResolver
+from ..n8n_executor import N8NExecutor
+from ..n8n_schema import N8NWorkflow
+from ..plugin_registry import PluginRegistry, load_plugin_capabilities, load_plugin_map
+from ..result_cache import ResultCache
+from ..runtime import WorkflowRuntime
+from ..workflow_adapter import is_n8n_workflow
+from .synthetic import NOOP_TYPE, SHAPES
+
+DEFAULT_SIZES = (10, 1000, 10000)
+DEFAULT_THRESHOLD = 0.2
+MIN_SAMPLE_TIME = 0.05
+PACKAGE = __package__.rsplit(".", 1)[0]
+
+
+def noop_plugin(runtime, inputs):
+    """Plugin that does nothing, so only dispatch cost is measured."""
+    return None
+
+
+class NoopRegistry:
+    """Registry resolving the synthetic node type to the no-op plugin."""
+
+    def get(self, node_type):
+        return noop_plugin if node_type == NOOP_TYPE else None
+
+
+def measure(func: Callable[[], Any], repeat: int = 5) -> float:
+    """Return the best per-call time of func in seconds.
+
+    Each sample loops func until it has run for at least MIN_SAMPLE_TIME,
+    so fast operations are not dominated by timer resolution.
+    """
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_SAMPLE_TIME or loops >= 1_000_000:
+            break
+        loops *= 10
+
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, (time.perf_counter() - started) / loops)
+    return best
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Return the peak traced allocation of one call in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def import_time(module: str, repeat: int = 5) -> float:
+    """Return the median time to import module in a fresh interpreter."""
+    code = (
+        "import time; started = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - started)"
+    )
+    samples = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, sys.path))},
+        )
+        samples.append(float(completed.stdout.strip()))
+    return statistics.median(samples)
+
+
+def bench_workflow(shape: str, size: int) -> Dict[str, Dict[str, Any]]:
+    """Benchmark planning, binding resolution and dispatch for one workflow."""
+    workflow = SHAPES[shape](size)
+    nodes = workflow["nodes"]
+    connections = workflow["connections"]
+    key = f"{shape}.{size}"
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def record(name: str, value: float, unit: str) -> None:
+        results[f"{name}.{key}"] = {"value": value, "unit": unit}
+
+    record("plan.build_execution_order", measure(lambda: build_execution_order(nodes, connections)), "s")
+    registry = NoopRegistry()
+    record("plan.compile_workflow", measure(lambda: compile_workflow(workflow, registry)), "s")
+
+    store = {f"out_{index}": index for index in range(size)}
+    resolver = InputResolver(store)
+    parameters = [node["parameters"] for node in nodes]
+
+    def resolve_all():
+        for inputs in parameters:
+            resolver.resolve_inputs(inputs)
+
+    record("resolve_inputs.per_node", measure(resolve_all) / size, "s")
+
+    runtime = WorkflowRuntime(context={}, store={}, tool_runner=None, logger=logging.getLogger(PACKAGE))
+    executor = N8NExecutor(runtime, registry, plan_cache=WorkflowPlanCache(), result_cache=ResultCache())
+    executor.execute(workflow)  # warm the plan cache
+    record("dispatch.per_node", measure(lambda: executor.execute(workflow), repeat=3) / size, "s")
+
+    cold = lambda: N8NExecutor(
+        runtime, registry, plan_cache=WorkflowPlanCache(), result_cache=ResultCache()
+    ).execute(workflow)
+    record("execute.cold", measure(cold, repeat=3), "s")
+    record("memory.execute_cold", peak_memory(cold), "bytes")
+
+    record("validate.is_n8n_workflow", measure(lambda: is_n8n_workflow(workflow)), "s")
+    record("validate.n8n_schema", measure(lambda: N8NWorkflow.validate(workflow)), "s")
+    return results
+
+
+def bench_registry() -> Dict[str, Dict[str, Any]]:
+    """Benchmark PluginRegistry construction from the plugin manifests."""
+    load_plugin_map()  # make sure the manifest index exists on disk
+    value = measure(lambda: PluginRegistry(load_plugin_map(), load_plugin_capabilities()), repeat=3)
+    return {"registry.construct": {"value": value, "unit": "s"}}
+
+
+def run_benchmarks(sizes: List[int], shapes: List[str], imports: bool = True) -> Dict[str, Any]:
+    """Run every benchmark and return the baseline document."""
+    logging.getLogger(PACKAGE).setLevel(logging.ERROR)
+    results: Dict[str, Dict[str, Any]] = {}
+    for shape in shapes:
+        for size in sizes:
+            results.update(bench_workflow(shape, size))
+    results.update(bench_registry())
+    if imports:
+        results["import.n8n_executor"] = {"value": import_time(f"{PACKAGE}.n8n_executor"), "unit": "s"}
+        results["import.plugin_registry"] = {"value": import_time(f"{PACKAGE}.plugin_registry"), "unit": "s"}
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "sizes": sizes,
+            "shapes": shapes,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Return one row per metric present in both runs, flagging regressions."""
+    rows = []
+    for name, base in sorted(baseline.get("results", {}).items()):
+        now = current.get("results", {}).get(name)
+        if now is None or not base["value"]:
+            continue
+        ratio = now["value"] / base["value"]
+        rows.append({
+            "name": name,
+            "baseline": base["value"],
+            "current": now["value"],
+            "unit": base.get("unit", ""),
+            "ratio": ratio,
+            "regressed": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def _format_value(value: float, unit: str) -> str:
+    if unit == "bytes":
+        return f"{value / 1024:.1f} KiB"
+    if value < 1e-3:
+        return f"{value * 1e6:.2f} us"
+    return f"{value * 1e3:.2f} ms"
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Executor hot path benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks and write a JSON baseline")
+    run_parser.add_argument("--output", help="File to write results to (default: stdout)")
+    run_parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated node counts")
+    run_parser.add_argument("--shapes", default=",".join(SHAPES), help="Comma-separated workflow shapes")
+    run_parser.add_argument("--skip-imports", action="store_true", help="Do not measure import time")
+
+    compare_parser = commands.add_parser("compare", help="Compare a run against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Allowed slowdown as a fraction (0.2 = 20%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        sizes = [int(size) for size in args.sizes.split(",") if size]
+        shapes = [shape for shape in args.shapes.split(",") if shape]
+        unknown = set(shapes) - set(SHAPES)
+        if unknown:
+            parser.error(f"unknown shapes: {', '.join(sorted(unknown))}")
+        document = run_benchmarks(sizes, shapes, imports=not args.skip_imports)
+        payload = json.dumps(document, indent=2, sort_keys=True)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(payload + "\n")
+            print(f"Wrote {len(document['results'])} results to {args.output}")
+        else:
+            print(payload)
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.threshold)
+    for row in rows:
+        marker = "REGRESSION" if row["regressed"] else ""
+        print(
+            f"{row['name']:<48} {_format_value(row['baseline'], row['unit']):>12} "
+            f"-> {_format_value(row['current'], row['unit']):>12}  {row['ratio']:.2f}x {marker}"
+        )
+    regressions = [row for row in rows if row["regressed"]]
+    print(f"{len(regressions)} of {len(rows)} metrics regressed by more than {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Measure package search latency on the bundled inverted index.
+
+Builds an in-memory InvertedIndexStore of synthetic package documents
+(name, description, keywords), then times term, multi-term and prefix
+queries for the first page of hits, as ``packagerepo.index_query`` runs
+them.
+
+    python -m autometabuilder.workflow.benchmarks.index_query [--packages 100000] [--queries 2000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Any, Dict, List
+
+from ..plugins.packagerepo.index_store import InvertedIndexStore
+
+INDEX = "packages"
+FIELDS = {INDEX: ["name", "description", "keywords"]}
+
+
+def _vocabulary(rng: random.Random, size: int) -> List[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(3, 9))))
+    return sorted(words)
+
+
+def _documents(count: int, rng: random.Random) -> Dict[str, Dict[str, Any]]:
+    """Build package documents with zipf-like word popularity."""
+    vocabulary = _vocabulary(rng, 20_000)
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    documents = {}
+    for index in range(count):
+        name_words = rng.choices(vocabulary, weights, k=rng.randint(1, 3))
+        name = "-".join(name_words) + f"-{index}"
+        documents[name] = {
+            "name": name,
+            "version": f"{rng.randint(0, 9)}.{rng.randint(0, 20)}.{rng.randint(0, 50)}",
+            "description": " ".join(rng.choices(vocabulary, weights, k=12)),
+            "keywords": rng.choices(vocabulary, weights, k=4),
+        }
+    return documents
+
+
+def _queries(documents: Dict[str, Dict[str, Any]], count: int, rng: random.Random) -> Dict[str, List[Any]]:
+    """Draw term, two-term and prefix queries from the indexed text."""
+    samples = rng.sample(list(documents.values()), min(count, len(documents)))
+    term, two_terms, prefix = [], [], []
+    for document in samples:
+        words = document["description"].split()
+        term.append((words[0], False))
+        two_terms.append((f"{words[0]} {words[1]}", False))
+        prefix.append((document["name"].split("-")[0][:rng.randint(2, 4)], True))
+    return {"term": term, "twoTerms": two_terms, "prefix": prefix}
+
+
+def run(packages: int, queries: int, seed: int = 11) -> Dict[str, Any]:
+    """Index the packages and time each query kind."""
+    rng = random.Random(seed)
+    documents = _documents(packages, rng)
+    store = InvertedIndexStore(fields=FIELDS)
+
+    started = time.perf_counter()
+    store.upsert_batch(INDEX, documents.items())
+    build = time.perf_counter() - started
+
+    results: Dict[str, Any] = {"packages": packages, "buildSeconds": build}
+    for kind, cases in _queries(documents, queries, rng).items():
+        latencies = []
+        totals = []
+        for text, prefix in cases:
+            started = time.perf_counter()
+            result = store.query(INDEX, text, prefix=prefix, limit=20)
+            latencies.append((time.perf_counter() - started) * 1000)
+            totals.append(result["total"])
+        latencies.sort()
+        results[kind] = {
+            "queries": len(latencies),
+            "p50Ms": statistics.median(latencies),
+            "p95Ms": latencies[int(len(latencies) * 0.95) - 1],
+            "maxMs": latencies[-1],
+            "meanHits": statistics.mean(totals),
+        }
+    return results
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Inverted index query latency")
+    parser.add_argument("--packages", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.packages, args.queries)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{results['packages']} packages indexed in {results['buildSeconds']:.2f}s")
+    print(f"{'query':<10}{'p50':>10}{'p95':>10}{'max':>10}{'mean hits':>12}")
+    for kind in ("term", "twoTerms", "prefix"):
+        result = results[kind]
+        print(
+            f"{kind:<10}{result['p50Ms']:>8.3f}ms{result['p95Ms']:>8.3f}ms"
+            f"{result['maxMs']:>8.3f}ms{result['meanHits']:>12.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
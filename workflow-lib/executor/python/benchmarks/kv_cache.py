@@ -0,0 +1,110 @@
+"""Compare kv_get reads with and without the in-process KV cache.
+
+Keys are drawn from a zipfian distribution, as package metadata reads are:
+a few manifests and latest-version pointers take most of the traffic. Each
+read returns the decoded JSON value, like ``packagerepo.kv_get``. The
+``uncached`` strategy reads the LogKVStore and runs ``json.loads`` every
+time; ``cached`` reads through a CachedKVStore smaller than the key space.
+
+    python -m autometabuilder.workflow.benchmarks.kv_cache [--keys 10000] [--reads 200000] [--zipf 1.1]
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import random
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from ..plugins.packagerepo.kv_cache import CachedKVStore, get_decoded
+from ..plugins.packagerepo.kv_store import LogKVStore, decode_value, encode_value
+
+
+def _manifest(index: int) -> Dict[str, Any]:
+    """Build a package manifest of a realistic size (about 1 KiB of JSON)."""
+    return {
+        "name": f"package-{index}",
+        "version": f"1.{index % 50}.{index % 7}",
+        "description": "Synthetic package manifest for the KV cache benchmark " * 2,
+        "dependencies": {f"dep-{dep}": f"^{dep}.0.0" for dep in range(12)},
+        "files": [f"src/module_{file}.py" for file in range(10)],
+        "digest": f"sha256:{index:064x}",
+    }
+
+
+def zipf_keys(keys: int, reads: int, exponent: float, seed: int = 7) -> List[bytes]:
+    """Sample reads key names with P(rank k) proportional to 1 / k**exponent."""
+    cumulative = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, keys + 1)))
+    rng = random.Random(seed)
+    total = cumulative[-1]
+    # Shuffle ranks so hot keys are spread over the key space
+    names = [f"manifest/package-{index}".encode("utf-8") for index in range(keys)]
+    rng.shuffle(names)
+    return [names[bisect.bisect_left(cumulative, rng.random() * total)] for _ in range(reads)]
+
+
+def run(keys: int, reads: int, exponent: float, cache_entries: int, ttl: float) -> Dict[str, Any]:
+    """Time both strategies over the same key sequence."""
+    directory = tempfile.mkdtemp(prefix="kv-cache-bench-")
+    try:
+        store = LogKVStore(directory, sync=False)
+        store.write_batch(
+            (f"manifest/package-{index}".encode("utf-8"), encode_value(_manifest(index)))
+            for index in range(keys)
+        )
+        sequence = zipf_keys(keys, reads, exponent)
+
+        started = time.perf_counter()
+        for key in sequence:
+            get_decoded(store, key, decode_value)
+        uncached = time.perf_counter() - started
+
+        cache = CachedKVStore(store, max_entries=cache_entries, ttl=ttl)
+        started = time.perf_counter()
+        for key in sequence:
+            get_decoded(cache, key, decode_value)
+        cached = time.perf_counter() - started
+        store.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        "keys": keys,
+        "reads": reads,
+        "zipf": exponent,
+        "uncached": {"seconds": uncached, "readsPerSecond": reads / uncached},
+        "cached": {"seconds": cached, "readsPerSecond": reads / cached, **cache.stats()},
+    }
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="KV read-through cache versus direct reads")
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--reads", type=int, default=200_000)
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent")
+    parser.add_argument("--cache-entries", type=int, default=1_000)
+    parser.add_argument("--ttl", type=float, default=30.0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    result = run(args.keys, args.reads, args.zipf, args.cache_entries, args.ttl)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    cached = result["cached"]
+    print(f"{args.reads} reads over {args.keys} keys, zipf {args.zipf}, cache of {args.cache_entries}")
+    for name in ("uncached", "cached"):
+        print(f"{name:<10}{result[name]['seconds'] * 1e3:>10.1f}ms{result[name]['readsPerSecond']:>12.0f} reads/s")
+    print(f"hit ratio {cached['hitRatio']:.3f}, evictions {cached['evictions']}, expirations {cached['expirations']}")
+    print(f"speedup: {result['uncached']['seconds'] / cached['seconds']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
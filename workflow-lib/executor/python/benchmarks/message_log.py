@@ -0,0 +1,114 @@
+"""Compare copying message lists with the shared MessageLog over a long conversation.
+
+Each turn mirrors the core AI loop: append the user instruction, append the
+model response, append the tool results. The ``copy`` strategy does what
+the core plugins did before, ``list(messages)`` on every step; the ``log``
+strategy extends a MessageLog.
+
+    python -m autometabuilder.workflow.benchmarks.message_log [--turns 500] [--tool-results 2]
+
+Memory is reported twice: the peak while only the latest list is alive,
+and the peak when every step's output is kept, as a run history or
+per-node trace does.
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from ..plugins.core.message_log import MessageLog
+
+
+def _copy_step(messages: Any, new: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    messages = list(messages or [])
+    messages.extend(new)
+    return messages
+
+
+def _log_step(messages: Any, new: List[Dict[str, Any]]) -> MessageLog:
+    return MessageLog.of(messages).extend(new)
+
+
+STRATEGIES: Dict[str, Callable[[Any, List[Dict[str, Any]]], Any]] = {
+    "copy": _copy_step,
+    "log": _log_step,
+}
+
+
+def _steps(turns: int, tool_results: int) -> List[List[Dict[str, Any]]]:
+    """Build the messages appended by each plugin call, three calls per turn."""
+    steps = []
+    for turn in range(turns):
+        steps.append([{"role": "user", "content": f"Next step {turn}"}])
+        steps.append([{"role": "assistant", "content": f"Response {turn}"}])
+        steps.append([
+            {"role": "tool", "tool_call_id": f"call_{turn}_{index}", "content": "ok"}
+            for index in range(tool_results)
+        ])
+    return steps
+
+
+def _converse(step: Callable, steps: List[List[Dict[str, Any]]], history: Optional[List[Any]] = None) -> Any:
+    """Run every step of one conversation and return the final messages."""
+    messages = step([{"role": "system", "content": "You are a helpful assistant."}], [])
+    for new in steps:
+        messages = step(messages, new)
+        if history is not None:
+            history.append(messages)
+    return messages
+
+
+def _peak_memory(step: Callable, steps: List[List[Dict[str, Any]]], keep_history: bool) -> int:
+    """Return the peak traced allocation of one conversation in bytes."""
+    tracemalloc.start()
+    try:
+        _converse(step, steps, [] if keep_history else None)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_conversation(step: Callable, steps: List[List[Dict[str, Any]]], repeat: int = 5) -> Dict[str, Any]:
+    """Measure time (best of repeat, untraced) and memory of one strategy."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        messages = _converse(step, steps)
+        best = min(best, time.perf_counter() - started)
+    return {
+        "seconds": best,
+        "peakLiveBytes": _peak_memory(step, steps, keep_history=False),
+        "peakHistoryBytes": _peak_memory(step, steps, keep_history=True),
+        "messages": len(messages),
+    }
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="MessageLog versus list copying")
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--tool-results", type=int, default=2)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    steps = _steps(args.turns, args.tool_results)
+    results = {name: run_conversation(step, steps) for name, step in STRATEGIES.items()}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{args.turns} turns, {len(steps)} plugin calls, {results['log']['messages']} messages")
+    print(f"{'strategy':<10}{'time':>12}{'peak live':>14}{'peak history':>16}")
+    for name, result in results.items():
+        print(
+            f"{name:<10}{result['seconds'] * 1e3:>10.2f}ms"
+            f"{result['peakLiveBytes'] / 1024:>11.1f}KiB{result['peakHistoryBytes'] / 1024:>13.1f}KiB"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+"""Compare per-call process spawn with the persistent --serve executor mode."""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+EXECUTOR = Path(__file__).resolve().parent.parent / "executor.py"
+
+PLUGIN_SOURCE = '''
+import json
+import decimal
+import email.mime.multipart
+
+
+def run(runtime, inputs):
+    return {"result": inputs.get("value")}
+'''
+
+
+def bench_spawn(plugin_path: str, calls: int) -> float:
+    """Run one executor process per call and return seconds elapsed."""
+    started = time.perf_counter()
+    for i in range(calls):
+        request = {"plugin_path": plugin_path, "inputs": {"value": i}, "context": {}}
+        completed = subprocess.run(
+            [sys.executable, str(EXECUTOR)],
+            input=json.dumps(request),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert json.loads(completed.stdout)["result"] == i
+    return time.perf_counter() - started
+
+
+def bench_serve(plugin_path: str, calls: int, workers: int) -> float:
+    """Send all calls to one --serve process and return seconds elapsed."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, str(EXECUTOR), "--serve", "--workers", str(workers)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    for i in range(calls):
+        request = {"id": i, "plugin_path": plugin_path, "inputs": {"value": i}, "context": {}}
+        proc.stdin.write(json.dumps(request) + "\n")
+    proc.stdin.close()
+
+    seen = set()
+    for line in proc.stdout:
+        response = json.loads(line)
+        assert response["result"]["result"] == response["id"]
+        seen.add(response["id"])
+    proc.wait()
+    assert len(seen) == calls
+    return time.perf_counter() - started
+
+
+def main():
+    """Run both modes and print per-call timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plugin_path = str(Path(tmp) / "bench_plugin.py")
+        Path(plugin_path).write_text(PLUGIN_SOURCE, encoding="utf-8")
+
+        spawn_time = bench_spawn(plugin_path, args.calls)
+        serve_time = bench_serve(plugin_path, args.calls, args.workers)
+
+    print(f"calls:  {args.calls}")
+    print(f"spawn:  {spawn_time:.3f}s total, {spawn_time / args.calls * 1000:.2f} ms/call")
+    print(f"serve:  {serve_time:.3f}s total, {serve_time / args.calls * 1000:.2f} ms/call (includes startup)")
+    print(f"speedup: {spawn_time / serve_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
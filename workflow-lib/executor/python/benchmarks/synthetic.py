@@ -0,0 +1,73 @@
+"""Generate synthetic n8n workflows of a given shape and size."""
+
+from typing import Any, Callable, Dict, List
+
+NOOP_TYPE = "bench.noop"
+
+
+def _node(index: int) -> Dict[str, Any]:
+    """Build one no-op node whose inputs mix literals and store bindings."""
+    return {
+        "id": f"n{index}",
+        "name": f"Node {index}",
+        "type": NOOP_TYPE,
+        "typeVersion": 1,
+        "position": [index * 10, 0],
+        "parameters": {
+            "value": index,
+            "label": f"node-{index}",
+            "upstream": f"$out_{max(index - 1, 0)}",
+            "flags": {"enabled": True, "tags": ["a", "b"]},
+        },
+    }
+
+
+def _connect(connections: Dict[str, Any], source: int, target: int) -> None:
+    """Add a main-output connection between two node indices."""
+    targets = connections.setdefault(f"Node {source}", {"main": {"0": []}})["main"]["0"]
+    targets.append({"node": f"Node {target}", "type": "main", "index": 0})
+
+
+def _workflow(name: str, size: int, edges: List[tuple]) -> Dict[str, Any]:
+    """Assemble nodes and edges into an n8n workflow dict."""
+    connections: Dict[str, Any] = {}
+    for source, target in edges:
+        _connect(connections, source, target)
+    return {
+        "name": f"bench-{name}-{size}",
+        "nodes": [_node(index) for index in range(size)],
+        "connections": connections,
+        "settings": {"memoize": False},
+    }
+
+
+def chain(size: int) -> Dict[str, Any]:
+    """Every node depends on the previous one."""
+    return _workflow("chain", size, [(index, index + 1) for index in range(size - 1)])
+
+
+def fanout(size: int) -> Dict[str, Any]:
+    """One root feeding every other node."""
+    return _workflow("fanout", size, [(0, index) for index in range(1, size)])
+
+
+def diamond(size: int) -> Dict[str, Any]:
+    """A chain of diamonds: each join fans out to two nodes that join again."""
+    edges = []
+    join = 0
+    index = 1
+    while index + 2 < size:
+        left, right, nxt = index, index + 1, index + 2
+        edges += [(join, left), (join, right), (left, nxt), (right, nxt)]
+        join = nxt
+        index += 3
+    # Leftover nodes hang off the last join
+    edges += [(join, rest) for rest in range(index, size)]
+    return _workflow("diamond", size, edges)
+
+
+SHAPES: Dict[str, Callable[[int], Dict[str, Any]]] = {
+    "chain": chain,
+    "fanout": fanout,
+    "diamond": diamond,
+}
@@ -0,0 +1,493 @@
+"""Checkpoint and resume long-running n8n workflow executions."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+JOURNAL_SUFFIX = ".journal"
+# Journal records appended before the full checkpoint is rewritten
+DEFAULT_COMPACT_EVERY = 256
+
+_SCALARS = (str, int, float, bool, type(None))
+# Markers in place of a content digest: values whose changes are only
+# detected by identity, and values that could not be encoded
+_UNTRACKED = "untracked"
+_UNENCODABLE = "unencodable"
+
+_RUN_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def _encode_default(value: Any) -> Any:
+    """Encode list-like values such as MessageLog that expose to_list()."""
+    to_list = getattr(value, "to_list", None)
+    if callable(to_list):
+        return to_list()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class CheckpointError(RuntimeError):
+    """Raised when a checkpoint cannot be written or does not match the workflow."""
+
+
+@dataclass
+class Checkpoint:
+    """Progress of one workflow run.
+
+    ``completed`` holds the IDs of nodes that finished. Nodes listed in
+    ``replay`` also finished, but produced values that could not be
+    serialized (clients, callables) and are therefore executed again on
+    resume to recreate them. ``omitted`` maps ``store.<key>`` or
+    ``context.<key>`` to the type name of each value left out.
+    """
+    run_id: str
+    workflow_hash: str
+    status: str = STATUS_RUNNING
+    completed: List[str] = field(default_factory=list)
+    replay: List[str] = field(default_factory=list)
+    store: Dict[str, Any] = field(default_factory=dict)
+    context: Dict[str, Any] = field(default_factory=dict)
+    omitted: Dict[str, str] = field(default_factory=dict)
+    loop_counters: Dict[str, int] = field(default_factory=dict)
+    updated_at: float = 0.0
+    generation: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-compatible dictionary."""
+        return {
+            "version": CHECKPOINT_VERSION,
+            "runId": self.run_id,
+            "workflowHash": self.workflow_hash,
+            "status": self.status,
+            "completed": self.completed,
+            "replay": self.replay,
+            "store": self.store,
+            "context": self.context,
+            "omitted": self.omitted,
+            "loopCounters": self.loop_counters,
+            "updatedAt": self.updated_at,
+            "generation": self.generation,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Checkpoint":
+        """Create a checkpoint from its dictionary form."""
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise CheckpointError(f"Unsupported checkpoint version: {data.get('version')!r}")
+        return cls(
+            run_id=data["runId"],
+            workflow_hash=data["workflowHash"],
+            status=data.get("status", STATUS_RUNNING),
+            completed=list(data.get("completed", [])),
+            replay=list(data.get("replay", [])),
+            store=dict(data.get("store", {})),
+            context=dict(data.get("context", {})),
+            omitted=dict(data.get("omitted", {})),
+            loop_counters=dict(data.get("loopCounters", {})),
+            updated_at=data.get("updatedAt", 0.0),
+            generation=data.get("generation", 0),
+        )
+
+    def apply(self, record: Dict[str, Any]) -> None:
+        """Fold one journal record, written after a node or loop iteration, into the checkpoint."""
+        sections = {"store": self.store, "context": self.context}
+        for section, values in sections.items():
+            for key, value in record.get(section, {}).items():
+                values[key] = value
+                self.omitted.pop(f"{section}.{key}", None)
+        for name in record.get("removed", []):
+            section, _, key = name.partition(".")
+            sections[section].pop(key, None)
+            self.omitted.pop(name, None)
+        for name, type_name in record.get("omitted", {}).items():
+            section, _, key = name.partition(".")
+            # An older value must not be restored in place of the omitted one
+            sections[section].pop(key, None)
+            self.omitted[name] = type_name
+        for node_id in record.get("replay", []):
+            if node_id not in self.replay:
+                self.replay.append(node_id)
+
+        node_id = record["node"]
+        if "iteration" in record:
+            self.loop_counters[node_id] = record["iteration"]
+        elif node_id not in self.completed:
+            self.completed.append(node_id)
+        self.updated_at = record.get("updatedAt", self.updated_at)
+
+
+class CheckpointStore:
+    """Directory of checkpoint files.
+
+    Each run has a full checkpoint ``<run_id>.json`` and a journal
+    ``<run_id>.journal`` of JSON lines, one per finished node, holding only
+    the keys that node changed. Journal records carry the generation of the
+    full checkpoint they extend; writing a new full checkpoint bumps it, so
+    records left over from before are ignored.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def path_for(self, run_id: str) -> Path:
+        """Return the checkpoint file for run_id."""
+        if not _RUN_ID_PATTERN.match(run_id or ""):
+            raise CheckpointError(f"Invalid run id: {run_id!r}")
+        return self.directory / f"{run_id}.json"
+
+    def journal_path(self, run_id: str) -> Path:
+        """Return the journal file for run_id."""
+        return self.path_for(run_id).with_suffix(JOURNAL_SUFFIX)
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        """Write a checkpoint atomically; a crash never leaves a partial file."""
+        self.write_raw(checkpoint.run_id, json.dumps(checkpoint.to_dict()))
+        self.clear_journal(checkpoint.run_id)
+
+    def append(self, run_id: str, payload: str) -> None:
+        """Append one JSON record to the journal of run_id and fsync it."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path(run_id), "a", encoding="utf-8") as f:
+            f.write(payload + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear_journal(self, run_id: str) -> None:
+        """Remove the journal of run_id once a full checkpoint covers it."""
+        try:
+            self.journal_path(run_id).unlink()
+        except FileNotFoundError:
+            pass
+
+    def write_raw(self, run_id: str, payload: str) -> None:
+        """Atomically replace the checkpoint file for run_id with payload."""
+        path = self.path_for(run_id)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{run_id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def load(self, run_id: str) -> Optional[Checkpoint]:
+        """Read the checkpoint for run_id with its journal applied, or None if there is none."""
+        try:
+            with open(self.path_for(run_id), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as error:
+            raise CheckpointError(f"Corrupt checkpoint for run {run_id}: {error}") from error
+        checkpoint = Checkpoint.from_dict(data)
+
+        try:
+            with open(self.journal_path(run_id), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash mid-append leaves a torn last line
+                        break
+                    if record.get("generation") == checkpoint.generation:
+                        checkpoint.apply(record)
+        except FileNotFoundError:
+            pass
+        return checkpoint
+
+    def delete(self, run_id: str) -> None:
+        """Remove the checkpoint and journal for run_id if present."""
+        for path in (self.path_for(run_id), self.journal_path(run_id)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class ExecutionCheckpointer:
+    """Record node completions of one run and persist them as they happen.
+
+    ``start`` writes the full state once. After that, every finished node or
+    loop iteration appends a journal record holding only the store and
+    context keys changed since the previous record, attributed to that node.
+    Values are compared by identity. Callers pass the store keys the node
+    wrote; of the values whose identity did not change, only containers
+    under those keys are re-encoded, so a node publishing a list it appended
+    to is caught without re-encoding every container after every node.
+    Without the keys, every container is re-encoded. Context keys
+    present before the run are left out unless a node replaces them. The
+    journal is folded into a new full checkpoint every ``compact_every``
+    records and when the run finishes.
+
+    When a value cannot be serialized, the node that produced it is marked
+    for replay instead of the value being dropped silently; with ``strict``
+    a CheckpointError is raised instead.
+    """
+
+    def __init__(
+        self,
+        store: CheckpointStore,
+        runtime,
+        checkpoint: Checkpoint,
+        strict: bool = False,
+        compact_every: int = DEFAULT_COMPACT_EVERY
+    ):
+        self.store = store
+        self.runtime = runtime
+        self.checkpoint = checkpoint
+        self.strict = strict
+        self.compact_every = max(1, compact_every)
+        self._completed: Set[str] = set(checkpoint.completed)
+        self._replay: Set[str] = set(checkpoint.replay)
+        self._origins: Dict[str, Set[str]] = {}
+        self._context_keys: Set[str] = set(checkpoint.context)
+        # "section.key" -> (value last recorded, digest of its encoding or a
+        # marker); holding the value keeps its identity from being reused
+        self._seen: Dict[str, Tuple[Any, Any]] = {}
+        self._records = 0
+        self._lock = threading.Lock()
+
+    def restore(self) -> None:
+        """Copy checkpointed store and context values into the runtime."""
+        self.runtime.store.update(self.checkpoint.store)
+        self.runtime.context.update(self.checkpoint.context)
+        # Replayed nodes run again, so they must not count as done yet
+        self._completed -= self._replay
+        for node_id in self._replay:
+            self.checkpoint.loop_counters.pop(node_id, None)
+        self._replay.clear()
+
+    def start(self) -> None:
+        """Write the full state that journal records will extend."""
+        with self._lock:
+            self._write(STATUS_RUNNING)
+
+    def is_completed(self, node_id: str) -> bool:
+        """Return True if node_id finished in this run or a resumed one."""
+        return node_id in self._completed
+
+    def node_completed(self, node_id: str, written: Optional[Iterable[str]] = None) -> None:
+        """Journal the keys changed since the last record as produced by node_id.
+
+        written lists the store keys the node published, if known.
+        """
+        with self._lock:
+            self._completed.add(node_id)
+            self._record(node_id, {"node": node_id}, written)
+
+    def iteration_completed(
+        self,
+        node_id: str,
+        iteration: int,
+        written: Optional[Iterable[str]] = None
+    ) -> None:
+        """Journal a finished loop iteration with the keys it changed."""
+        with self._lock:
+            self.checkpoint.loop_counters[node_id] = iteration
+            self._record(node_id, {"node": node_id, "iteration": iteration}, written)
+
+    def loop_counter(self, node_id: str) -> int:
+        """Return the last finished iteration of a loop node (0 if none)."""
+        return self.checkpoint.loop_counters.get(node_id, 0)
+
+    def finish(self) -> None:
+        """Mark the run as completed."""
+        with self._lock:
+            self._write(STATUS_COMPLETED)
+
+    def _record(self, node_id: str, record: Dict[str, Any], written: Optional[Iterable[str]]) -> None:
+        """Journal the changes since the last record; caller holds the lock."""
+        omitted: Dict[str, str] = {}
+        replay: Set[str] = set(self._replay)
+        removed: List[str] = []
+        # Nodes publish to the store only; context containers are then
+        # compared by identity
+        rescan = {"store": set(written), "context": set()} if written is not None else {}
+        changed = {
+            section: self._changes(section, values, node_id, omitted, replay, removed, rescan.get(section))
+            for section, values in self._sections()
+        }
+        new_replay = replay - self._replay
+        self._replay = replay
+
+        checkpoint = self.checkpoint
+        for section, values in changed.items():
+            for key in values:
+                checkpoint.omitted.pop(f"{section}.{key}", None)
+        for name in removed:
+            checkpoint.omitted.pop(name, None)
+        checkpoint.omitted.update(omitted)
+        checkpoint.completed = sorted(self._completed)
+        checkpoint.replay = sorted(replay)
+        checkpoint.updated_at = time.time()
+
+        if self._records >= self.compact_every:
+            self._write(STATUS_RUNNING)
+            return
+
+        record["generation"] = checkpoint.generation
+        record["updatedAt"] = checkpoint.updated_at
+        if removed:
+            record["removed"] = removed
+        if omitted:
+            record["omitted"] = omitted
+        if new_replay:
+            record["replay"] = sorted(new_replay)
+        # Values were encoded one by one; splice them in rather than encoding twice
+        payload = json.dumps(record)[:-1]
+        for section, values in changed.items():
+            if values:
+                payload += f', "{section}": ' + _join_object(values)
+        self.store.append(checkpoint.run_id, payload + "}")
+        self._records += 1
+
+    def _sections(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Return copies of the store and context, safe from concurrent writes."""
+        return [("store", dict(self.runtime.store)), ("context", dict(self.runtime.context))]
+
+    def _changes(
+        self,
+        section: str,
+        values: Dict[str, Any],
+        node_id: str,
+        omitted: Dict[str, str],
+        replay: Set[str],
+        removed: List[str],
+        rescan: Optional[Set[str]] = None
+    ) -> Dict[str, str]:
+        """Encode the values of a section that changed since the last record.
+
+        Containers whose identity is unchanged are re-encoded only when their
+        key is in rescan, or always when rescan is None.
+        """
+        changed: Dict[str, str] = {}
+        for key, value in values.items():
+            name = f"{section}.{key}"
+            seen = self._seen.get(name)
+            encoded = None
+            if seen is not None and seen[0] is value:
+                if seen[1] is None or seen[1] is _UNTRACKED or seen[1] is _UNENCODABLE:
+                    continue
+                if rescan is not None and key not in rescan:
+                    continue
+                encoded = _try_encode(value)
+                if encoded is None or hash(encoded) == seen[1]:
+                    continue
+
+            self._origins.setdefault(name, set()).add(node_id)
+            if section == "context":
+                self._context_keys.add(key)
+            encoded = self._track(name, value, omitted, replay, encoded)
+            if encoded is not None:
+                changed[key] = encoded
+
+        prefix = f"{section}."
+        for name in [name for name in self._seen if name.startswith(prefix)]:
+            key = name[len(prefix):]
+            if key not in values:
+                if self._seen.pop(name)[1] is not _UNTRACKED:
+                    removed.append(name)
+                self._context_keys.discard(key)
+        return changed
+
+    def _write(self, status: str) -> None:
+        """Write the whole runtime state as a new full checkpoint; caller holds the lock."""
+        omitted: Dict[str, str] = {}
+        replay: Set[str] = set(self._replay)
+        self._seen.clear()
+        sections = {}
+        for section, values in self._sections():
+            encoded_values = {}
+            for key, value in values.items():
+                name = f"{section}.{key}"
+                if section == "context" and key not in self._context_keys:
+                    self._seen[name] = (value, _UNTRACKED)
+                    continue
+                encoded = self._track(name, value, omitted, replay)
+                if encoded is not None:
+                    encoded_values[key] = encoded
+            sections[section] = _join_object(encoded_values)
+
+        self._replay = replay
+        checkpoint = self.checkpoint
+        checkpoint.status = status
+        checkpoint.completed = sorted(self._completed)
+        checkpoint.replay = sorted(replay)
+        checkpoint.omitted = omitted
+        checkpoint.updated_at = time.time()
+        checkpoint.generation += 1
+
+        header = checkpoint.to_dict()
+        del header["store"], header["context"]
+        # Values were encoded one by one to find unserializable ones; append
+        # them rather than encoding everything a second time
+        payload = json.dumps(header)[:-1] + f', "store": {sections["store"]}, "context": {sections["context"]}}}'
+        self.store.write_raw(checkpoint.run_id, payload)
+        self.store.clear_journal(checkpoint.run_id)
+        self._records = 0
+
+    def _track(
+        self,
+        name: str,
+        value: Any,
+        omitted: Dict[str, str],
+        replay: Set[str],
+        encoded: Optional[str] = None
+    ) -> Optional[str]:
+        """Encode a value and remember it; returns None if it was omitted."""
+        if encoded is None:
+            encoded = self._encode(name, value, omitted, replay)
+        if encoded is None:
+            self._seen[name] = (value, _UNENCODABLE)
+        else:
+            self._seen[name] = (value, None if isinstance(value, _SCALARS) else hash(encoded))
+        return encoded
+
+    def _encode(self, name: str, value: Any, omitted: Dict[str, str], replay: Set[str]) -> Optional[str]:
+        """Encode one value, or record it as omitted and return None."""
+        try:
+            return json.dumps(value, default=_encode_default)
+        except (TypeError, ValueError) as error:
+            producers = self._origins.get(name, set())
+            if self.strict or not producers:
+                raise CheckpointError(
+                    f"Cannot checkpoint {name} ({type(value).__name__}): {error}"
+                ) from error
+            if name not in self.checkpoint.omitted:
+                logger.warning(
+                    "Checkpoint omits %s (%s); nodes %s will run again on resume",
+                    name, type(value).__name__, ", ".join(sorted(producers))
+                )
+            omitted[name] = type(value).__name__
+            replay.update(producers)
+            return None
+
+
+def _try_encode(value: Any) -> Optional[str]:
+    """Encode value as JSON, or return None if it cannot be."""
+    try:
+        return json.dumps(value, default=_encode_default)
+    except (TypeError, ValueError):
+        return None
+
+
+def _join_object(encoded_values: Dict[str, str]) -> str:
+    """Build a JSON object from keys and already encoded values."""
+    return "{" + ", ".join(f"{json.dumps(key)}: {encoded}" for key, encoded in encoded_values.items()) + "}"
@@ -0,0 +1,349 @@
+"""Compile n8n workflows into reusable execution plans."""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .execution_order import ExecutionPlan, build_execution_plan
+from .input_resolver import compile_binding, compile_inputs
+from .plugins.base import NodeExecutor
+from .result_cache import PURE_CAPABILITY
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 128
+LOOP_NODE_TYPE = "control.loop"
+# n8n loop nodes emit "done" on output 0 and the loop body on output 1
+LOOP_BODY_OUTPUT = "1"
+
+
+@dataclass
+class CompiledNode:
+    """Workflow node with its bindings compiled.
+
+    ``inputs`` takes the runtime store and returns the parameters with
+    their ``$`` bindings resolved. The plugin is looked up in ``registry``
+    on the first ``resolve()``, so disabled nodes and nodes a run never
+    reaches do not import their plugin.
+    """
+    name: str
+    node_id: str
+    node_type: str
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    inputs: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+    disabled: bool = False
+    plugin: Optional[Callable] = None
+    batch: Optional[Callable] = None
+    pure: bool = False
+    loop: Optional["LoopPlan"] = None
+    raw: Dict[str, Any] = field(default_factory=dict)
+    registry: Any = field(default=None, repr=False, compare=False)
+    resolved: bool = False
+
+    def resolve(self) -> Optional[Callable]:
+        """Return the plugin callable, loading it on first use.
+
+        Returns None for unregistered node types. Raises PluginLoadError,
+        without caching it here, if the plugin fails to import.
+        """
+        if not self.resolved:
+            plugin = self.registry.get(self.node_type) if self.registry is not None else None
+            self.batch = _batch_method(plugin)
+            self.plugin = plugin
+            self.resolved = True
+        return self.plugin
+
+
+def _batch_method(plugin: Optional[Callable]) -> Optional[Callable]:
+    """Return the plugin's execute_batch if its class overrides the default.
+
+    Class-based plugins are loaded as bound run methods. The inherited
+    execute_batch only loops over execute(), so those plugins are left to
+    the executor's per-item path, which memoizes pure plugins per item.
+    """
+    owner = getattr(plugin, "__self__", None)
+    batch = getattr(type(owner), "execute_batch", None)
+    if batch is None or batch is NodeExecutor.execute_batch:
+        return None
+    return owner.execute_batch
+
+
+@dataclass
+class LoopPlan:
+    """Body and stop condition of a control.loop node, compiled once.
+
+    The parameter getters take the runtime store, so ``$`` bindings are
+    looked up without re-parsing the parameters on every iteration.
+    """
+    body: List[CompiledNode]
+    plan: ExecutionPlan
+    max_iterations: Callable[[Dict[str, Any]], Any]
+    stop_when: Optional[Callable[[Dict[str, Any]], Any]] = None
+    stop_on: Callable[[Dict[str, Any]], Any] = lambda store: True
+
+
+@dataclass
+class CompiledWorkflow:
+    """Lookup tables, plugin callables and plan for one workflow definition."""
+    content_hash: str
+    nodes: Dict[str, CompiledNode]
+    nodes_by_id: Dict[str, CompiledNode]
+    plan: ExecutionPlan
+    start_name: Optional[str] = None
+    plugin_registry: Any = None
+
+    @property
+    def order(self) -> List[str]:
+        """Node names in execution order."""
+        return self.plan.order
+
+    @property
+    def successors(self) -> Dict[str, List[str]]:
+        """Downstream node names per node name."""
+        return self.plan.successors
+
+
+def workflow_hash(workflow: Dict[str, Any]) -> str:
+    """Return a content hash of the workflow JSON."""
+    payload = json.dumps(workflow, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compile_workflow(
+    workflow: Dict[str, Any],
+    plugin_registry,
+    start_node_id: str | None = None,
+    content_hash: str | None = None
+) -> CompiledWorkflow:
+    """Build lookup tables, compile bindings and plan execution order.
+
+    Loop bodies are taken out of the top-level plan and planned separately;
+    edges into or out of a body attach to its loop node instead.
+    """
+    nodes = workflow.get("nodes", [])
+    connections = workflow.get("connections", {})
+
+    has_capability = getattr(plugin_registry, "has_capability", None)
+
+    compiled_nodes: Dict[str, CompiledNode] = {}
+    nodes_by_id: Dict[str, CompiledNode] = {}
+    for node in copy.deepcopy(nodes):
+        node_type = node.get("type")
+        pure = bool(has_capability and has_capability(node_type, PURE_CAPABILITY))
+        parameters = node.get("parameters", {})
+        compiled = CompiledNode(
+            name=node.get("name"),
+            node_id=node.get("id"),
+            node_type=node_type,
+            parameters=parameters,
+            inputs=compile_inputs(parameters),
+            disabled=bool(node.get("disabled")),
+            pure=pure,
+            raw=node,
+            registry=plugin_registry if node_type != LOOP_NODE_TYPE else None,
+        )
+        compiled_nodes.setdefault(compiled.name, compiled)
+        nodes_by_id.setdefault(compiled.node_id, compiled)
+
+    start_node = nodes_by_id.get(start_node_id) if start_node_id else None
+    bodies = _find_loop_bodies(nodes, connections)
+    if not bodies:
+        plan = build_execution_plan(nodes, connections, start_node_id)
+    else:
+        owners = _loop_owners(bodies)
+        for loop_name, body in bodies.items():
+            body_plan = _plan_scope(loop_name, nodes, connections, owners)
+            compiled_nodes[loop_name].loop = _compile_loop(
+                compiled_nodes[loop_name], body_plan, compiled_nodes
+            )
+        if start_node and start_node.name in owners:
+            logger.warning("Start node %s is inside a loop body, ignoring it", start_node.name)
+            start_node = start_node_id = None
+        plan = _plan_scope(None, nodes, connections, owners, start_node_id)
+
+    return CompiledWorkflow(
+        content_hash=content_hash or workflow_hash(workflow),
+        nodes=compiled_nodes,
+        nodes_by_id=nodes_by_id,
+        plan=plan,
+        start_name=start_node.name if start_node else None,
+        plugin_registry=plugin_registry,
+    )
+
+
+def _iter_connections(connections: Dict[str, Any]) -> Iterator[Tuple[str, str, Any]]:
+    """Yield (source name, output index, target name) for every connection."""
+    for source_name, outputs in connections.items():
+        for indices in (outputs or {}).values():
+            for index, targets in (indices or {}).items():
+                for target in targets or []:
+                    yield source_name, str(index), target.get("node")
+
+
+def _find_loop_bodies(nodes: List[Dict[str, Any]], connections: Dict[str, Any]) -> Dict[str, Set[str]]:
+    """Return the body node names of every loop node.
+
+    A body is either listed explicitly in ``parameters.body`` (node names or
+    IDs) or consists of the nodes reachable from the loop's body output.
+    """
+    loop_nodes = [node for node in nodes if node.get("type") == LOOP_NODE_TYPE]
+    if not loop_nodes:
+        return {}
+
+    names = {node.get("name") for node in nodes}
+    names_by_id = {node.get("id"): node.get("name") for node in nodes}
+    successors: Dict[str, List[str]] = {}
+    body_entries: Dict[str, List[str]] = {}
+    for source, index, target in _iter_connections(connections):
+        if source in names and target in names:
+            successors.setdefault(source, []).append(target)
+            if index == LOOP_BODY_OUTPUT:
+                body_entries.setdefault(source, []).append(target)
+
+    bodies: Dict[str, Set[str]] = {}
+    for loop_node in loop_nodes:
+        loop_name = loop_node.get("name")
+        explicit = (loop_node.get("parameters") or {}).get("body")
+        if explicit is not None:
+            body = {names_by_id.get(ref, ref) for ref in explicit} & names
+        else:
+            body = set()
+            stack = list(body_entries.get(loop_name, []))
+            while stack:
+                name = stack.pop()
+                if name == loop_name or name in body:
+                    continue
+                body.add(name)
+                stack.extend(successors.get(name, []))
+        body.discard(loop_name)
+        if not body:
+            logger.warning("Loop %s has no body nodes", loop_name)
+        bodies[loop_name] = body
+    return bodies
+
+
+def _loop_owners(bodies: Dict[str, Set[str]]) -> Dict[str, str]:
+    """Map each body node to its innermost enclosing loop."""
+    owners: Dict[str, str] = {}
+    for loop_name, body in sorted(bodies.items(), key=lambda item: -len(item[1])):
+        for name in body:
+            owners[name] = loop_name
+
+    for loop_name in bodies:
+        seen = {loop_name}
+        owner = owners.get(loop_name)
+        while owner is not None:
+            if owner in seen:
+                raise ValueError(f"Loop {loop_name} is nested inside its own body")
+            seen.add(owner)
+            owner = owners.get(owner)
+    return owners
+
+
+def _scope_member(name: str, scope: str | None, owners: Dict[str, str]) -> str | None:
+    """Return the node standing for name within scope, or None if outside it."""
+    while name is not None and owners.get(name) != scope:
+        name = owners.get(name)
+    return name
+
+
+def _plan_scope(
+    scope: str | None,
+    nodes: List[Dict[str, Any]],
+    connections: Dict[str, Any],
+    owners: Dict[str, str],
+    start_node_id: str | None = None
+) -> ExecutionPlan:
+    """Plan the nodes directly inside one loop body (or the top level).
+
+    Nested bodies collapse into their loop node, and edges leaving the
+    scope, including loop back-edges, are dropped.
+    """
+    members = [node for node in nodes if owners.get(node.get("name")) == scope]
+    scoped: Dict[str, Any] = {}
+    for source, _, target in _iter_connections(connections):
+        source = _scope_member(source, scope, owners)
+        target = _scope_member(target, scope, owners)
+        if source is None or target is None or source == target:
+            continue
+        scoped.setdefault(source, {"main": {"0": []}})["main"]["0"].append({"node": target})
+    return build_execution_plan(members, scoped, start_node_id)
+
+
+def _compile_loop(
+    node: CompiledNode,
+    body_plan: ExecutionPlan,
+    compiled_nodes: Dict[str, CompiledNode]
+) -> LoopPlan:
+    """Resolve body nodes and parameter getters for a loop node."""
+    parameters = node.parameters
+    stop_when = parameters.get("stop_when")
+    return LoopPlan(
+        body=[compiled_nodes[name] for name in body_plan.order],
+        plan=body_plan,
+        max_iterations=compile_binding(parameters.get("max_iterations", 1)),
+        stop_when=compile_binding(stop_when) if stop_when is not None else None,
+        stop_on=compile_binding(parameters.get("stop_on", True)),
+    )
+
+
+class WorkflowPlanCache:
+    """LRU cache of compiled workflows keyed by content hash."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Tuple[str, str | None, int], CompiledWorkflow] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compile(
+        self,
+        workflow: Dict[str, Any],
+        plugin_registry,
+        start_node_id: str | None = None
+    ) -> CompiledWorkflow:
+        """Return the cached plan for this workflow, compiling it on a miss."""
+        content_hash = workflow_hash(workflow)
+        # The entry holds the registry, so its id stays unique while cached
+        key = (content_hash, start_node_id, id(plugin_registry))
+
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        compiled = compile_workflow(workflow, plugin_registry, start_node_id, content_hash)
+        logger.debug("Compiled workflow %s (%d nodes)", content_hash[:12], len(compiled.nodes))
+
+        with self._lock:
+            self._entries[key] = compiled
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        """Drop all cached plans."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+_plan_cache = WorkflowPlanCache()
+
+
+def get_plan_cache() -> WorkflowPlanCache:
+    """Get the process-wide compiled workflow cache."""
+    return _plan_cache
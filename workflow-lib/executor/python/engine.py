@@ -4,7 +4,15 @@ from .workflow_adapter import WorkflowAdapter, is_n8n_workflow
 
 class WorkflowEngine:
     """Run n8n workflow configs (breaking change: legacy format removed)."""
-    def __init__(self, workflow_config, node_executor, logger, runtime=None, plugin_registry=None):
+    def __init__(
+        self,
+        workflow_config,
+        node_executor,
+        logger,
+        runtime=None,
+        plugin_registry=None,
+        checkpoint_store=None
+    ):
         self.workflow_config = workflow_config or {}
         self.node_executor = node_executor
         self.logger = logger
@@ -13,19 +21,52 @@ class WorkflowEngine:
 
         # Create adapter if we have runtime and plugin registry
         if runtime and plugin_registry:
-            self.adapter = WorkflowAdapter(node_executor, runtime, plugin_registry)
+            self.adapter = WorkflowAdapter(node_executor, runtime, plugin_registry, checkpoint_store)
         else:
             self.adapter = None
 
-    def execute(self):
-        """Execute the n8n workflow config."""
+    def execute(self, run_id=None, items=None, report_path=None):
+        """Execute the n8n workflow config, optionally over a list of items.
+
+        Returns the run's ExecutionReport; with report_path it is also
+        written there as JSON, including when a node raises.
+        """
+        adapter = self._get_adapter()
+        try:
+            adapter.execute(self.workflow_config, run_id, items)
+        finally:
+            report = self._publish_report(adapter.last_report, report_path)
+        return report
+
+    def resume(self, run_id, report_path=None):
+        """Resume a checkpointed run from its last completed node."""
+        adapter = self._get_adapter()
+        try:
+            adapter.resume(self.workflow_config, run_id)
+        finally:
+            report = self._publish_report(adapter.last_report, report_path)
+        return report
+
+    def _publish_report(self, report, report_path):
+        """Log the slowest nodes and optionally write the report."""
+        slowest = report.slowest(1)
+        if slowest:
+            self.logger.debug(
+                "Slowest node: %s (%s) %.1fms",
+                slowest[0].node_name, slowest[0].node_type, slowest[0].result.duration or 0.0
+            )
+        if report_path:
+            report.write(report_path)
+        return report
+
+    def _get_adapter(self):
+        """Validate the workflow config and return the n8n adapter."""
         # Enforce n8n format only
         if not is_n8n_workflow(self.workflow_config):
             self.logger.error("Legacy workflow format is no longer supported. Please migrate to n8n schema.")
             raise ValueError("Only n8n workflow format is supported")
 
-        if self.adapter:
-            self.adapter.execute(self.workflow_config)
-        else:
+        if not self.adapter:
             self.logger.error("Workflow engine requires runtime and plugin_registry for n8n execution")
             raise RuntimeError("Cannot execute n8n workflow without runtime and plugin_registry")
+        return self.adapter
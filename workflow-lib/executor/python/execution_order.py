@@ -1,15 +1,49 @@
 """Build execution order for n8n workflows."""
 from __future__ import annotations
 
-from typing import Any, Dict, List, Set
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
 
 
-def build_execution_order(
+class WorkflowCycleError(ValueError):
+    """Raised when workflow connections contain a dependency cycle."""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__(f"Workflow connections contain a cycle: {' -> '.join(cycle)}")
+
+
+@dataclass
+class ExecutionPlan:
+    """Topological plan for an n8n workflow.
+
+    Attributes:
+        order: Node names in a valid execution order
+        levels: Groups of node names whose dependencies are all in earlier
+            levels; a start node forms the first level on its own
+        predecessor_counts: Number of distinct upstream nodes per node name
+        successors: Distinct downstream node names per node name
+        predecessors: Distinct upstream node names per node name
+    """
+    order: List[str] = field(default_factory=list)
+    levels: List[List[str]] = field(default_factory=list)
+    predecessor_counts: Dict[str, int] = field(default_factory=dict)
+    successors: Dict[str, List[str]] = field(default_factory=dict)
+    predecessors: Dict[str, List[str]] = field(default_factory=dict)
+
+
+def build_execution_plan(
     nodes: List[Dict[str, Any]],
     connections: Dict[str, Any],
     start_node_id: str | None = None
-) -> List[str]:
-    """Build topological execution order from connections.
+) -> ExecutionPlan:
+    """Build a levelized topological plan from connections (Kahn's algorithm).
+
+    Ordering is stable: roots follow the order of the nodes list and
+    downstream nodes follow the order of the connections map. Connections to
+    unknown nodes are ignored, and so are self-connections: a node wired to
+    itself still runs once, as it did before the planner, rather than being
+    reported as a cycle. Runs in O(nodes + connections).
 
     Args:
         nodes: List of workflow nodes
@@ -17,43 +51,136 @@ def build_execution_order(
         start_node_id: Optional node ID to start execution from (from trigger)
 
     Returns:
-        List of node names in execution order
+        ExecutionPlan for the workflow
+
+    Raises:
+        WorkflowCycleError: If the connections contain a cycle
     """
-    node_names = {node["name"] for node in nodes}
-    has_inputs = _find_nodes_with_inputs(connections)
+    node_names = [node["name"] for node in nodes]
+    successors = _build_successors(node_names, connections)
+
+    predecessors: Dict[str, List[str]] = {name: [] for name in successors}
+    for source, targets in successors.items():
+        for target in targets:
+            predecessors[target].append(source)
+    predecessor_counts = {name: len(sources) for name, sources in predecessors.items()}
+
+    levels, remaining = _levelize(successors, predecessor_counts)
+    if sum(len(level) for level in levels) < len(successors):
+        raise WorkflowCycleError(_find_cycle(successors, remaining))
 
-    # If a start node is specified (from trigger), use it
+    # If a start node is specified (from trigger), run it first and level
+    # the rest after it, as the parallel scheduler does
     if start_node_id:
         start_node_name = _find_node_name_by_id(nodes, start_node_id)
-        if start_node_name:
-            # Start with the trigger node
-            order = [start_node_name]
-            # Add remaining nodes
-            remaining = node_names - {start_node_name}
-            order.extend(_add_remaining_nodes(remaining))
-            return order
+        if start_node_name in successors:
+            levels, _ = _levelize(successors, predecessor_counts, start_node_name)
+
+    order = [name for level in levels for name in level]
+
+    return ExecutionPlan(
+        order=order,
+        levels=levels,
+        predecessor_counts=predecessor_counts,
+        successors=successors,
+        predecessors=predecessors,
+    )
+
+
+def _levelize(
+    successors: Dict[str, List[str]],
+    predecessor_counts: Dict[str, int],
+    first: str | None = None
+) -> Tuple[List[List[str]], Dict[str, int]]:
+    """Group nodes into levels with Kahn's algorithm.
+
+    With first, that node forms the first level on its own and its
+    upstream nodes are not waited for; the other roots follow it.
 
-    # Default: Start with nodes that have no inputs
-    order = [name for name in node_names if name not in has_inputs]
+    Returns:
+        The levels and the unmet predecessor count left per node, which is
+        non-zero only for nodes on or behind a cycle
+    """
+    remaining = dict(predecessor_counts)
+    current = [name for name, count in remaining.items() if count == 0 and name != first]
+    deferred: List[str] = []
+    if first is not None:
+        remaining[first] = 0
+        current, deferred = [first], current
+
+    levels = []
+    while current:
+        levels.append(current)
+        following, deferred = deferred, []
+        for name in current:
+            for target in successors[name]:
+                if target == first:
+                    continue
+                remaining[target] -= 1
+                if remaining[target] == 0:
+                    following.append(target)
+        current = following
+    return levels, remaining
+
+
+def build_execution_order(
+    nodes: List[Dict[str, Any]],
+    connections: Dict[str, Any],
+    start_node_id: str | None = None
+) -> List[str]:
+    """Build topological execution order from connections.
 
-    # Add remaining nodes (simplified BFS)
-    remaining = node_names - set(order)
-    order.extend(_add_remaining_nodes(remaining))
+    Args:
+        nodes: List of workflow nodes
+        connections: Node connections map
+        start_node_id: Optional node ID to start execution from (from trigger)
 
-    return order
+    Returns:
+        List of node names in execution order
+    """
+    return build_execution_plan(nodes, connections, start_node_id).order
 
 
-def _find_nodes_with_inputs(connections: Dict[str, Any]) -> Set[str]:
-    """Find all nodes that have incoming connections."""
-    has_inputs = set()
+def _build_successors(node_names: List[str], connections: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Map each node to its distinct downstream nodes, in connection order, skipping self-edges."""
+    successors: Dict[str, Dict[str, None]] = {name: {} for name in node_names}
 
     for source_name, outputs in connections.items():
-        for output_type, indices in outputs.items():
+        if source_name not in successors:
+            continue
+        for indices in outputs.values():
             for targets in indices.values():
                 for target in targets:
-                    has_inputs.add(target["node"])
-
-    return has_inputs
+                    target_name = target.get("node")
+                    if target_name in successors and target_name != source_name:
+                        successors[source_name][target_name] = None
+
+    return {name: list(targets) for name, targets in successors.items()}
+
+
+def _find_cycle(successors: Dict[str, List[str]], remaining: Dict[str, int]) -> List[str]:
+    """Extract one cycle from the nodes Kahn's algorithm could not schedule."""
+    stuck_predecessors: Dict[str, List[str]] = {}
+    for source, targets in successors.items():
+        if remaining[source] == 0:
+            continue
+        for target in targets:
+            if remaining[target] > 0:
+                stuck_predecessors.setdefault(target, []).append(source)
+
+    # Every unscheduled node has an unscheduled predecessor, so walking
+    # backwards must revisit a node.
+    name = next(name for name, count in remaining.items() if count > 0)
+    seen: Dict[str, int] = {}
+    path = []
+    while name not in seen:
+        seen[name] = len(path)
+        path.append(name)
+        name = stuck_predecessors[name][0]
+
+    cycle = path[seen[name]:]
+    cycle.reverse()
+    return cycle + [cycle[0]]
 
 
 def _find_node_name_by_id(nodes: List[Dict[str, Any]], node_id: str) -> str | None:
@@ -62,13 +189,3 @@ def _find_node_name_by_id(nodes: List[Dict[str, Any]], node_id: str) -> str | No
         if node.get("id") == node_id:
             return node.get("name")
     return None
-
-
-def _add_remaining_nodes(remaining: Set[str]) -> List[str]:
-    """Add remaining nodes in order."""
-    order = []
-    while remaining:
-        name = next(iter(remaining))
-        order.append(name)
-        remaining.remove(name)
-    return order
@@ -0,0 +1,239 @@
+"""Per-node timing and status instrumentation for workflow runs."""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .plugins.base import NodeResult, NodeStatus
+
+# Containers are walked up to this many values when estimating output size
+SIZE_ESTIMATE_LIMIT = 10_000
+_SCALAR_SIZE = 8
+
+ERROR_CODES = (
+    (TimeoutError, "TIMEOUT"),
+    (ConnectionError, "CONNECTION_ERROR"),
+    (PermissionError, "PERMISSION_DENIED"),
+    (FileNotFoundError, "NOT_FOUND"),
+    (OSError, "IO_ERROR"),
+    (ImportError, "PLUGIN_LOAD_ERROR"),
+    (KeyError, "MISSING_INPUT"),
+    ((TypeError, ValueError), "INVALID_INPUT"),
+)
+
+
+def classify_error(error: BaseException) -> str:
+    """Map an exception raised by a plugin to a stable error code."""
+    for error_types, code in ERROR_CODES:
+        if isinstance(error, error_types):
+            return code
+    return "EXCEPTION"
+
+
+def estimate_output_size(value: Any, limit: int = SIZE_ESTIMATE_LIMIT) -> int:
+    """Estimate the serialized size of a plugin output in bytes.
+
+    Strings and bytes count their length, other scalars a fixed size.
+    Containers are walked until ``limit`` values have been seen; anything
+    past that is extrapolated from the average so far.
+    """
+    total = 0
+    seen = 0
+    pending = [value]
+    while pending and seen < limit:
+        current = pending.pop()
+        seen += 1
+        if isinstance(current, (str, bytes, bytearray)):
+            total += len(current)
+        elif isinstance(current, dict):
+            total += 2 + len(current)
+            for key, item in current.items():
+                total += len(key) if isinstance(key, str) else _SCALAR_SIZE
+                pending.append(item)
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            total += 2 + len(current)
+            pending.extend(current)
+        else:
+            total += _SCALAR_SIZE
+    if pending and seen:
+        total += int(total / seen * len(pending))
+    return total
+
+
+@dataclass
+class NodeRecord:
+    """Instrumentation of one node call within a run."""
+    node_id: str
+    node_name: str
+    node_type: str
+    result: NodeResult
+    items: Optional[int] = None
+    cached: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        record = {
+            "nodeId": self.node_id,
+            "nodeName": self.node_name,
+            "nodeType": self.node_type,
+            **self.result.to_dict(),
+        }
+        if self.items is not None:
+            record["items"] = self.items
+        if self.cached:
+            record["cached"] = True
+        return record
+
+
+class ExecutionReport:
+    """Collect a NodeResult for every node call of one workflow run."""
+
+    def __init__(self, run_id: str | None = None):
+        self.run_id = run_id
+        self.started_at = int(time.time() * 1000)
+        self.wall_time: float | None = None
+        self.records: List[NodeRecord] = []
+        self.summary: Dict[str, Any] = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def run_node(
+        self,
+        node_id: str,
+        node_name: str,
+        node_type: str,
+        call: Callable[..., Any],
+        *args: Any,
+        items: Optional[int] = None
+    ) -> Any:
+        """Call a plugin, record its NodeResult and return its output.
+
+        Exceptions are recorded with a classified error code and re-raised.
+        Outputs that carry an ``error`` key are recorded as errors too.
+        """
+        started = time.perf_counter_ns()
+        try:
+            output = call(*args)
+        except Exception as error:
+            self.add(node_id, node_name, node_type, NodeResult(
+                status=NodeStatus.ERROR,
+                error=str(error),
+                error_code=classify_error(error),
+                duration=(time.perf_counter_ns() - started) / 1e6,
+            ), items=items)
+            raise
+        duration = (time.perf_counter_ns() - started) / 1e6
+        self.add(node_id, node_name, node_type, self.result_for(output, duration), items=items)
+        return output
+
+    @staticmethod
+    def result_for(output: Any, duration: float | None = None) -> NodeResult:
+        """Build the NodeResult for a plugin output."""
+        status = NodeStatus.SUCCESS
+        error = None
+        error_code = None
+        if isinstance(output, dict) and output.get("error") is not None:
+            status = NodeStatus.ERROR
+            error = str(output["error"])
+            error_code = output.get("error_code") or "PLUGIN_ERROR"
+        elif isinstance(output, list):
+            failed = sum(1 for item in output if isinstance(item, dict) and item.get("error") is not None)
+            if failed:
+                status = NodeStatus.ERROR if failed == len(output) else NodeStatus.PARTIAL
+                error = f"{failed} of {len(output)} items failed"
+                error_code = "PLUGIN_ERROR"
+        return NodeResult(
+            status=status,
+            error=error,
+            error_code=error_code,
+            duration=duration,
+            output_size=estimate_output_size(output),
+        )
+
+    def add(
+        self,
+        node_id: str,
+        node_name: str,
+        node_type: str,
+        result: NodeResult,
+        items: Optional[int] = None,
+        cached: bool = False
+    ) -> None:
+        """Append a record; safe to call from scheduler threads."""
+        record = NodeRecord(node_id, node_name, node_type, result, items, cached)
+        with self._lock:
+            self.records.append(record)
+
+    def skipped(self, node_id: str, node_name: str, node_type: str, reason: str | None = None) -> None:
+        """Record a node that did not run."""
+        self.add(node_id, node_name, node_type, NodeResult(status=NodeStatus.SKIPPED, error=reason))
+
+    def finish(self, summary: Dict[str, Any] | None = None) -> "ExecutionReport":
+        """Stop the wall clock and attach executor statistics."""
+        self.wall_time = time.perf_counter() - self._started
+        self.summary = summary or {}
+        return self
+
+    def by_node(self) -> Dict[str, Dict[str, Any]]:
+        """Aggregate call count, total and max duration per node ID."""
+        nodes: Dict[str, Dict[str, Any]] = {}
+        for record in self.records:
+            entry = nodes.setdefault(record.node_id, {
+                "nodeType": record.node_type, "calls": 0, "errors": 0,
+                "totalDuration": 0.0, "maxDuration": 0.0,
+            })
+            entry["calls"] += 1
+            if record.result.status in (NodeStatus.ERROR, NodeStatus.PARTIAL):
+                entry["errors"] += 1
+            duration = record.result.duration or 0.0
+            entry["totalDuration"] += duration
+            entry["maxDuration"] = max(entry["maxDuration"], duration)
+        return nodes
+
+    def slowest(self, count: int = 10) -> List[NodeRecord]:
+        """Return the slowest node calls."""
+        return sorted(self.records, key=lambda record: record.result.duration or 0.0, reverse=True)[:count]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return run-level counters in the shape of the TS ExecutionMetrics."""
+        statuses = [record.result.status for record in self.records]
+        return {
+            "startTime": self.started_at,
+            "duration": self.wall_time * 1000 if self.wall_time is not None else None,
+            "nodesExecuted": sum(1 for status in statuses if status != NodeStatus.SKIPPED),
+            "successNodes": statuses.count(NodeStatus.SUCCESS),
+            "failedNodes": statuses.count(NodeStatus.ERROR),
+            "partialNodes": statuses.count(NodeStatus.PARTIAL),
+            "skippedNodes": statuses.count(NodeStatus.SKIPPED),
+            "dataProcessed": sum(record.result.output_size or 0 for record in self.records),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            "runId": self.run_id,
+            "metrics": self.metrics(),
+            "nodes": [record.to_dict() for record in self.records],
+            "byNode": self.by_node(),
+            "summary": self.summary,
+        }
+
+    def write(self, path: str | Path) -> None:
+        """Atomically write the report as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2, default=str)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
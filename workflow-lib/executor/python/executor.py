@@ -2,14 +2,28 @@
 
 Runtime for Python workflow plugins.
 Communicates with TypeScript via JSON over stdin/stdout.
+
+Single-shot mode reads one request from stdin and exits. With --serve the
+process stays up and answers newline-delimited JSON requests:
+
+    request:  {"id": "1", "plugin_path": "...", "inputs": {...}, "context": {...}}
+    response: {"id": "1", "result": {...}}  or  {"id": "1", "error": "..."}
+
+Responses are written as they complete, so they may arrive out of order.
 """
 
+import argparse
 import json
+import queue
 import sys
 import importlib
 import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, TextIO, Tuple
+
+DEFAULT_SERVE_WORKERS = 4
 
 
 class PythonRuntime:
@@ -24,39 +38,122 @@ class PythonRuntime:
         """Create a simple logger that writes to stderr."""
         import logging
         logger = logging.getLogger("workflow.python")
-        handler = logging.StreamHandler(sys.stderr)
-        handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
-        logger.addHandler(handler)
+        if not logger.handlers:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+            logger.addHandler(handler)
         logger.setLevel(logging.INFO)
         return logger
 
 
-def load_plugin(plugin_path: str) -> Any:
-    """Dynamically load a Python plugin module."""
-    path = Path(plugin_path)
-    if not path.exists():
-        raise FileNotFoundError(f"Plugin not found: {plugin_path}")
+class PluginModuleCache:
+    """Process-wide cache of loaded plugin modules.
+
+    Entries are keyed by resolved path and revalidated against the file's
+    mtime and size on every lookup, so an edited plugin is re-executed.
+    Modules are executed outside the cache-wide lock, under a lock per
+    path, so concurrent first loads of one plugin run it only once.
+    Set ``enabled = False`` to load a fresh module on every call.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self._entries: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self._lock = threading.Lock()
+        # One lock per path: a slow import only blocks callers of that plugin
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    def load(self, path: Path, reload: bool = False) -> Any:
+        """Return the module for path, executing it only when needed."""
+        if not self.enabled:
+            return _load_module(path)
+
+        key = str(path.resolve())
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature and not reload:
+                self.hits += 1
+                return entry[1]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # Another caller may have loaded it while this one waited
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == signature and not reload:
+                    self.hits += 1
+                    return entry[1]
+                if entry is None:
+                    self.misses += 1
+                else:
+                    self.reloads += 1
+
+            module = _load_module(path)
+            with self._lock:
+                self._entries[key] = (signature, module)
+            return module
 
+    def invalidate(self, plugin_path: Optional[str] = None) -> None:
+        """Drop one cached plugin, or all of them."""
+        with self._lock:
+            if plugin_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(Path(plugin_path).resolve()), None)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/reload counters and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "size": len(self._entries),
+        }
+
+
+_module_cache = PluginModuleCache()
+
+
+def get_module_cache() -> PluginModuleCache:
+    """Get the process-wide plugin module cache."""
+    return _module_cache
+
+
+def _load_module(path: Path) -> Any:
+    """Execute a plugin file as a new module."""
     spec = importlib.util.spec_from_file_location(path.stem, path)
     if spec is None or spec.loader is None:
-        raise ImportError(f"Cannot load plugin: {plugin_path}")
+        raise ImportError(f"Cannot load plugin: {path}")
 
     module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
     return module
 
 
-def execute_plugin(plugin_path: str, inputs: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
-    """Execute a Python plugin and return the result."""
-    module = load_plugin(plugin_path)
+def load_plugin(plugin_path: str, reload: bool = False) -> Any:
+    """Dynamically load a Python plugin module.
+
+    Modules are reused from the process-wide cache unless the file changed,
+    ``reload`` is set, or the cache is disabled.
+    """
+    path = Path(plugin_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Plugin not found: {plugin_path}")
+
+    return _module_cache.load(path, reload)
+
 
+def run_plugin_module(module: Any, plugin_path: str, runtime: PythonRuntime, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Call a loaded plugin's run function and normalize the result."""
     if not hasattr(module, "run"):
         raise AttributeError(f"Plugin {plugin_path} has no 'run' function")
 
-    runtime = PythonRuntime()
-    runtime.context = context
-    runtime.store = context.get("store", {})
-
     result = module.run(runtime, inputs)
 
     # Ensure result is a dict
@@ -66,8 +163,135 @@ def execute_plugin(plugin_path: str, inputs: Dict[str, Any], context: Dict[str,
     return result
 
 
+def execute_plugin(
+    plugin_path: str,
+    inputs: Dict[str, Any],
+    context: Dict[str, Any],
+    reload: bool = False
+) -> Dict[str, Any]:
+    """Execute a Python plugin and return the result."""
+    module = load_plugin(plugin_path, reload)
+
+    runtime = PythonRuntime()
+    runtime.context = context
+    runtime.store = context.get("store", {})
+
+    return run_plugin_module(module, plugin_path, runtime, inputs)
+
+
+class PluginServer:
+    """Answer JSON-lines plugin requests from a long-lived process.
+
+    Plugin modules come from the module cache and PythonRuntime instances
+    are pooled, so each request only pays for the plugin call itself. A
+    request with ``"reload": true`` re-executes its plugin module.
+    """
+
+    def __init__(self, output: TextIO, max_workers: int = DEFAULT_SERVE_WORKERS):
+        self.output = output
+        self.max_workers = max(1, max_workers)
+        self._runtimes: "queue.SimpleQueue[PythonRuntime]" = queue.SimpleQueue()
+        self._write_lock = threading.Lock()
+
+    def serve(self, stream: TextIO) -> None:
+        """Read requests until EOF, answering each as soon as it completes."""
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="plugin") as pool:
+            for line in stream:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    self._respond({"id": None, "error": f"Invalid JSON input: {e}"})
+                    continue
+                if not isinstance(request, dict):
+                    self._respond({"id": None, "error": "Request must be a JSON object"})
+                    continue
+                pool.submit(self._handle, request)
+
+    def execute(
+        self,
+        plugin_path: str,
+        inputs: Dict[str, Any],
+        context: Dict[str, Any],
+        reload: bool = False
+    ) -> Dict[str, Any]:
+        """Execute a plugin using a warm module and a pooled runtime."""
+        module = load_plugin(plugin_path, reload)
+        runtime = self._acquire_runtime()
+        try:
+            runtime.context = context
+            runtime.store = context.get("store", {})
+            return run_plugin_module(module, plugin_path, runtime, inputs)
+        finally:
+            runtime.context = {}
+            runtime.store = {}
+            self._runtimes.put(runtime)
+
+    def _handle(self, request: Dict[str, Any]) -> None:
+        """Run one request and write its response."""
+        request_id = request.get("id")
+        plugin_path = request.get("plugin_path")
+        if not plugin_path:
+            self._respond({"id": request_id, "error": "plugin_path is required"})
+            return
+
+        try:
+            result = self.execute(
+                plugin_path,
+                request.get("inputs", {}),
+                request.get("context", {}),
+                bool(request.get("reload")),
+            )
+            self._respond({"id": request_id, "result": result})
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self._respond({"id": request_id, "error": str(e)})
+
+    def _acquire_runtime(self) -> PythonRuntime:
+        """Take an idle runtime from the pool or create one."""
+        try:
+            return self._runtimes.get_nowait()
+        except queue.Empty:
+            return PythonRuntime()
+
+    def _respond(self, response: Dict[str, Any]) -> None:
+        """Write one response line."""
+        try:
+            line = json.dumps(response)
+        except (TypeError, ValueError) as e:
+            line = json.dumps({"id": response.get("id"), "error": f"Result is not JSON serializable: {e}"})
+        with self._write_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+
+def serve(max_workers: int = DEFAULT_SERVE_WORKERS) -> None:
+    """Run the persistent JSON-lines server on stdin/stdout."""
+    output = sys.stdout
+    # Anything plugins print must not corrupt the response stream
+    sys.stdout = sys.stderr
+    try:
+        PluginServer(output, max_workers).serve(sys.stdin)
+    finally:
+        sys.stdout = output
+
+
 def main():
     """Main entry point for JSON-based communication."""
+    parser = argparse.ArgumentParser(description="Execute Python workflow plugins")
+    parser.add_argument("--serve", action="store_true", help="Answer newline-delimited JSON requests until EOF")
+    parser.add_argument("--workers", type=int, default=DEFAULT_SERVE_WORKERS, help="Requests handled concurrently in --serve mode")
+    parser.add_argument("--no-module-cache", action="store_true", help="Load a fresh plugin module for every request")
+    args = parser.parse_args()
+
+    if args.no_module_cache:
+        _module_cache.enabled = False
+
+    if args.serve:
+        serve(args.workers)
+        return
+
     # Read input from stdin
     try:
         input_data = json.loads(sys.stdin.read())
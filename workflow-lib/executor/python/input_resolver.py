@@ -1,22 +1,184 @@
-"""Resolve workflow bindings and coercions."""
+"""Resolve workflow bindings and coercions.
+
+A string input starting with ``$`` is a binding to a store value. The part
+after ``$`` names the store key, optionally followed by a path into the
+value: ``$user.address.city`` or ``$results[0].id``. Dict and list inputs
+are resolved recursively; anything else is a literal. Path steps on other
+objects read public attributes only; names starting with ``_`` resolve to
+None.
+
+Bindings are compiled once into getters taking the store, so executors
+that reuse a plan pay no parsing cost per run.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
 from .value_helpers import ValueHelpers
 
+Getter = Callable[[Dict[str, Any]], Any]
+
+# Compiled container inputs kept per InputResolver before starting over
+COMPILED_INPUTS_LIMIT = 4096
+
+_PATH_TOKEN = re.compile(r"\.([^.\[\]]+)|\[(-?\d+)\]")
+_ROOT = re.compile(r"[^.\[\]]+")
+
+
+def parse_binding(reference: str) -> Optional[Tuple[str, Tuple[Any, ...]]]:
+    """Split ``name.path[0].field`` into the store key and its path steps.
+
+    Returns None when the reference is not a well-formed path; such
+    bindings are looked up as a flat store key.
+    """
+    root = _ROOT.match(reference)
+    if root is None:
+        return None
+    steps = []
+    position = root.end()
+    while position < len(reference):
+        token = _PATH_TOKEN.match(reference, position)
+        if token is None:
+            return None
+        field_name, index = token.groups()
+        steps.append(int(index) if index is not None else field_name)
+        position = token.end()
+    return root.group(), tuple(steps)
+
+
+def _step(value: Any, step: Any) -> Any:
+    """Take one path step into value, returning None when it is missing."""
+    if isinstance(value, dict):
+        return value.get(step if isinstance(step, str) else str(step))
+    if isinstance(step, int):
+        if isinstance(value, (list, tuple)) and -len(value) <= step < len(value):
+            return value[step]
+        return None
+    if isinstance(value, (list, tuple)) and step.lstrip("-").isdigit():
+        return _step(value, int(step))
+    if step.startswith("_"):
+        # Keep bindings away from private attributes and dunders like __class__
+        return None
+    return getattr(value, step, None)
+
+
+@lru_cache(maxsize=4096)
+def compile_reference(reference: str) -> Getter:
+    """Return a getter for the store binding ``$reference``."""
+    parsed = parse_binding(reference)
+    if parsed is None or not parsed[1]:
+        return lambda store: store.get(reference)
+
+    key, steps = parsed
+
+    def get(store: Dict[str, Any]) -> Any:
+        value = store.get(key)
+        if value is None:
+            # Keys containing dots were stored whole before paths existed
+            return store.get(reference)
+        for step in steps:
+            value = _step(value, step)
+            if value is None:
+                return None
+        return value
+
+    return get
+
+
+def compile_binding(value: Any) -> Getter:
+    """Compile an input value into a getter that resolves it against a store.
+
+    Literals, and containers without bindings, resolve to the value itself
+    so no copy is made per call.
+    """
+    if isinstance(value, str):
+        if value.startswith("$"):
+            return compile_reference(value[1:])
+        return _literal(value)
+
+    if isinstance(value, dict):
+        dynamic = [(key, compile_binding(item)) for key, item in value.items()]
+        dynamic = [(key, getter) for key, getter in dynamic if not _is_literal(getter)]
+        if not dynamic:
+            return _literal(value)
+
+        def get_dict(store: Dict[str, Any]) -> Dict[str, Any]:
+            # Copying keeps literal entries and key order; bindings overwrite in place
+            resolved = dict(value)
+            for key, getter in dynamic:
+                resolved[key] = getter(store)
+            return resolved
+
+        return get_dict
+
+    if isinstance(value, (list, tuple)):
+        getters = [compile_binding(item) for item in value]
+        if all(_is_literal(getter) for getter in getters):
+            return _literal(value)
+        container = type(value)
+        return lambda store: container(getter(store) for getter in getters)
+
+    return _literal(value)
+
+
+def compile_inputs(inputs: Optional[Dict[str, Any]]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Compile a node's inputs into a getter returning the resolved dict."""
+    return compile_binding(inputs or {})
+
+
+def _literal(value: Any) -> Getter:
+    """Return a getter for a value without bindings."""
+    getter = lambda store: value
+    getter.literal = True
+    return getter
+
+
+def _is_literal(getter: Getter) -> bool:
+    """Return True if getter was built by _literal."""
+    return getattr(getter, "literal", False)
+
 
 class InputResolver:
-    """Resolve bindings in workflow inputs."""
+    """Resolve bindings in workflow inputs.
+
+    Dict and list inputs are compiled on first use and the getter is
+    reused for as long as the same object is passed in, so node inputs
+    must not be mutated between runs.
+    """
     def __init__(self, store: dict):
         self.store = store
+        # id(value) -> (value, getter); holding value keeps its id unique
+        self._compiled: Dict[int, Tuple[Any, Getter]] = {}
 
     def resolve_inputs(self, inputs: dict) -> dict:
         """Resolve bindings for every input."""
-        return {key: self.resolve_binding(value) for key, value in (inputs or {}).items()}
+        if not inputs:
+            return {}
+        return dict(self._getter(inputs)(self.store))
 
     def resolve_binding(self, value):
         """Resolve a single binding value."""
-        if isinstance(value, str) and value.startswith("$"):
-            return self.store.get(value[1:])
+        if isinstance(value, str):
+            if value.startswith("$"):
+                return compile_reference(value[1:])(self.store)
+            return value
+        if isinstance(value, (dict, list, tuple)):
+            return self._getter(value)(self.store)
         return value
 
+    def _getter(self, value: Any) -> Getter:
+        """Return the compiled getter for a container input."""
+        cached = self._compiled.get(id(value))
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        if len(self._compiled) >= COMPILED_INPUTS_LIMIT:
+            self._compiled.clear()
+        getter = compile_binding(value)
+        self._compiled[id(value)] = (value, getter)
+        return getter
+
     def coerce_bool(self, value) -> bool:
         """Coerce values into booleans."""
         return ValueHelpers.coerce_bool(value)
@@ -2,25 +2,147 @@
 from __future__ import annotations
 
 import logging
+import time
+import uuid
+from collections import ChainMap
+from dataclasses import dataclass, field
 from typing import Any, Dict, List
 
-from .execution_order import build_execution_order
+from .checkpoint import (
+    STATUS_COMPLETED,
+    Checkpoint,
+    CheckpointError,
+    CheckpointStore,
+    ExecutionCheckpointer,
+)
+from .compiled_workflow import CompiledNode, WorkflowPlanCache, get_plan_cache
+from .execution_order import ExecutionPlan
+from .execution_report import ExecutionReport
+from .parallel_scheduler import ParallelScheduler, ScheduleStats, resolve_max_concurrency
+from .plugins.base import NodeResult, NodeStatus
+from .result_cache import ResultCache, get_result_cache
+from .value_helpers import ValueHelpers
 
 logger = logging.getLogger(__name__)
 
+# Returned by _run_node for nodes a resumed checkpoint already covers
+_ALREADY_COMPLETED = object()
+
+
+@dataclass
+class LoopStats:
+    """Iteration counts and timings of one loop node within a run."""
+    runs: int = 0
+    iterations: int = 0
+    stopped_early: int = 0
+    iteration_times: List[float] = field(default_factory=list)
+
+    @property
+    def total_time(self) -> float:
+        """Summed duration of all iterations."""
+        return sum(self.iteration_times)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for logging and reporting."""
+        return {
+            "runs": self.runs,
+            "iterations": self.iterations,
+            "stoppedEarly": self.stopped_early,
+            "totalTime": self.total_time,
+            "meanIterationTime": self.total_time / self.iterations if self.iterations else 0.0,
+            "iterationTimes": self.iteration_times,
+        }
+
 
 class N8NExecutor:
     """Execute n8n-style workflows."""
 
-    def __init__(self, runtime, plugin_registry):
+    def __init__(
+        self,
+        runtime,
+        plugin_registry,
+        parallel: bool = False,
+        plan_cache: WorkflowPlanCache | None = None,
+        result_cache: ResultCache | None = None,
+        checkpoint_store: CheckpointStore | None = None
+    ):
         self.runtime = runtime
         self.plugin_registry = plugin_registry
+        self.parallel = parallel
+        self.plan_cache = plan_cache or get_plan_cache()
+        self.result_cache = result_cache or get_result_cache()
+        self.checkpoint_store = checkpoint_store
+        self._memoize = True
+        self._checkpointer: ExecutionCheckpointer | None = None
+        self.last_run_stats: ScheduleStats | None = None
+        self.last_loop_stats: Dict[str, LoopStats] = {}
+        self.last_run_id: str | None = None
+        self.last_items: List[Dict[str, Any]] | None = None
+        self.last_report: ExecutionReport | None = None
+        self._report = ExecutionReport()
+
+    def execute(
+        self,
+        workflow: Dict[str, Any],
+        run_id: str | None = None,
+        items: List[Dict[str, Any]] | None = None
+    ) -> ExecutionReport:
+        """Execute n8n workflow.
+
+        With a checkpoint store, progress is saved after every node under
+        run_id (generated when omitted) so the run can be resumed.
+
+        With items, the workflow runs once over the whole list: each node
+        receives a list of items, resolves its parameters against each item
+        (falling back to the store), merges the item over them and emits one
+        output item per input item. Plugins implementing
+        execute_batch get the list in a single call. The items emitted by
+        the final nodes are left in last_items. Item runs are sequential
+        and are not checkpointed.
 
-    def execute(self, workflow: Dict[str, Any]) -> None:
-        """Execute n8n workflow."""
+        Returns:
+            ExecutionReport with a NodeResult for every node call
+        """
+        return self._run(workflow, run_id, resume=False, items=items)
+
+    def resume(self, workflow: Dict[str, Any], run_id: str) -> ExecutionReport:
+        """Continue a checkpointed run from its last completed node.
+
+        Raises:
+            CheckpointError: If no checkpoint store is configured, the run has
+                no checkpoint, or the workflow changed since it was written
+        """
+        return self._run(workflow, run_id, resume=True)
+
+    def _run(
+        self,
+        workflow: Dict[str, Any],
+        run_id: str | None,
+        resume: bool,
+        items: List[Dict[str, Any]] | None = None
+    ) -> ExecutionReport:
+        """Run the workflow and finish its report, even when a node fails."""
+        self._report = ExecutionReport(run_id)
+        self.last_report = self._report
+        try:
+            self._run_workflow(workflow, run_id, resume, items)
+        finally:
+            self._report.run_id = self.last_run_id
+            self._report.finish(self.run_summary())
+        return self._report
+
+    def _run_workflow(
+        self,
+        workflow: Dict[str, Any],
+        run_id: str | None,
+        resume: bool,
+        items: List[Dict[str, Any]] | None
+    ) -> None:
+        """Compile the workflow and execute it, optionally checkpointing."""
         nodes = workflow.get("nodes", [])
-        connections = workflow.get("connections", {})
         triggers = workflow.get("triggers", [])
+        settings = workflow.get("settings") or {}
+        self.last_run_id = run_id
 
         if not nodes:
             logger.warning("No nodes in workflow")
@@ -29,14 +151,88 @@ class N8NExecutor:
         # Find enabled manual trigger (if any)
         start_node_id = self._get_start_node_from_triggers(triggers)
 
-        # Build execution order from connections (optionally starting from trigger node)
-        execution_order = build_execution_order(nodes, connections, start_node_id)
+        # Results of plugins declared pure are memoized unless disabled
+        self._memoize = settings.get("memoize", True) is not False
+        self.last_run_stats = None
+        self.last_loop_stats = {}
+        self.last_items = None
 
-        # Execute nodes in order
-        for node_name in execution_order:
-            node = self._find_node_by_name(nodes, node_name)
-            if node:
-                self._execute_node(node)
+        # Reuse the compiled plan when this exact workflow has run before
+        compiled = self.plan_cache.get_or_compile(workflow, self.plugin_registry, start_node_id)
+
+        if items is not None:
+            if self.checkpoint_store:
+                logger.warning("Item batch runs are not checkpointed")
+            self._checkpointer = None
+            order = [compiled.nodes[name] for name in compiled.order]
+            self.last_items = self._run_items(compiled.plan, order, list(items))
+            return
+
+        self._checkpointer = self._start_checkpointer(compiled.content_hash, run_id, resume)
+        if self._checkpointer and self._checkpointer.checkpoint.status == STATUS_COMPLETED:
+            logger.info("Run %s already completed, nothing to resume", self.last_run_id)
+            return
+
+        # Opt-in: run independent branches concurrently
+        if self.parallel or settings.get("parallel"):
+            scheduler = ParallelScheduler(
+                self._run_node, resolve_max_concurrency(settings), on_complete=self._complete_node
+            )
+            self.last_run_stats = scheduler.run(compiled.plan, compiled.nodes, compiled.start_name)
+        else:
+            # Execute nodes in order
+            for node_name in compiled.order:
+                node = compiled.nodes[node_name]
+                self._complete_node(node, self._run_node(node))
+
+        if self._checkpointer:
+            self._checkpointer.finish()
+
+    def run_summary(self) -> Dict[str, Any]:
+        """Return scheduling and loop statistics of the last run."""
+        return {
+            "runId": self.last_run_id,
+            "schedule": self.last_run_stats.to_dict() if self.last_run_stats else None,
+            "loops": {name: stats.to_dict() for name, stats in self.last_loop_stats.items()},
+        }
+
+    def _start_checkpointer(
+        self,
+        content_hash: str,
+        run_id: str | None,
+        resume: bool
+    ) -> ExecutionCheckpointer | None:
+        """Create the checkpointer for this run, restoring state when resuming."""
+        if not self.checkpoint_store:
+            if resume:
+                raise CheckpointError("Cannot resume without a checkpoint store")
+            self.last_run_id = run_id
+            return None
+
+        self.last_run_id = run_id or uuid.uuid4().hex
+        if not resume:
+            checkpoint = Checkpoint(run_id=self.last_run_id, workflow_hash=content_hash)
+            logger.info("Checkpointing run %s to %s", self.last_run_id, self.checkpoint_store.directory)
+            checkpointer = ExecutionCheckpointer(self.checkpoint_store, self.runtime, checkpoint)
+            checkpointer.start()
+            return checkpointer
+
+        checkpoint = self.checkpoint_store.load(self.last_run_id)
+        if checkpoint is None:
+            raise CheckpointError(f"No checkpoint found for run {self.last_run_id}")
+        if checkpoint.workflow_hash != content_hash:
+            raise CheckpointError(f"Workflow changed since run {self.last_run_id} was checkpointed")
+
+        checkpointer = ExecutionCheckpointer(self.checkpoint_store, self.runtime, checkpoint)
+        if checkpoint.status == STATUS_COMPLETED:
+            return checkpointer
+        checkpointer.restore()
+        checkpointer.start()
+        logger.info(
+            "Resuming run %s: %d nodes already completed",
+            self.last_run_id, len(checkpoint.completed) - len(checkpoint.replay)
+        )
+        return checkpointer
 
     def _get_start_node_from_triggers(self, triggers: List[Dict]) -> str | None:
         """Get start node ID from enabled manual triggers.
@@ -62,37 +258,234 @@ class N8NExecutor:
 
         return None
 
-    def _find_node_by_name(self, nodes: List[Dict], name: str) -> Dict | None:
-        """Find node by name."""
-        for node in nodes:
-            if node.get("name") == name:
-                return node
-        return None
+    def _run_node(self, node: CompiledNode) -> Any:
+        """Execute a top-level node unless a resumed checkpoint already covers it.
+
+        Its outputs are left for _complete_node to publish.
+        """
+        checkpointer = self._checkpointer
+        if checkpointer is not None and checkpointer.is_completed(node.node_id):
+            logger.debug("Node %s completed before resume, skipping", node.name)
+            self._report.skipped(node.node_id, node.name, node.node_type, "completed before resume")
+            return _ALREADY_COMPLETED
+        return self._execute_node(node, publish=False)
 
-    def _execute_node(self, node: Dict[str, Any]) -> Any:
-        """Execute single node."""
-        node_type = node.get("type")
-        node_name = node.get("name", node.get("id"))
+    def _complete_node(self, node: CompiledNode, result: Any) -> None:
+        """Publish a top-level node's outputs and checkpoint them.
 
-        if node.get("disabled"):
-            logger.debug("Node %s is disabled, skipping", node_name)
+        Called on the scheduling thread one node at a time, so a checkpoint
+        record holds exactly the keys of the node it names even when
+        branches run concurrently.
+        """
+        if result is _ALREADY_COMPLETED:
+            return
+        written = self._store_outputs(result)
+        if self._checkpointer:
+            self._checkpointer.node_completed(node.node_id, written)
+
+    def _execute_node(self, node: CompiledNode, publish: bool = True) -> Any:
+        """Execute single node, publishing its outputs unless publish is False."""
+        report = self._report
+        if node.disabled:
+            logger.debug("Node %s is disabled, skipping", node.name)
+            report.skipped(node.node_id, node.name, node.node_type, "disabled")
             return None
 
-        if node_type == "control.loop":
+        if node.loop is not None:
             return self._execute_loop(node)
 
-        plugin = self.plugin_registry.get(node_type)
+        plugin = node.resolve()
         if not plugin:
-            logger.error("Unknown node type: %s", node_type)
+            logger.error("Unknown node type: %s", node.node_type)
+            self._record_unknown(node)
             return None
 
-        inputs = node.get("parameters", {})
-        logger.debug("Executing node %s (%s)", node_name, node_type)
+        logger.debug("Executing node %s (%s)", node.name, node.node_type)
+
+        inputs = node.inputs(self.runtime.store)
+        if node.pure and self._memoize:
+            hit, result = self.result_cache.get(node.node_type, inputs)
+            if hit:
+                logger.debug("Memoized result for node %s", node.name)
+                report.add(node.node_id, node.name, node.node_type, report.result_for(result, 0.0), cached=True)
+            else:
+                result = report.run_node(
+                    node.node_id, node.name, node.node_type, plugin, self.runtime, inputs
+                )
+                self.result_cache.put(node.node_type, inputs, result)
+        else:
+            result = report.run_node(
+                node.node_id, node.name, node.node_type, plugin, self.runtime, inputs
+            )
 
-        result = plugin(self.runtime, inputs)
+        if publish:
+            self._store_outputs(result)
         return result
 
-    def _execute_loop(self, node: Dict[str, Any]) -> Any:
-        """Execute loop node (placeholder)."""
-        logger.debug("Loop execution not yet implemented in n8n executor")
-        return None
+    def _run_items(
+        self,
+        plan: ExecutionPlan,
+        nodes: List[CompiledNode],
+        items: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Pass items through nodes in plan order; return the items of sink nodes.
+
+        Root nodes receive items; every other node receives the items
+        emitted by its upstream nodes, in connection order.
+        """
+        emitted: Dict[str, List[Dict[str, Any]]] = {}
+        for node in nodes:
+            upstream = plan.predecessors.get(node.name)
+            node_items = items if not upstream else [
+                item for source in upstream for item in emitted[source]
+            ]
+            emitted[node.name] = self._execute_node_items(node, node_items)
+
+        return [
+            item for node in nodes if not plan.successors.get(node.name)
+            for item in emitted[node.name]
+        ]
+
+    def _execute_node_items(self, node: CompiledNode, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute a node over a list of items, one output item per input."""
+        report = self._report
+        if node.disabled:
+            logger.debug("Node %s is disabled, passing items through", node.name)
+            report.skipped(node.node_id, node.name, node.node_type, "disabled")
+            return items
+
+        if node.loop is not None:
+            return self._execute_loop(node, items)
+
+        if not node.resolve():
+            logger.error("Unknown node type: %s", node.node_type)
+            self._record_unknown(node)
+            return []
+
+        logger.debug("Executing node %s (%s) on %d items", node.name, node.node_type, len(items))
+        # Bindings see the item's own upstream output ahead of the shared store
+        store = self.runtime.store
+        inputs = [{**node.inputs(ChainMap(item, store)), **item} for item in items]
+
+        if node.batch is not None:
+            results = report.run_node(
+                node.node_id, node.name, node.node_type, node.batch, inputs, self.runtime, items=len(inputs)
+            )
+            if len(results) != len(inputs):
+                raise ValueError(
+                    f"{node.node_type} execute_batch returned {len(results)} results for {len(inputs)} items"
+                )
+        else:
+            results = report.run_node(
+                node.node_id, node.name, node.node_type, self._call_per_item, node, inputs, items=len(inputs)
+            )
+
+        outputs = [
+            result if isinstance(result, dict) else ({} if result is None else {"result": result})
+            for result in results
+        ]
+        if outputs:
+            # Loop conditions read the store, so publish the latest item
+            self._store_outputs(outputs[-1])
+        return outputs
+
+    def _call_per_item(self, node: CompiledNode, inputs: List[Dict[str, Any]]) -> List[Any]:
+        """Call a plugin without execute_batch once per item."""
+        if not (node.pure and self._memoize):
+            return [node.plugin(self.runtime, item_inputs) for item_inputs in inputs]
+
+        results = []
+        for item_inputs in inputs:
+            hit, result = self.result_cache.get(node.node_type, item_inputs)
+            if not hit:
+                result = node.plugin(self.runtime, item_inputs)
+                self.result_cache.put(node.node_type, item_inputs, result)
+            results.append(result)
+        return results
+
+    def _record_unknown(self, node: CompiledNode) -> None:
+        """Record a node whose type has no registered plugin."""
+        self._report.add(node.node_id, node.name, node.node_type, NodeResult(
+            status=NodeStatus.ERROR,
+            error=f"Unknown node type: {node.node_type}",
+            error_code="UNKNOWN_NODE_TYPE",
+        ))
+
+    def _store_outputs(self, result: Any) -> List[str]:
+        """Publish node outputs to the runtime store, as NodeExecutor does.
+
+        Returns the keys written, which the checkpointer re-encodes.
+        """
+        if result is None:
+            return []
+        if not isinstance(result, dict):
+            result = {"result": result}
+        self.runtime.store.update(result)
+        return list(result)
+
+    def _execute_loop(self, node: CompiledNode, items: List[Dict[str, Any]] | None = None) -> Any:
+        """Run the compiled loop body until max_iterations or the stop condition.
+
+        The stop condition is checked after each iteration. When resuming,
+        iterations recorded in the checkpoint are not repeated. With items,
+        each iteration passes the previous iteration's output items through
+        the body and the last ones are returned.
+        """
+        loop = node.loop
+        store = self.runtime.store
+        max_iterations = loop.max_iterations(store)
+        try:
+            max_iterations = int(max_iterations)
+        except (TypeError, ValueError):
+            max_iterations = 1
+
+        args = self.runtime.context.get("args")
+        if getattr(args, "once", False):
+            max_iterations = min(max_iterations, 1)
+
+        stop_on = ValueHelpers.coerce_bool(loop.stop_on(store))
+        stop_when = loop.stop_when
+
+        def should_stop() -> bool:
+            return stop_when is not None and ValueHelpers.coerce_bool(stop_when(store)) == stop_on
+
+        checkpointer = self._checkpointer
+        iteration = checkpointer.loop_counter(node.node_id) if checkpointer else 0
+        stats = self.last_loop_stats.setdefault(node.name, LoopStats())
+        stats.runs += 1
+        if iteration and should_stop():
+            return items
+
+        loop_started = time.perf_counter_ns()
+        # Stats accumulate over every run of this loop node; log only this one
+        first_iteration = len(stats.iteration_times)
+
+        while iteration < max_iterations:
+            iteration += 1
+            logger.info("--- Loop %s iteration %s ---", node.name, iteration)
+            started = time.perf_counter()
+            written: List[str] = []
+            if items is None:
+                for body_node in loop.body:
+                    result = self._execute_node(body_node, publish=False)
+                    written.extend(self._store_outputs(result))
+            else:
+                items = self._run_items(loop.plan, loop.body, items)
+            stats.iteration_times.append(time.perf_counter() - started)
+            stats.iterations += 1
+            if checkpointer:
+                checkpointer.iteration_completed(node.node_id, iteration, written)
+            if should_stop():
+                stats.stopped_early += 1
+                break
+
+        iteration_times = stats.iteration_times[first_iteration:]
+        logger.info(
+            "Loop %s: %d iterations in %.3fs",
+            node.name, len(iteration_times), sum(iteration_times)
+        )
+        self._report.add(node.node_id, node.name, node.node_type, NodeResult(
+            status=NodeStatus.SUCCESS,
+            duration=(time.perf_counter_ns() - loop_started) / 1e6,
+        ))
+        return items
@@ -1,4 +1,5 @@
 """Execute workflow nodes."""
+from .execution_report import ExecutionReport
 
 
 class NodeExecutor:
@@ -8,11 +9,36 @@ class NodeExecutor:
         self.plugin_registry = plugin_registry
         self.input_resolver = input_resolver
         self.loop_executor = loop_executor
+        self.last_report = None
+        self._report = None
 
     def execute_nodes(self, nodes):
-        """Execute a list of nodes."""
-        for node in nodes:
-            self.execute_node(node)
+        """Execute a list of nodes and return their ExecutionReport.
+
+        Each top-level call records into a fresh report. Loop bodies run
+        through here too and record into the report of the enclosing call.
+        """
+        if self._report is not None:
+            for node in nodes:
+                self.execute_node(node)
+            return self._report
+
+        self._report = report = ExecutionReport()
+        self.last_report = report
+        try:
+            for node in nodes:
+                self.execute_node(node)
+        finally:
+            self._report = None
+            report.finish()
+        return report
+
+    def _current_report(self):
+        """Report of the call in progress, or a fresh one for a lone node."""
+        if self._report is not None:
+            return self._report
+        self.last_report = ExecutionReport()
+        return self.last_report
 
     def execute_node(self, node):
         """Execute a single node."""
@@ -25,6 +51,8 @@ class NodeExecutor:
         if when_value is not None:
             if not self.input_resolver.coerce_bool(self.input_resolver.resolve_binding(when_value)):
                 self.runtime.logger.trace("Node %s skipped by condition", node.get("id"))
+                node_id = node.get("id", node_type)
+                self._current_report().skipped(node_id, node.get("name", node_id), node_type, "condition")
                 return None
 
         if node_type == "control.loop":
@@ -37,7 +65,8 @@ class NodeExecutor:
 
         inputs = self.input_resolver.resolve_inputs(node.get("inputs", {}))
         self.runtime.logger.debug("Executing node %s", node_type)
-        result = plugin(self.runtime, inputs)
+        node_id = node.get("id", node_type)
+        result = self._current_report().run_node(node_id, node.get("name", node_id), node_type, plugin, self.runtime, inputs)
         if not isinstance(result, dict):
             result = {"result": result}
 
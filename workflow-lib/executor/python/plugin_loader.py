@@ -1,7 +1,16 @@
 """Load workflow plugins by dotted path."""
 from ..utils import load_callable
+from .plugins.base import NodeExecutor as PluginExecutor
 
 
 def load_plugin_callable(path: str):
-    """Load a workflow plugin callable."""
-    return load_callable(path)
+    """Load a workflow plugin callable.
+
+    A path naming a plugin class is instantiated and its bound ``run``
+    method returned, so the executor can reach the instance (and its
+    ``execute_batch``) through ``__self__``.
+    """
+    target = load_callable(path)
+    if isinstance(target, type) and issubclass(target, PluginExecutor):
+        return target().run
+    return target
@@ -1,9 +1,13 @@
 """Workflow plugin registry with automatic plugin discovery."""
+from __future__ import annotations
+
 import json
 import logging
 import os
+import threading
 from pathlib import Path
 from .plugin_loader import load_plugin_callable
+from .plugins.manifest_index import load_manifest_index
 
 logger = logging.getLogger("autometabuilder")
 
@@ -12,59 +16,44 @@ def scan_plugins() -> dict:
     """
     Automatically scan and discover workflow plugins.
 
-    Scans the plugins directory and subdirectories, looking for package.json files
-    that define plugins. Returns a map of plugin_name -> callable_path.
+    Reads the precompiled manifest index for the plugins directory, which is
+    rebuilt from the package.json files whenever one of them changes.
+    Returns a map of plugin_name -> callable_path.
 
     Plugin structure:
     - Each plugin is in its own directory with a package.json file
     - Plugin name can be in "metadata.plugin_type" (preferred) or "name" field
     - package.json must have a "main" field pointing to the Python file
-    - The Python file must have a "run" function
+    - "metadata.class" names the NodeExecutor subclass; without it the
+      Python file must have a "run" function
     """
-    plugin_map = {}
     plugins_base = Path(__file__).parent / "plugins"
 
     if not plugins_base.exists():
         logger.warning("Plugins directory not found: %s", plugins_base)
-        return plugin_map
-
-    # Scan all subdirectories for package.json files
-    for package_json_path in plugins_base.rglob("package.json"):
-        try:
-            # Read package.json
-            with open(package_json_path, "r", encoding="utf-8") as f:
-                package_data = json.load(f)
-
-            # Try metadata.plugin_type first (preferred), then fall back to name
-            metadata = package_data.get("metadata", {})
-            plugin_name = metadata.get("plugin_type") or package_data.get("name")
-            main_file = package_data.get("main")
-
-            if not plugin_name or not main_file:
-                logger.debug("Skipping %s: missing 'plugin_type'/'name' or 'main' field", package_json_path)
-                continue
-
-            # Build the Python module path
-            plugin_dir = package_json_path.parent
-            main_file_stem = Path(main_file).stem  # Remove .py extension
+        return {}
 
-            # Calculate relative path from plugins directory
-            rel_path = plugin_dir.relative_to(plugins_base)
+    index = load_manifest_index(plugins_base)
+    plugin_map = {
+        plugin_name: f"{entry['module']}.{entry.get('class') or 'run'}"
+        for plugin_name, entry in index["plugins"].items()
+    }
 
-            # Build module path: autometabuilder.workflow.plugins.<category>.<plugin_dir>.<main_file>.run
-            parts = ["autometabuilder", "workflow", "plugins"] + list(rel_path.parts) + [main_file_stem, "run"]
-            callable_path = ".".join(parts)
-
-            plugin_map[plugin_name] = callable_path
-            logger.debug("Discovered plugin %s -> %s", plugin_name, callable_path)
+    logger.info("Discovered %d plugins via manifest index", len(plugin_map))
+    return plugin_map
 
-        except json.JSONDecodeError:
-            logger.warning("Invalid JSON in %s", package_json_path)
-        except Exception as error:  # pylint: disable=broad-exception-caught
-            logger.debug("Error scanning %s: %s", package_json_path, error)
 
-    logger.info("Discovered %d plugins via scanning", len(plugin_map))
-    return plugin_map
+def load_plugin_capabilities() -> dict:
+    """Load declared capabilities (e.g. "pure") per plugin from the manifest index."""
+    plugins_base = Path(__file__).parent / "plugins"
+    if not plugins_base.exists():
+        return {}
+    index = load_manifest_index(plugins_base)
+    return {
+        plugin_name: entry["capabilities"]
+        for plugin_name, entry in index["plugins"].items()
+        if entry.get("capabilities")
+    }
 
 
 def load_plugin_map() -> dict:
@@ -94,17 +83,81 @@ def load_plugin_map() -> dict:
     return plugin_map
 
 
+class PluginLoadError(ImportError):
+    """Raised when a registered plugin cannot be imported."""
+
+    def __init__(self, node_type: str, path: str, error: Exception):
+        self.node_type = node_type
+        self.path = path
+        super().__init__(f"Failed to load plugin {node_type} ({path}): {error}")
+
+
 class PluginRegistry:
-    """Resolve workflow plugin handlers."""
-    def __init__(self, plugin_map: dict):
+    """Resolve workflow plugin handlers, importing each on first use."""
+    def __init__(self, plugin_map: dict, capabilities: dict | None = None):
+        self._paths = dict(plugin_map)
+        self._capabilities = {
+            node_type: frozenset(values) for node_type, values in (capabilities or {}).items()
+        }
         self._plugins = {}
-        for node_type, path in plugin_map.items():
-            try:
-                self._plugins[node_type] = load_plugin_callable(path)
-                logger.debug("Registered workflow plugin %s -> %s", node_type, path)
-            except Exception as error:  # pylint: disable=broad-exception-caught
-                logger.error("Failed to register plugin %s: %s", node_type, error)
+        self._failures = {}
+        self._lock = threading.Lock()
 
     def get(self, node_type: str):
-        """Return plugin handler for node type."""
-        return self._plugins.get(node_type)
+        """Return plugin handler for node type.
+
+        Returns None for unregistered node types. Raises PluginLoadError if
+        the plugin is registered but its module fails to import.
+        """
+        plugin = self._plugins.get(node_type)
+        if plugin is not None:
+            return plugin
+
+        path = self._paths.get(node_type)
+        if path is None:
+            return None
+
+        with self._lock:
+            plugin = self._plugins.get(node_type)
+            if plugin is not None:
+                return plugin
+            if node_type in self._failures:
+                raise self._failures[node_type]
+            try:
+                plugin = load_plugin_callable(path)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                failure = PluginLoadError(node_type, path, error)
+                self._failures[node_type] = failure
+                raise failure from error
+            self._plugins[node_type] = plugin
+            logger.debug("Loaded workflow plugin %s -> %s", node_type, path)
+        return plugin
+
+    def prewarm(self, node_types) -> dict:
+        """Import plugins for the given node types ahead of use.
+
+        Returns a map of node type -> error message for plugins that failed.
+        """
+        failures = {}
+        for node_type in dict.fromkeys(node_types):
+            try:
+                self.get(node_type)
+            except PluginLoadError as error:
+                logger.error("%s", error)
+                failures[node_type] = str(error)
+        return failures
+
+    def prewarm_workflow(self, workflow: dict) -> dict:
+        """Import exactly the plugins a workflow's nodes reference."""
+        return self.prewarm(node.get("type") for node in workflow.get("nodes", []) if node.get("type"))
+
+    def has_capability(self, node_type: str, capability: str) -> bool:
+        """Return True if the plugin's manifest declares the capability."""
+        return capability in self._capabilities.get(node_type, ())
+
+    def node_types(self) -> list:
+        """Return all registered node types."""
+        return list(self._paths)
+
+    def __contains__(self, node_type: str) -> bool:
+        return node_type in self._paths
@@ -0,0 +1,134 @@
+"""Memoize results of pure workflow plugins."""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+PURE_CAPABILITY = "pure"
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+_MISSING = object()
+
+
+def _stable_dumps(value: Any) -> str:
+    """Serialize value canonically; raises TypeError for non-JSON values."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _canonical(value: Any) -> Any:
+    """Return a JSON value that tells apart what plain JSON conflates.
+
+    Dicts become sorted [key, value] pairs, so the keys 1 and "1" differ,
+    and tuples are tagged apart from lists. Raises TypeError for values of
+    other types.
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, list):
+        return [_canonical(item) for item in value]
+    if isinstance(value, tuple):
+        return {"tuple": [_canonical(item) for item in value]}
+    if isinstance(value, dict):
+        pairs = [(_stable_dumps(_canonical(key)), _canonical(item)) for key, item in value.items()]
+        pairs.sort(key=lambda pair: pair[0])
+        return {"dict": [[key, item] for key, item in pairs]}
+    raise TypeError(f"Object of type {type(value).__name__} is not cacheable")
+
+
+class ResultCache:
+    """In-process LRU of plugin results bounded by an estimated byte budget.
+
+    Entries are keyed by node type plus a SHA-256 of a canonical JSON form
+    of the resolved inputs that keeps dict key types and tuples apart from
+    lists. Inputs or results that are not JSON-serializable
+    are never cached. Hits return a deep copy so callers cannot mutate the
+    cached value.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: OrderedDict[Tuple[str, str], Tuple[Any, int]] = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, node_type: str, inputs: Dict[str, Any]) -> Tuple[bool, Any]:
+        """Return (hit, result) for a node type and its resolved inputs."""
+        key = self._key(node_type, inputs)
+        if key is None:
+            with self._lock:
+                self._count(node_type, "uncacheable")
+            return False, None
+
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._count(node_type, "misses")
+                return False, None
+            self._entries.move_to_end(key)
+            self._count(node_type, "hits")
+        return True, copy.deepcopy(entry[0])
+
+    def put(self, node_type: str, inputs: Dict[str, Any], result: Any) -> bool:
+        """Store a result; returns False if it cannot be cached."""
+        key = self._key(node_type, inputs)
+        if key is None:
+            return False
+        try:
+            size = len(_stable_dumps(result).encode("utf-8")) + len(key[1])
+        except (TypeError, ValueError):
+            return False
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (copy.deepcopy(result), size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                (evicted_type, _), (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self._count(evicted_type, "evictions")
+        return True
+
+    def clear(self) -> None:
+        """Drop all cached results (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return hit/miss/eviction counters per node type."""
+        with self._lock:
+            return {node_type: dict(counts) for node_type, counts in self._stats.items()}
+
+    def _key(self, node_type: str, inputs: Dict[str, Any]) -> Tuple[str, str] | None:
+        try:
+            payload = _stable_dumps(_canonical(inputs))
+        except (TypeError, ValueError, RecursionError):
+            return None
+        return node_type, hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _count(self, node_type: str, counter: str) -> None:
+        """Increment a per-node-type counter; caller holds the lock."""
+        counts = self._stats.setdefault(
+            node_type, {"hits": 0, "misses": 0, "evictions": 0, "uncacheable": 0}
+        )
+        counts[counter] += 1
+
+
+_result_cache = ResultCache()
+
+
+def get_result_cache() -> ResultCache:
+    """Get the process-wide result cache."""
+    return _result_cache
@@ -0,0 +1,293 @@
+"""Tests for checkpointing and resuming workflow runs."""
+
+import json
+import logging
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from . import checkpoint
+from .checkpoint import Checkpoint, CheckpointStore, ExecutionCheckpointer
+from .n8n_executor import N8NExecutor
+from .runtime import WorkflowRuntime
+
+
+class Client:
+    """Value that cannot be written to a checkpoint."""
+
+
+class Registry:
+    """Plugin registry recording which node types ran."""
+
+    def __init__(self, plugins):
+        self.plugins = plugins
+        self.calls = []
+
+    def get(self, node_type):
+        plugin = self.plugins.get(node_type)
+
+        def run(runtime, inputs):
+            self.calls.append(node_type)
+            return plugin(runtime, inputs)
+        return run if plugin else None
+
+
+class RecordingStore(CheckpointStore):
+    """Checkpoint store keeping every journal record it appends."""
+
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.records = []
+
+    def append(self, run_id, payload):
+        self.records.append(json.loads(payload))
+        super().append(run_id, payload)
+
+
+def _workflow(*names, connections=None):
+    nodes = [{"id": name.lower(), "name": name, "type": name.lower()} for name in names]
+    if connections is None:
+        connections = {source: [target] for source, target in zip(names, names[1:])}
+    return {
+        "nodes": nodes,
+        "connections": {
+            source: {"main": {"0": [{"node": target} for target in targets]}}
+            for source, targets in connections.items()
+        },
+    }
+
+
+def _runtime():
+    return WorkflowRuntime({}, {}, None, logging.getLogger(__name__))
+
+
+class TestCheckpointStore(unittest.TestCase):
+    """Test cases for full checkpoints and their journal."""
+
+    def setUp(self):
+        """Set up a checkpoint directory."""
+        self.directory = tempfile.mkdtemp(prefix="checkpoint-test-")
+        self.store = CheckpointStore(self.directory)
+        self.store.save(Checkpoint(run_id="run", workflow_hash="h", store={"a": 1}, generation=2))
+
+    def tearDown(self):
+        """Remove the checkpoint directory."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def append(self, **record):
+        self.store.append("run", json.dumps({"generation": 2, **record}))
+
+    def test_journal_applied(self):
+        """Test that journal records are folded into the loaded checkpoint."""
+        self.append(node="x", store={"b": 2})
+        self.append(node="y", removed=["store.a"])
+        checkpoint = self.store.load("run")
+        self.assertEqual(checkpoint.store, {"b": 2})
+        self.assertEqual(checkpoint.completed, ["x", "y"])
+
+    def test_torn_tail_ignored(self):
+        """Test that a record cut off by a crash is dropped."""
+        self.append(node="x", store={"b": 2})
+        with open(self.store.journal_path("run"), "a", encoding="utf-8") as f:
+            f.write('{"generation": 2, "node": "y", "sto')
+        checkpoint = self.store.load("run")
+        self.assertEqual(checkpoint.completed, ["x"])
+        self.assertEqual(checkpoint.store, {"a": 1, "b": 2})
+
+    def test_other_generation_ignored(self):
+        """Test that records written before the last full checkpoint are skipped."""
+        self.store.append("run", json.dumps({"generation": 1, "node": "old", "store": {"a": 0}}))
+        self.append(node="x", iteration=3)
+        checkpoint = self.store.load("run")
+        self.assertEqual(checkpoint.store, {"a": 1})
+        self.assertEqual(checkpoint.completed, [])
+        self.assertEqual(checkpoint.loop_counters, {"x": 3})
+
+    def test_omitted_value_not_restored_stale(self):
+        """Test that an omitted replacement drops the value it replaced."""
+        self.append(node="x", omitted={"store.a": "Client"}, replay=["x"])
+        checkpoint = self.store.load("run")
+        self.assertEqual(checkpoint.store, {})
+        self.assertEqual(checkpoint.omitted, {"store.a": "Client"})
+        self.assertEqual(checkpoint.replay, ["x"])
+
+
+class TestExecutionCheckpointer(unittest.TestCase):
+    """Test cases for journaling node completions."""
+
+    def setUp(self):
+        """Set up a checkpointer over an empty runtime."""
+        self.directory = tempfile.mkdtemp(prefix="checkpointer-test-")
+        self.store = CheckpointStore(self.directory)
+        self.runtime = _runtime()
+        self.runtime.context["preset"] = object()
+
+    def tearDown(self):
+        """Remove the checkpoint directory."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def checkpointer(self, **kwargs):
+        checkpointer = ExecutionCheckpointer(
+            self.store, self.runtime, Checkpoint(run_id="run", workflow_hash="h"), **kwargs
+        )
+        checkpointer.start()
+        return checkpointer
+
+    def records(self):
+        with open(self.store.journal_path("run"), "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_record_holds_changed_keys_only(self):
+        """Test that each record carries only what its node changed."""
+        checkpointer = self.checkpointer()
+        self.runtime.store.update({"big": list(range(1000)), "n": 1})
+        checkpointer.node_completed("a")
+        self.runtime.store["n"] = 2
+        checkpointer.node_completed("b")
+        first, second = self.records()
+        self.assertEqual(set(first["store"]), {"big", "n"})
+        self.assertEqual(second["store"], {"n": 2})
+        self.assertNotIn("context", second)
+
+    def test_in_place_change_recorded(self):
+        """Test that appending to a stored list is journaled."""
+        checkpointer = self.checkpointer()
+        self.runtime.store["messages"] = [1]
+        checkpointer.node_completed("a")
+        self.runtime.store["messages"].append(2)
+        checkpointer.node_completed("b")
+        self.assertEqual(self.records()[1]["store"], {"messages": [1, 2]})
+        self.assertEqual(self.store.load("run").store["messages"], [1, 2])
+
+    def test_only_written_containers_reencoded(self):
+        """Test that with written keys given, other containers are compared by identity only."""
+        checkpointer = self.checkpointer()
+        self.runtime.store.update({"messages": [1], "history": [1]})
+        checkpointer.node_completed("a", ["messages", "history"])
+        self.runtime.store["messages"].append(2)
+        self.runtime.store["history"].append(2)
+        with mock.patch.object(checkpoint, "_try_encode", wraps=checkpoint._try_encode) as encode:
+            checkpointer.node_completed("b", ["messages"])
+        self.assertEqual([call.args[0] for call in encode.call_args_list], [[1, 2]])
+        self.assertEqual(self.records()[1]["store"], {"messages": [1, 2]})
+
+    def test_executor_passes_written_keys(self):
+        """Test that the executor names each node's output keys to the checkpointer."""
+        registry = Registry({"a": lambda runtime, inputs: {"a": 1, "b": [1]}, "b": lambda runtime, inputs: 2})
+        executor = N8NExecutor(self.runtime, registry, checkpoint_store=self.store)
+        with mock.patch.object(ExecutionCheckpointer, "node_completed", autospec=True) as completed:
+            executor.execute(_workflow("A", "B"), "run")
+        self.assertEqual([call.args[1:] for call in completed.call_args_list], [("a", ["a", "b"]), ("b", ["result"])])
+
+    def test_unserializable_value_replays_producer(self):
+        """Test that a node whose output cannot be saved runs again on resume."""
+        checkpointer = self.checkpointer()
+        self.runtime.context["client"] = Client()
+        checkpointer.node_completed("a")
+        checkpoint = self.store.load("run")
+        self.assertEqual(checkpoint.replay, ["a"])
+        self.assertEqual(checkpoint.omitted, {"context.client": "Client"})
+        self.assertNotIn("preset", checkpoint.context)
+
+    def test_journal_compacted(self):
+        """Test that the journal is folded into a full checkpoint periodically."""
+        checkpointer = self.checkpointer(compact_every=2)
+        for index in range(3):
+            self.runtime.store[f"k{index}"] = index
+            checkpointer.node_completed(f"n{index}")
+        self.assertFalse(self.store.journal_path("run").exists())
+        with open(self.store.path_for("run"), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual(data["store"], {"k0": 0, "k1": 1, "k2": 2})
+        self.assertEqual(data["completed"], ["n0", "n1", "n2"])
+
+
+class TestResume(unittest.TestCase):
+    """Test cases for resuming checkpointed runs."""
+
+    def setUp(self):
+        """Set up a checkpoint directory and a failing plugin."""
+        self.directory = tempfile.mkdtemp(prefix="resume-test-")
+        self.fail = True
+
+    def tearDown(self):
+        """Remove the checkpoint directory."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def boom(self, runtime, inputs):
+        if self.fail:
+            raise RuntimeError("boom")
+        return {"done": True}
+
+    def executor(self, registry, parallel=False):
+        return N8NExecutor(
+            _runtime(), registry, parallel=parallel, checkpoint_store=CheckpointStore(self.directory)
+        )
+
+    def test_resume_skips_completed_nodes(self):
+        """Test that resume runs only the nodes that did not finish."""
+        for parallel in (False, True):
+            with self.subTest(parallel=parallel):
+                self.fail = True
+                registry = Registry({
+                    "a": lambda runtime, inputs: {"a": 1},
+                    "b": lambda runtime, inputs: {"b": [1, 2]},
+                    "c": self.boom,
+                })
+                workflow = _workflow("A", "B", "C")
+                with self.assertRaises(RuntimeError):
+                    self.executor(registry, parallel).execute(workflow, "run")
+
+                self.fail = False
+                registry.calls.clear()
+                executor = self.executor(registry, parallel)
+                executor.resume(workflow, "run")
+                self.assertEqual(registry.calls, ["c"])
+                self.assertEqual(executor.runtime.store, {"a": 1, "b": [1, 2], "done": True})
+
+    def test_replayed_node_recreates_client(self):
+        """Test that a node producing an unserializable value runs again."""
+        def setup(runtime, inputs):
+            runtime.context["client"] = Client()
+
+        registry = Registry({"a": setup, "b": self.boom})
+        workflow = _workflow("A", "B")
+        with self.assertRaises(RuntimeError):
+            self.executor(registry).execute(workflow, "run")
+
+        self.fail = False
+        registry.calls.clear()
+        executor = self.executor(registry)
+        executor.resume(workflow, "run")
+        self.assertEqual(registry.calls, ["a", "b"])
+        self.assertIsInstance(executor.runtime.context["client"], Client)
+
+    def test_parallel_branches_attributed_to_their_node(self):
+        """Test that concurrent branches journal only their own outputs."""
+        release = threading.Event()
+
+        def slow(runtime, inputs):
+            release.wait(5)
+            return {"slow": 1}
+
+        def fast(runtime, inputs):
+            release.set()
+            return {"fast": 1}
+
+        registry = Registry({"start": lambda runtime, inputs: {"start": 1}, "slow": slow, "fast": fast})
+        workflow = _workflow("Start", "Slow", "Fast", connections={"Start": ["Slow", "Fast"]})
+        store = RecordingStore(self.directory)
+        N8NExecutor(_runtime(), registry, parallel=True, checkpoint_store=store).execute(workflow, "run")
+
+        self.assertEqual({record["node"]: record["store"] for record in store.records}, {
+            "start": {"start": 1}, "fast": {"fast": 1}, "slow": {"slow": 1},
+        })
+        checkpoint = store.load("run")
+        self.assertEqual(checkpoint.store, {"start": 1, "slow": 1, "fast": 1})
+        self.assertEqual(checkpoint.completed, ["fast", "slow", "start"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Tests for compiled workflow plans."""
+
+import logging
+import unittest
+
+from .compiled_workflow import WorkflowPlanCache, compile_workflow
+from .n8n_executor import N8NExecutor
+from .runtime import WorkflowRuntime
+
+
+def _echo(runtime, inputs):
+    return {"result": inputs.get("value")}
+
+
+class CountingRegistry:
+    """Plugin registry recording which node types were looked up."""
+
+    def __init__(self, plugins):
+        self.plugins = plugins
+        self.lookups = []
+
+    def get(self, node_type):
+        self.lookups.append(node_type)
+        plugin = self.plugins.get(node_type)
+        if isinstance(plugin, Exception):
+            raise plugin
+        return plugin
+
+
+def _workflow(*nodes):
+    names = [node["name"] for node in nodes]
+    return {
+        "nodes": list(nodes),
+        "connections": {
+            source: {"main": {"0": [{"node": target}]}} for source, target in zip(names, names[1:])
+        },
+    }
+
+
+def _node(name, node_type, **extra):
+    return {"id": name, "name": name, "type": node_type, "parameters": {"value": name}, **extra}
+
+
+class TestCompiledWorkflow(unittest.TestCase):
+    """Test cases for lazy plugin resolution."""
+
+    def setUp(self):
+        """Set up a runtime and a registry whose broken plugin fails to load."""
+        self.runtime = WorkflowRuntime({}, {}, None, logging.getLogger(__name__))
+        self.registry = CountingRegistry({"test.echo": _echo, "test.broken": ImportError("missing")})
+
+    def test_compile_does_not_load_plugins(self):
+        """Test that compiling looks up no plugin."""
+        compiled = compile_workflow(_workflow(_node("A", "test.echo"), _node("B", "test.broken")), self.registry)
+        self.assertEqual(self.registry.lookups, [])
+        self.assertFalse(compiled.nodes["A"].resolved)
+
+    def test_disabled_node_plugin_never_loaded(self):
+        """Test that a disabled node with a broken plugin does not fail the run."""
+        workflow = _workflow(_node("A", "test.echo"), _node("B", "test.broken", disabled=True))
+        executor = N8NExecutor(self.runtime, self.registry, plan_cache=WorkflowPlanCache())
+        report = executor.execute(workflow)
+        self.assertEqual(self.registry.lookups, ["test.echo"])
+        self.assertEqual(self.runtime.store["result"], "A")
+        self.assertEqual([record.result.status.value for record in report.records], ["success", "skipped"])
+
+    def test_plugin_resolved_once_per_plan(self):
+        """Test that a cached plan reuses the plugin found on its first run."""
+        workflow = _workflow(_node("A", "test.echo"), _node("B", "test.echo"))
+        executor = N8NExecutor(self.runtime, self.registry, plan_cache=WorkflowPlanCache())
+        executor.execute(workflow)
+        executor.execute(workflow)
+        self.assertEqual(self.registry.lookups, ["test.echo", "test.echo"])
+
+    def test_unknown_node_type_recorded(self):
+        """Test that an unregistered type is reported when the node runs."""
+        executor = N8NExecutor(self.runtime, self.registry, plan_cache=WorkflowPlanCache())
+        report = executor.execute(_workflow(_node("A", "test.missing")))
+        self.assertEqual(report.records[0].result.error_code, "UNKNOWN_NODE_TYPE")
+
+    def test_load_failure_raised_when_node_runs(self):
+        """Test that a broken plugin fails the run at its node."""
+        executor = N8NExecutor(self.runtime, self.registry, plan_cache=WorkflowPlanCache())
+        with self.assertRaises(ImportError):
+            executor.execute(_workflow(_node("A", "test.echo"), _node("B", "test.broken")))
+        self.assertEqual(self.runtime.store["result"], "A")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for workflow execution planning."""
+
+import unittest
+
+from .execution_order import WorkflowCycleError, build_execution_order, build_execution_plan
+
+
+def _nodes(*names):
+    return [{"id": name.lower(), "name": name} for name in names]
+
+
+def _connections(*edges):
+    connections = {}
+    for source, target in edges:
+        connections.setdefault(source, {"main": {"0": []}})["main"]["0"].append({"node": target})
+    return connections
+
+
+class TestExecutionPlan(unittest.TestCase):
+    """Test cases for build_execution_plan."""
+
+    def test_levels_follow_dependencies(self):
+        """Test that each level only depends on earlier levels."""
+        plan = build_execution_plan(
+            _nodes("A", "B", "C", "D"), _connections(("A", "C"), ("B", "C"), ("C", "D"))
+        )
+        self.assertEqual(plan.levels, [["A", "B"], ["C"], ["D"]])
+        self.assertEqual(plan.order, ["A", "B", "C", "D"])
+        self.assertEqual(plan.predecessors["C"], ["A", "B"])
+
+    def test_cycle_raises(self):
+        """Test that a dependency cycle is reported with its path."""
+        with self.assertRaises(WorkflowCycleError) as raised:
+            build_execution_plan(_nodes("A", "B", "C"), _connections(("A", "B"), ("B", "C"), ("C", "B")))
+        self.assertEqual(set(raised.exception.cycle), {"B", "C"})
+
+    def test_self_connection_ignored(self):
+        """Test that a node wired to itself is planned once instead of raising a cycle."""
+        plan = build_execution_plan(_nodes("A", "B"), _connections(("A", "A"), ("A", "B")))
+        self.assertEqual(plan.levels, [["A"], ["B"]])
+        self.assertEqual(plan.successors["A"], ["B"])
+        self.assertEqual(plan.predecessor_counts["A"], 0)
+
+    def test_start_node_levels_match_order(self):
+        """Test that a start node leads both the order and the levels."""
+        plan = build_execution_plan(
+            _nodes("A", "B", "S", "T"),
+            _connections(("A", "B"), ("B", "S"), ("S", "T")),
+            start_node_id="s",
+        )
+        self.assertEqual(plan.levels, [["S"], ["A", "T"], ["B"]])
+        self.assertEqual(plan.order, [name for level in plan.levels for name in level])
+
+    def test_start_node_root_runs_alone(self):
+        """Test that other roots wait for the start node's level."""
+        plan = build_execution_plan(
+            _nodes("A", "S", "T"), _connections(("S", "T")), start_node_id="s"
+        )
+        self.assertEqual(plan.levels, [["S"], ["A", "T"]])
+        self.assertEqual(plan.order, ["S", "A", "T"])
+
+    def test_unknown_start_node_ignored(self):
+        """Test that a start node ID missing from the workflow is ignored."""
+        plan = build_execution_plan(_nodes("A", "B"), _connections(("A", "B")), start_node_id="missing")
+        self.assertEqual(plan.levels, [["A"], ["B"]])
+
+    def test_build_execution_order(self):
+        """Test the order-only helper."""
+        self.assertEqual(
+            build_execution_order(_nodes("A", "B"), _connections(("B", "A")), start_node_id="a"), ["A", "B"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""Tests for the Python plugin executor's module cache and --serve mode."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from . import executor
+from .executor import PluginModuleCache
+
+SLOW_PLUGIN = """
+import time
+with open(__file__ + ".loads", "a") as f:
+    f.write("x")
+time.sleep({delay})
+
+def run(runtime, inputs):
+    return {{"result": "{name}"}}
+"""
+
+
+class TestPluginModuleCache(unittest.TestCase):
+    """Test cases for loading plugin modules concurrently."""
+
+    def setUp(self):
+        """Set up a directory of plugin files."""
+        self.directory = Path(tempfile.mkdtemp(prefix="plugin-cache-test-"))
+        self.cache = PluginModuleCache()
+
+    def tearDown(self):
+        """Remove the plugin files."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def plugin(self, name, delay=0.0):
+        path = self.directory / f"{name}.py"
+        path.write_text(SLOW_PLUGIN.format(name=name, delay=delay))
+        return path
+
+    def loads(self, path):
+        marker = Path(f"{path}.loads")
+        return len(marker.read_text()) if marker.exists() else 0
+
+    def test_cached_module_reused(self):
+        """Test that an unchanged plugin is executed once."""
+        path = self.plugin("fast")
+        first = self.cache.load(path)
+        self.assertIs(self.cache.load(path), first)
+        self.assertEqual(self.loads(path), 1)
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1, "reloads": 0, "size": 1})
+
+    def test_concurrent_first_loads_execute_once(self):
+        """Test that threads racing on one plugin share a single import."""
+        path = self.plugin("slow", delay=0.2)
+        modules = []
+        threads = [threading.Thread(target=lambda: modules.append(self.cache.load(path))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.loads(path), 1)
+        self.assertEqual(len({id(module) for module in modules}), 1)
+
+    def test_slow_import_does_not_block_other_plugins(self):
+        """Test that one plugin's import runs outside the cache-wide lock."""
+        slow = self.plugin("slow", delay=1.0)
+        fast = self.plugin("fast")
+        thread = threading.Thread(target=self.cache.load, args=(slow,))
+        thread.start()
+        try:
+            while not self.loads(slow):
+                time.sleep(0.01)
+            started = time.perf_counter()
+            self.assertEqual(self.cache.load(fast).run(None, {}), {"result": "fast"})
+            self.assertLess(time.perf_counter() - started, 0.5)
+        finally:
+            thread.join()
+
+    def test_reload_executes_again(self):
+        """Test that reload re-executes a cached plugin."""
+        path = self.plugin("fast")
+        first = self.cache.load(path)
+        self.assertIsNot(self.cache.load(path, reload=True), first)
+        self.assertEqual(self.loads(path), 2)
+        self.assertEqual(self.cache.stats()["reloads"], 1)
+
+
+SERVED_PLUGIN = """
+import time
+
+def run(runtime, inputs):
+    print("plugin chatter")
+    time.sleep(inputs.get("delay", 0))
+    return {"echo": inputs.get("value"), "store": runtime.store}
+"""
+
+
+class TestPluginServer(unittest.TestCase):
+    """Test cases for the JSON-lines protocol of --serve."""
+
+    def setUp(self):
+        """Set up a plugin file."""
+        self.directory = Path(tempfile.mkdtemp(prefix="plugin-server-test-"))
+        self.plugin = self.directory / "echo.py"
+        self.plugin.write_text(SERVED_PLUGIN)
+
+    def tearDown(self):
+        """Remove the plugin file."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def serve(self, *requests):
+        lines = [request if isinstance(request, str) else json.dumps(request) for request in requests]
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        process = subprocess.run(
+            [sys.executable, "-m", executor.__name__, "--serve", "--workers", "2"],
+            input="\n".join(lines) + "\n", capture_output=True, text=True, env=env, timeout=30,
+        )
+        self.assertEqual(process.returncode, 0, process.stderr)
+        return [json.loads(line) for line in process.stdout.splitlines()], process.stderr
+
+    def request(self, request_id, **inputs):
+        return {"id": request_id, "plugin_path": str(self.plugin), "inputs": inputs, "context": {"store": {"n": 1}}}
+
+    def test_responses_out_of_order(self):
+        """Test that a fast request is answered before an earlier slow one."""
+        responses, _ = self.serve(self.request("slow", value=1, delay=0.5), self.request("fast", value=2))
+        self.assertEqual([response["id"] for response in responses], ["fast", "slow"])
+        self.assertEqual(responses[1]["result"], {"echo": 1, "store": {"n": 1}})
+
+    def test_plugin_output_goes_to_stderr(self):
+        """Test that plugin prints do not corrupt the response stream."""
+        responses, stderr = self.serve(self.request("1", value="x"))
+        self.assertEqual(responses, [{"id": "1", "result": {"echo": "x", "store": {"n": 1}}}])
+        self.assertIn("plugin chatter", stderr)
+
+    def test_bad_request_lines(self):
+        """Test that malformed lines get an error response and serving continues."""
+        responses, _ = self.serve("{not json", "[1, 2]", {"id": "no-path"}, "", self.request("ok", value=3))
+        by_id = {response["id"]: response for response in responses if response["id"] is not None}
+        errors = [response["error"] for response in responses if response["id"] is None]
+        self.assertEqual(len(responses), 4)
+        self.assertTrue(errors[0].startswith("Invalid JSON input"))
+        self.assertEqual(errors[1], "Request must be a JSON object")
+        self.assertEqual(by_id["no-path"]["error"], "plugin_path is required")
+        self.assertEqual(by_id["ok"]["result"]["echo"], 3)
+
+    def test_eof_waits_for_pending_requests(self):
+        """Test that EOF shuts the server down after answering requests already read."""
+        started = time.perf_counter()
+        responses, _ = self.serve(self.request("a", value=1, delay=0.3), self.request("b", value=2, delay=0.3))
+        self.assertEqual(sorted(response["id"] for response in responses), ["a", "b"])
+        self.assertGreaterEqual(time.perf_counter() - started, 0.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Tests for workflow input binding resolution."""
+
+import types
+import unittest
+from unittest import mock
+
+from . import input_resolver
+from .input_resolver import InputResolver, compile_binding
+
+
+class TestCompileBinding(unittest.TestCase):
+    """Test cases for compiled binding getters."""
+
+    def test_literals_resolve_to_same_object(self):
+        """Test that containers without bindings are not copied."""
+        value = {"a": [1, 2], "b": {"c": "text"}}
+        self.assertIs(compile_binding(value)({}), value)
+
+    def test_nested_bindings(self):
+        """Test that bindings inside dicts and lists are resolved."""
+        store = {"user": {"name": "ada", "tags": ["x", "y"]}, "count": 2}
+        getter = compile_binding({"name": "$user.name", "items": ["$user.tags[1]", "$count", 3]})
+        self.assertEqual(getter(store), {"name": "ada", "items": ["y", 2, 3]})
+
+    def test_missing_path_is_none(self):
+        """Test that a path into a missing value resolves to None."""
+        self.assertIsNone(compile_binding("$user.address.city")({"user": {}}))
+
+    def test_public_attributes(self):
+        """Test that paths read public attributes of plain objects."""
+        record = types.SimpleNamespace(name="ada", _secret="hidden")
+        self.assertEqual(compile_binding("$record.name")({"record": record}), "ada")
+
+    def test_private_attributes_rejected(self):
+        """Test that underscore-prefixed attribute steps resolve to None."""
+        record = types.SimpleNamespace(_secret="hidden")
+        store = {"record": record, "text": "abc"}
+        self.assertIsNone(compile_binding("$record._secret")(store))
+        self.assertIsNone(compile_binding("$text.__class__")(store))
+        self.assertIsNone(compile_binding("$text.__class__.__mro__")(store))
+
+    def test_underscore_dict_keys_allowed(self):
+        """Test that dict keys starting with an underscore still resolve."""
+        self.assertEqual(compile_binding("$doc._id")({"doc": {"_id": 7}}), 7)
+
+    def test_dotted_key_fallback(self):
+        """Test that keys containing dots resolve when the root is absent."""
+        self.assertEqual(compile_binding("$a.b")({"a.b": 1}), 1)
+
+
+class TestInputResolver(unittest.TestCase):
+    """Test cases for InputResolver."""
+
+    def setUp(self):
+        """Set up a resolver over a small store."""
+        self.store = {"value": 1, "user": {"name": "ada"}}
+        self.resolver = InputResolver(self.store)
+
+    def test_resolve_inputs(self):
+        """Test resolving a node's inputs against the current store."""
+        inputs = {"a": "$value", "b": "literal", "c": {"n": "$user.name"}}
+        self.assertEqual(self.resolver.resolve_inputs(inputs), {"a": 1, "b": "literal", "c": {"n": "ada"}})
+        self.store["value"] = 2
+        self.assertEqual(self.resolver.resolve_inputs(inputs)["a"], 2)
+
+    def test_resolve_inputs_returns_copy(self):
+        """Test that resolved inputs can be changed without touching the node."""
+        inputs = {"a": "literal"}
+        resolved = self.resolver.resolve_inputs(inputs)
+        resolved["a"] = "changed"
+        self.assertEqual(inputs, {"a": "literal"})
+        self.assertEqual(self.resolver.resolve_inputs(None), {})
+
+    def test_inputs_compiled_once(self):
+        """Test that repeated resolution of one input reuses its getter."""
+        inputs = {"a": "$value", "b": ["$user.name"]}
+        with mock.patch.object(input_resolver, "compile_binding", wraps=compile_binding) as compile_spy:
+            self.resolver.resolve_inputs(inputs)
+            self.resolver.resolve_binding(inputs["b"])
+            first_calls = compile_spy.call_count
+            for _ in range(3):
+                self.assertEqual(self.resolver.resolve_inputs(inputs), {"a": 1, "b": ["ada"]})
+                self.assertEqual(self.resolver.resolve_binding(inputs["b"]), ["ada"])
+        self.assertEqual(compile_spy.call_count, first_calls)
+
+    def test_equal_inputs_compiled_separately(self):
+        """Test that distinct input objects do not share a getter."""
+        self.assertEqual(self.resolver.resolve_binding(["$value"]), [1])
+        self.assertEqual(self.resolver.resolve_binding(["$user.name"]), ["ada"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+"""Tests for item batch runs of N8NExecutor."""
+
+import logging
+import unittest
+
+from .n8n_executor import N8NExecutor
+from .plugins.base import NodeExecutor
+from .plugin_registry import PluginRegistry, load_plugin_capabilities, load_plugin_map
+from .result_cache import ResultCache
+from .runtime import WorkflowRuntime
+
+
+def _node(name, node_type, parameters=None):
+    return {"id": name.lower(), "name": name, "type": node_type, "parameters": parameters or {}}
+
+
+def _chain(*names):
+    return {
+        source: {"main": {"0": [{"node": target}]}}
+        for source, target in zip(names, names[1:])
+    }
+
+
+class TestN8NExecutorItems(unittest.TestCase):
+    """Test cases for running a workflow over a list of items."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the plugin registry once."""
+        cls.registry = PluginRegistry(load_plugin_map(), load_plugin_capabilities())
+
+    def setUp(self):
+        """Set up a fresh runtime and executor."""
+        self.runtime = WorkflowRuntime({}, {}, None, logging.getLogger(__name__))
+        self.executor = N8NExecutor(self.runtime, self.registry)
+
+    def run_items(self, nodes, connections, items):
+        workflow = {"nodes": nodes, "connections": connections, "settings": {"memoize": False}}
+        report = self.executor.execute(workflow, items=items)
+        return report, self.executor.last_items
+
+    def test_bindings_resolve_per_item(self):
+        """Test that each item's binding sees its own upstream result."""
+        nodes = [
+            _node("Add", "math.add"),
+            _node("Multiply", "math.multiply", {"numbers": ["$result", 10]}),
+        ]
+        _, outputs = self.run_items(
+            nodes, _chain("Add", "Multiply"), [{"numbers": [1, 1]}, {"numbers": [2, 2]}]
+        )
+        self.assertEqual([output["result"] for output in outputs], [20, 40])
+
+    def test_bindings_resolve_through_three_nodes(self):
+        """Test that per-item values flow through a longer chain."""
+        nodes = [
+            _node("Add", "math.add"),
+            _node("Double", "math.multiply", {"numbers": ["$result", 2]}),
+            _node("Label", "string.format", {"template": "{n}", "variables": {"n": "$result"}}),
+        ]
+        _, outputs = self.run_items(
+            nodes, _chain("Add", "Double", "Label"), [{"numbers": [1, 2]}, {"numbers": [5]}]
+        )
+        self.assertEqual([output["result"] for output in outputs], ["6.0", "10.0"])
+
+    def test_bindings_fall_back_to_store(self):
+        """Test that keys missing from the item resolve from the store."""
+        self.runtime.store["factor"] = 3
+        nodes = [
+            _node("Add", "math.add"),
+            _node("Scale", "math.multiply", {"numbers": ["$result", "$factor"]}),
+        ]
+        _, outputs = self.run_items(nodes, _chain("Add", "Scale"), [{"numbers": [1]}, {"numbers": [2]}])
+        self.assertEqual([output["result"] for output in outputs], [3, 6])
+
+    def test_item_keys_override_parameters(self):
+        """Test that item fields win over node parameters."""
+        nodes = [_node("Upper", "string.upper", {"value": "fixed"})]
+        _, outputs = self.run_items(nodes, {}, [{"value": "a"}, {}])
+        self.assertEqual([output["result"] for output in outputs], ["A", "FIXED"])
+
+    def test_one_report_entry_per_node(self):
+        """Test that a node call over many items is reported once."""
+        nodes = [_node("Add", "math.add"), _node("Multiply", "math.multiply", {"numbers": ["$result", 2]})]
+        report, outputs = self.run_items(nodes, _chain("Add", "Multiply"), [{"numbers": [i]} for i in range(5)])
+        self.assertEqual(len(outputs), 5)
+        self.assertEqual([record.node_name for record in report.records], ["Add", "Multiply"])
+        self.assertEqual([record.items for record in report.records], [5, 5])
+
+    def test_disabled_node_passes_items_through(self):
+        """Test that a disabled node forwards its items unchanged."""
+        nodes = [
+            _node("Add", "math.add"),
+            {**_node("Skip", "math.multiply", {"numbers": ["$result", 100]}), "disabled": True},
+        ]
+        _, outputs = self.run_items(nodes, _chain("Add", "Skip"), [{"numbers": [1]}, {"numbers": [2]}])
+        self.assertEqual([output["result"] for output in outputs], [1.0, 2.0])
+
+
+class Doubler(NodeExecutor):
+    """Class plugin relying on the inherited execute_batch."""
+
+    node_type = "test.double"
+
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, inputs, runtime=None):
+        self.calls.append(inputs["value"])
+        return {"result": inputs["value"] * 2}
+
+
+class BatchDoubler(Doubler):
+    """Class plugin with its own execute_batch."""
+
+    node_type = "test.batch_double"
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def execute_batch(self, items, runtime=None):
+        self.batches.append(len(items))
+        return [{"result": item["value"] * 2} for item in items]
+
+
+class ClassRegistry:
+    """Registry of class plugins loaded as bound run methods, all declared pure."""
+
+    def __init__(self, *plugins):
+        self.plugins = {plugin.node_type: plugin for plugin in plugins}
+
+    def get(self, node_type):
+        plugin = self.plugins.get(node_type)
+        return plugin.run if plugin else None
+
+    def has_capability(self, node_type, capability):
+        return True
+
+
+class TestBatchSelection(unittest.TestCase):
+    """Test cases for choosing between execute_batch and per-item calls."""
+
+    def run_items(self, plugin, items):
+        runtime = WorkflowRuntime({}, {}, None, logging.getLogger(__name__))
+        executor = N8NExecutor(runtime, ClassRegistry(plugin), result_cache=ResultCache())
+        executor.execute({"nodes": [_node("Double", plugin.node_type)], "connections": {}}, items=items)
+        return [output["result"] for output in executor.last_items]
+
+    def test_inherited_batch_runs_per_item_with_memoization(self):
+        """Test that a plugin without its own execute_batch is memoized item by item."""
+        plugin = Doubler()
+        outputs = self.run_items(plugin, [{"value": 1}, {"value": 2}, {"value": 1}])
+        self.assertEqual(outputs, [2, 4, 2])
+        self.assertEqual(plugin.calls, [1, 2])
+
+    def test_overridden_batch_gets_all_items(self):
+        """Test that a plugin overriding execute_batch receives the items in one call."""
+        plugin = BatchDoubler()
+        outputs = self.run_items(plugin, [{"value": 1}, {"value": 2}, {"value": 1}])
+        self.assertEqual(outputs, [2, 4, 2])
+        self.assertEqual(plugin.batches, [3])
+        self.assertEqual(plugin.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+"""Tests for control.loop nodes in N8NExecutor."""
+
+import logging
+import shutil
+import tempfile
+import types
+import unittest
+
+from . import n8n_executor
+from .checkpoint import CheckpointStore
+from .n8n_executor import N8NExecutor
+from .runtime import WorkflowRuntime
+
+
+class Registry:
+    """Plugin registry recording which node types ran."""
+
+    def __init__(self, plugins):
+        self.plugins = plugins
+        self.calls = []
+
+    def get(self, node_type):
+        plugin = self.plugins.get(node_type)
+
+        def run(runtime, inputs):
+            self.calls.append(node_type)
+            return plugin(runtime, inputs)
+        return run if plugin else None
+
+
+def _count(runtime, inputs):
+    count = runtime.store.get("count", 0) + 1
+    return {"count": count, "done": count >= inputs.get("limit", 3)}
+
+
+def _node(name, node_type, **parameters):
+    return {"id": name.lower(), "name": name, "type": node_type, "parameters": parameters}
+
+
+def _loop(name="Loop", **parameters):
+    return _node(name, "control.loop", **parameters)
+
+
+class TestLoopExecution(unittest.TestCase):
+    """Test cases for loop bodies, limits and stop conditions."""
+
+    def setUp(self):
+        """Set up a registry with a counting body node."""
+        self.registry = Registry({"count": _count, "after": lambda runtime, inputs: {"after": True}})
+        self.runtime = WorkflowRuntime({}, {}, None, logging.getLogger(__name__))
+
+    def run_workflow(self, nodes, connections=None):
+        workflow = {"nodes": nodes, "connections": connections or {}, "settings": {"memoize": False}}
+        executor = N8NExecutor(self.runtime, self.registry)
+        executor.execute(workflow)
+        return executor
+
+    def test_body_from_parameters(self):
+        """Test that parameters.body lists the nodes run on every iteration."""
+        executor = self.run_workflow([_loop(max_iterations=4, body=["step"]), _node("Step", "count", limit=10)])
+        self.assertEqual(self.registry.calls, ["count"] * 4)
+        self.assertEqual(self.runtime.store["count"], 4)
+        self.assertEqual(executor.last_loop_stats["Loop"].iterations, 4)
+
+    def test_body_from_loop_output(self):
+        """Test that nodes reached from output 1 form the body and output 0 runs after the loop."""
+        nodes = [_loop(max_iterations=2), _node("Step", "count", limit=10), _node("After", "after")]
+        connections = {
+            "Loop": {"main": {"0": [{"node": "After"}], "1": [{"node": "Step"}]}},
+            "Step": {"main": {"0": [{"node": "Loop"}]}},
+        }
+        self.run_workflow(nodes, connections)
+        self.assertEqual(self.registry.calls, ["count", "count", "after"])
+
+    def test_max_iterations_binding(self):
+        """Test that max_iterations resolves bindings and falls back to 1 when invalid."""
+        self.runtime.store["rounds"] = "3"
+        self.run_workflow([_loop(max_iterations="$rounds", body=["Step"]), _node("Step", "count", limit=10)])
+        self.assertEqual(self.runtime.store["count"], 3)
+
+        self.runtime.store.clear()
+        self.run_workflow([_loop(max_iterations="many", body=["Step"]), _node("Step", "count", limit=10)])
+        self.assertEqual(self.runtime.store["count"], 1)
+
+    def test_stop_when(self):
+        """Test that the loop stops once stop_when matches stop_on."""
+        executor = self.run_workflow([
+            _loop(max_iterations=10, body=["Step"], stop_when="$done"), _node("Step", "count", limit=3),
+        ])
+        self.assertEqual(self.runtime.store["count"], 3)
+        self.assertEqual(executor.last_loop_stats["Loop"].stopped_early, 1)
+
+    def test_stop_on_false(self):
+        """Test that stop_on=False stops when the condition becomes false."""
+        self.runtime.store["count"] = 0
+        nodes = [
+            _loop(max_iterations=10, body=["Step"], stop_when="$running", stop_on="false"),
+            _node("Step", "running"),
+        ]
+        self.registry.plugins["running"] = lambda runtime, inputs: {
+            "count": runtime.store["count"] + 1, "running": runtime.store["count"] + 1 < 2,
+        }
+        self.run_workflow(nodes)
+        self.assertEqual(self.runtime.store["count"], 2)
+
+    def test_once(self):
+        """Test that args.once limits the loop to one iteration."""
+        self.runtime.context["args"] = types.SimpleNamespace(once=True)
+        self.run_workflow([_loop(max_iterations=5, body=["Step"]), _node("Step", "count", limit=10)])
+        self.assertEqual(self.registry.calls, ["count"])
+
+    def test_log_reports_this_run(self):
+        """Test that a loop run several times logs its own iteration count each time."""
+        nodes = [
+            _loop("Outer", max_iterations=2, body=["Inner", "Step"]),
+            _loop("Inner", max_iterations=3, body=["Step"]),
+            _node("Step", "count", limit=100),
+        ]
+        with self.assertLogs(n8n_executor.logger, logging.INFO) as logs:
+            executor = self.run_workflow(nodes)
+        inner = [line for line in logs.output if "Loop Inner:" in line]
+        self.assertEqual(len(inner), 2)
+        self.assertTrue(all("Loop Inner: 3 iterations" in line for line in inner))
+        self.assertEqual(executor.last_loop_stats["Inner"].iterations, 6)
+        self.assertEqual(executor.last_loop_stats["Inner"].runs, 2)
+
+
+class TestLoopResume(unittest.TestCase):
+    """Test cases for resuming a loop from a checkpoint."""
+
+    def setUp(self):
+        """Set up a checkpoint directory."""
+        self.directory = tempfile.mkdtemp(prefix="loop-checkpoint-test-")
+        self.fail_at = 3
+
+    def tearDown(self):
+        """Remove the checkpoint directory."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def step(self, runtime, inputs):
+        if runtime.store.get("count", 0) + 1 == self.fail_at:
+            raise RuntimeError("interrupted")
+        return _count(runtime, inputs)
+
+    def executor(self, registry):
+        runtime = WorkflowRuntime({}, {}, None, logging.getLogger(__name__))
+        return N8NExecutor(runtime, registry, checkpoint_store=CheckpointStore(self.directory))
+
+    def test_resume_continues_iterations(self):
+        """Test that a resumed loop continues after the last checkpointed iteration."""
+        registry = Registry({"count": self.step})
+        workflow = {
+            "nodes": [_loop(max_iterations=5, body=["Step"]), _node("Step", "count", limit=10)],
+            "connections": {},
+            "settings": {"memoize": False},
+        }
+        with self.assertRaises(RuntimeError):
+            self.executor(registry).execute(workflow, "run")
+        self.assertEqual(registry.calls, ["count"] * 3)
+
+        self.fail_at = None
+        registry.calls.clear()
+        executor = self.executor(registry)
+        executor.resume(workflow, "run")
+        self.assertEqual(registry.calls, ["count"] * 3)
+        self.assertEqual(executor.runtime.store["count"], 5)
+        self.assertEqual(executor.last_loop_stats["Loop"].iterations, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
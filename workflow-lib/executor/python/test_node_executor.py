@@ -0,0 +1,75 @@
+"""Tests for NodeExecutor execution reports."""
+
+import logging
+import types
+import unittest
+
+from .input_resolver import InputResolver
+from .loop_executor import LoopExecutor
+from .node_executor import NodeExecutor
+from .runtime import WorkflowRuntime
+
+
+def _increment(runtime, inputs):
+    return {"count": runtime.store.get("count", 0) + inputs.get("by", 1)}
+
+
+class TestNodeExecutorReports(unittest.TestCase):
+    """Test cases for per-call execution reports."""
+
+    def setUp(self):
+        """Set up an executor with a single counting plugin."""
+        context = {"args": types.SimpleNamespace(once=False)}
+        self.runtime = WorkflowRuntime(context, {}, None, logging.getLogger(__name__))
+        resolver = InputResolver(self.runtime.store)
+        loop_executor = LoopExecutor(self.runtime, resolver)
+        self.executor = NodeExecutor(self.runtime, {"test.increment": _increment}, resolver, loop_executor)
+        loop_executor.set_node_executor(self.executor)
+
+    def test_each_call_returns_fresh_report(self):
+        """Test that reports of separate calls do not accumulate."""
+        first = self.executor.execute_nodes([{"id": "a", "type": "test.increment"}])
+        second = self.executor.execute_nodes([
+            {"id": "b", "type": "test.increment"},
+            {"id": "c", "type": "test.increment", "inputs": {"by": 2}},
+        ])
+        self.assertIsNot(first, second)
+        self.assertEqual([record.node_id for record in first.records], ["a"])
+        self.assertEqual([record.node_id for record in second.records], ["b", "c"])
+        self.assertIs(self.executor.last_report, second)
+        self.assertIsNotNone(second.wall_time)
+        self.assertEqual(self.runtime.store["count"], 4)
+
+    def test_loop_body_records_into_enclosing_report(self):
+        """Test that loop iterations are part of the calling run's report."""
+        loop = {
+            "id": "loop",
+            "type": "control.loop",
+            "inputs": {"max_iterations": 3},
+            "body": [{"id": "body", "type": "test.increment"}],
+        }
+        report = self.executor.execute_nodes([{"id": "before", "type": "test.increment"}, loop])
+        self.assertEqual(
+            [record.node_id for record in report.records], ["before", "body", "body", "body"]
+        )
+        self.assertIs(self.executor.last_report, report)
+
+    def test_report_finished_when_node_raises(self):
+        """Test that a failing node still finishes and publishes the report."""
+        def fail(runtime, inputs):
+            raise ValueError("boom")
+
+        self.executor.plugin_registry = {"test.fail": fail}
+        with self.assertRaises(ValueError):
+            self.executor.execute_nodes([{"id": "x", "type": "test.fail"}])
+        report = self.executor.last_report
+        self.assertEqual(report.records[0].result.error_code, "INVALID_INPUT")
+        self.assertIsNotNone(report.wall_time)
+
+        # The failed call does not leak into the next one
+        report = self.executor.execute_nodes([])
+        self.assertEqual(report.records, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Tests for the parallel DAG scheduler."""
+
+import threading
+import time
+import unittest
+
+from .execution_order import build_execution_plan
+from .parallel_scheduler import ParallelScheduler
+
+
+def _plan(names, edges, start=None):
+    nodes = [{"id": name.lower(), "name": name} for name in names]
+    connections = {}
+    for source, target in edges:
+        connections.setdefault(source, {"main": {"0": []}})["main"]["0"].append({"node": target})
+    return build_execution_plan(nodes, connections, start), {name: name for name in names}
+
+
+class Recorder:
+    """Node runner logging starts and finishes, with optional delays and failures."""
+
+    def __init__(self, delays=None, fail=()):
+        self.delays = delays or {}
+        self.fail = set(fail)
+        self.events = []
+        self.lock = threading.Lock()
+
+    def __call__(self, name):
+        with self.lock:
+            self.events.append(("start", name))
+        time.sleep(self.delays.get(name, 0.0))
+        if name in self.fail:
+            raise RuntimeError(f"{name} failed")
+        with self.lock:
+            self.events.append(("end", name))
+        return name.lower()
+
+    def started(self):
+        return [name for event, name in self.events if event == "start"]
+
+    def position(self, event, name):
+        return self.events.index((event, name))
+
+
+class TestParallelScheduler(unittest.TestCase):
+    """Test cases for ParallelScheduler.run."""
+
+    def test_independent_nodes_run_concurrently(self):
+        """Test that ready nodes overlap up to max_concurrency."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def run(name):
+            if name != "Join":
+                barrier.wait()
+            return name
+
+        plan, nodes = _plan(["A", "B", "C", "Join"], [("A", "Join"), ("B", "Join"), ("C", "Join")])
+        stats = ParallelScheduler(run, max_concurrency=3).run(plan, nodes)
+        self.assertEqual(stats.nodes_executed, 4)
+        self.assertEqual(stats.max_concurrency, 3)
+
+    def test_successors_wait_for_all_predecessors(self):
+        """Test that a node starts only after every upstream node finished."""
+        recorder = Recorder({"A": 0.05, "B": 0.01})
+        plan, nodes = _plan(["A", "B", "C", "D"], [("A", "C"), ("B", "C"), ("C", "D")])
+        ParallelScheduler(recorder, max_concurrency=4).run(plan, nodes)
+        self.assertGreater(recorder.position("start", "C"), recorder.position("end", "A"))
+        self.assertGreater(recorder.position("start", "C"), recorder.position("end", "B"))
+        self.assertGreater(recorder.position("start", "D"), recorder.position("end", "C"))
+
+    def test_first_failure_cancels_queued_nodes(self):
+        """Test that a failure stops scheduling and nodes not yet started never run."""
+        recorder = Recorder({"Slow": 0.1}, fail={"Bad"})
+        names = ["Bad", "Slow", "Q1", "Q2", "After"]
+        plan, nodes = _plan(names, [("Slow", "After")])
+        with self.assertRaises(RuntimeError):
+            ParallelScheduler(recorder, max_concurrency=2).run(plan, nodes)
+        self.assertEqual(sorted(recorder.started()), ["Bad", "Slow"])
+        # The node already running is allowed to finish
+        self.assertIn(("end", "Slow"), recorder.events)
+
+    def test_start_node_runs_alone_first(self):
+        """Test that the start node finishes before any other node starts."""
+        recorder = Recorder({"S": 0.02})
+        plan, nodes = _plan(["A", "S", "T"], [("S", "T")], start="s")
+        stats = ParallelScheduler(recorder, max_concurrency=4).run(plan, nodes, "S")
+        self.assertEqual(recorder.events[:2], [("start", "S"), ("end", "S")])
+        self.assertEqual(sorted(recorder.started()[1:]), ["A", "T"])
+        self.assertEqual(stats.nodes_executed, 3)
+
+    def test_start_node_with_upstream_runs_once(self):
+        """Test that a start node's upstream nodes run later without rerunning it."""
+        recorder = Recorder()
+        plan, nodes = _plan(["A", "S", "T"], [("A", "S"), ("S", "T")], start="s")
+        ParallelScheduler(recorder, max_concurrency=2).run(plan, nodes, "S")
+        self.assertEqual(recorder.started().count("S"), 1)
+        self.assertEqual(recorder.started()[0], "S")
+        self.assertEqual(sorted(recorder.started()), ["A", "S", "T"])
+
+    def test_on_complete_before_successors(self):
+        """Test that on_complete sees each result on the calling thread before successors start."""
+        recorder = Recorder({"A": 0.02})
+        completed = []
+        caller = threading.get_ident()
+
+        def on_complete(node, result):
+            self.assertEqual(threading.get_ident(), caller)
+            completed.append((node, result, len(recorder.started())))
+
+        plan, nodes = _plan(["A", "B", "C"], [("A", "B"), ("B", "C")])
+        ParallelScheduler(recorder, max_concurrency=2, on_complete=on_complete).run(plan, nodes)
+        self.assertEqual([(node, result) for node, result, _ in completed], [("A", "a"), ("B", "b"), ("C", "c")])
+        # When A and B complete, their successors have not started yet
+        self.assertEqual([started for _, _, started in completed], [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
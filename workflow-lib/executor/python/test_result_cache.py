@@ -0,0 +1,90 @@
+"""Tests for memoizing pure plugin results."""
+
+import threading
+import unittest
+
+from .result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for ResultCache."""
+
+    def setUp(self):
+        """Set up an empty cache."""
+        self.cache = ResultCache()
+
+    def test_hit_after_put(self):
+        """Test that a stored result is returned for equal inputs in any key order."""
+        self.cache.put("math.add", {"a": 1, "b": [2, 3]}, {"result": 6})
+        self.assertEqual(self.cache.get("math.add", {"b": [2, 3], "a": 1}), (True, {"result": 6}))
+        self.assertEqual(self.cache.get("math.sub", {"a": 1, "b": [2, 3]}), (False, None))
+        self.assertEqual(self.cache.stats()["math.add"]["hits"], 1)
+
+    def test_hits_are_deep_copies(self):
+        """Test that neither the stored result nor a hit can change the cached value."""
+        result = {"items": [{"n": 1}]}
+        self.cache.put("t", {}, result)
+        result["items"][0]["n"] = 99
+        _, first = self.cache.get("t", {})
+        first["items"].append("changed")
+        _, second = self.cache.get("t", {})
+        self.assertEqual(second, {"items": [{"n": 1}]})
+        self.assertIsNot(first, second)
+
+    def test_lru_eviction_by_bytes(self):
+        """Test that the least recently used entries go once the byte budget is exceeded."""
+        probe = ResultCache()
+        probe.put("t", {"n": 0}, "x" * 100)
+        entry_bytes = probe.current_bytes
+        cache = ResultCache(max_bytes=entry_bytes * 3)
+        for number in range(3):
+            cache.put("t", {"n": number}, "x" * 100)
+        cache.get("t", {"n": 0})
+        cache.put("t", {"n": 3}, "x" * 100)
+
+        self.assertEqual(cache.current_bytes, entry_bytes * 3)
+        self.assertTrue(cache.get("t", {"n": 0})[0])
+        self.assertFalse(cache.get("t", {"n": 1})[0])
+        self.assertTrue(cache.get("t", {"n": 3})[0])
+        self.assertEqual(cache.stats()["t"]["evictions"], 1)
+
+    def test_oversized_result_not_stored(self):
+        """Test that a result larger than the whole budget is refused."""
+        cache = ResultCache(max_bytes=50)
+        self.assertFalse(cache.put("t", {}, "x" * 100))
+        self.assertEqual(cache.current_bytes, 0)
+
+    def test_uncacheable_inputs_and_results(self):
+        """Test that unserializable inputs or results are never cached."""
+        self.assertFalse(self.cache.put("t", {"lock": threading.Lock()}, 1))
+        self.assertEqual(self.cache.get("t", {"lock": threading.Lock()}), (False, None))
+        self.assertEqual(self.cache.stats()["t"]["uncacheable"], 1)
+        self.assertFalse(self.cache.put("t", {"n": 1}, object()))
+        self.assertFalse(self.cache.get("t", {"n": 1})[0])
+        self.assertFalse(self.cache.put("t", {"set": {1, 2}}, 1))
+
+    def test_key_types_kept_apart(self):
+        """Test that inputs plain JSON would encode identically get separate entries."""
+        pairs = [
+            ({"map": {1: "a"}}, {"map": {"1": "a"}}),
+            ({"point": (1, 2)}, {"point": [1, 2]}),
+            ({"flag": True}, {"flag": 1}),
+            ({"value": {"tuple": [1]}}, {"value": (1,)}),
+        ]
+        for first, second in pairs:
+            with self.subTest(first=first):
+                cache = ResultCache()
+                cache.put("t", first, "first")
+                self.assertEqual(cache.get("t", second), (False, None))
+                cache.put("t", second, "second")
+                self.assertEqual(cache.get("t", first), (True, "first"))
+
+    def test_mixed_key_types(self):
+        """Test that a dict with both int and str keys can be cached."""
+        inputs = {"map": {1: "a", "b": 2}}
+        self.assertTrue(self.cache.put("t", inputs, "ok"))
+        self.assertEqual(self.cache.get("t", {"map": {"b": 2, 1: "a"}}), (True, "ok"))
+
+
+if __name__ == "__main__":
+    unittest.main()
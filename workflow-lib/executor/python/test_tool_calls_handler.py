@@ -0,0 +1,51 @@
+"""Tests for handling tool calls from LLM responses."""
+
+import json
+import types
+import unittest
+from unittest import mock
+
+from .tool_calls_handler import handle_tool_calls
+
+
+def _call(call_id, name, **arguments):
+    function = types.SimpleNamespace(name=name, arguments=json.dumps(arguments))
+    return types.SimpleNamespace(id=call_id, function=function)
+
+
+def _fail():
+    raise RuntimeError("broken")
+
+
+class TestHandleToolCalls(unittest.TestCase):
+    """Test cases for tool result messages."""
+
+    def setUp(self):
+        """Set up tools and arguments that skip confirmation."""
+        self.tools = {"echo": lambda text: text, "fail": _fail}
+        self.args = types.SimpleNamespace(yolo=True, dry_run=False)
+
+    def handle(self, *calls, latencies=None):
+        response = types.SimpleNamespace(tool_calls=list(calls))
+        return handle_tool_calls(response, self.tools, {}, self.args, {}, mock.Mock(), latencies)
+
+    def test_messages_hold_standard_fields_only(self):
+        """Test that tool messages sent back to the API carry no extra keys."""
+        results = self.handle(_call("1", "echo", text="hi"), _call("2", "fail"), _call("3", "missing"))
+        self.assertEqual([message["tool_call_id"] for message in results], ["1", "2", "3"])
+        self.assertEqual(results[0]["content"], "hi")
+        self.assertIn("broken", results[1]["content"])
+        for message in results:
+            self.assertEqual(set(message), {"tool_call_id", "role", "name", "content"})
+
+    def test_latencies_collected(self):
+        """Test that each executed call's latency is reported beside the messages."""
+        latencies = []
+        self.handle(_call("1", "echo", text="hi"), _call("2", "missing"), _call("3", "fail"), latencies=latencies)
+        self.assertEqual([(entry["tool_call_id"], entry["name"]) for entry in latencies], [("1", "echo"), ("3", "fail")])
+        for entry in latencies:
+            self.assertGreaterEqual(entry["latency_ms"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
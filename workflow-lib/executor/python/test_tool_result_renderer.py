@@ -0,0 +1,151 @@
+"""Tests for rendering tool results within budgets."""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from .tool_result_renderer import ResultBudget, render_tool_result
+
+
+class CountingItems:
+    """Endless generator of items recording how many were read."""
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.read = 0
+
+    def __iter__(self):
+        while self.limit is None or self.read < self.limit:
+            self.read += 1
+            yield f"item {self.read}"
+
+
+class TestRenderItems(unittest.TestCase):
+    """Test cases for iterable results."""
+
+    def test_generator_not_drained(self):
+        """Test that only the shown items and a bounded look-ahead are read from a generator."""
+        items = CountingItems()
+        budget = ResultBudget(max_items=3, spill_bytes=100, artifact_dir=None)
+        rendered = render_tool_result(iter(items), "list_files", "call-1", budget)
+        self.assertLess(items.read, 20)
+        self.assertEqual(rendered.content.splitlines()[:3], ["- item 1", "- item 2", "- item 3"])
+        self.assertEqual(
+            rendered.content.splitlines()[-1], f"[truncated: showing 3 of more than {items.read} items]"
+        )
+        self.assertIsNone(rendered.total_items)
+
+    def test_fits(self):
+        """Test that a result within budget has no marker."""
+        rendered = render_tool_result(["a", "b"], "list_files", "call-1", ResultBudget())
+        self.assertEqual(rendered.content, "- a\n- b")
+        self.assertFalse(rendered.truncated)
+        self.assertEqual(rendered.total_items, 2)
+
+    def test_small_overflow_counted(self):
+        """Test that a short overflow is counted exactly and not spilled."""
+        rendered = render_tool_result(range(7), "list_files", "call-1", ResultBudget(max_items=5))
+        self.assertEqual(rendered.content.splitlines()[-1], "[truncated: showing 5 of 7 items]")
+        self.assertEqual((rendered.items_shown, rendered.total_items), (5, 7))
+        self.assertIsNone(rendered.artifact)
+
+    def test_byte_budget(self):
+        """Test that items stop at the byte budget and a single oversized item is clipped."""
+        rendered = render_tool_result(["aaaa", "bbbb"], "t", "c", ResultBudget(max_bytes=8, artifact_dir=None))
+        self.assertEqual(rendered.content, "- aaaa\n[truncated: showing 1 of 2 items]")
+
+        rendered = render_tool_result(["x" * 50], "t", "c", ResultBudget(max_bytes=10, artifact_dir=None))
+        self.assertEqual(
+            rendered.content, "- xxxxxxxx\n[truncated: showing 1 of 1 items, item 1 cut at 10 bytes]"
+        )
+
+    def test_none(self):
+        """Test that a result of None renders as Success."""
+        self.assertEqual(render_tool_result(None, "t", "c", ResultBudget()).content, "Success")
+
+
+class TestRenderText(unittest.TestCase):
+    """Test cases for text results."""
+
+    def test_clipped_with_marker(self):
+        """Test that long text is clipped to the byte budget and marked."""
+        rendered = render_tool_result("x" * 100, "t", "c", ResultBudget(max_bytes=10, artifact_dir=None))
+        self.assertEqual(rendered.content, "x" * 10 + "\n[truncated: showing 10 of 100 bytes]")
+        self.assertTrue(rendered.truncated)
+
+    def test_multibyte_characters_kept_whole(self):
+        """Test that clipping never splits a UTF-8 character."""
+        rendered = render_tool_result("é" * 10, "t", "c", ResultBudget(max_bytes=5, artifact_dir=None))
+        self.assertEqual(rendered.content, "éé\n[truncated: showing 4 of 20 bytes]")
+
+
+class TestSpill(unittest.TestCase):
+    """Test cases for writing large results to artifacts."""
+
+    def setUp(self):
+        """Set up an artifact directory."""
+        self.directory = tempfile.mkdtemp(prefix="tool-artifacts-test-")
+
+    def tearDown(self):
+        """Remove the artifact directory."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def budget(self, **limits):
+        return ResultBudget(artifact_dir=self.directory, **limits)
+
+    def test_text_spill_threshold(self):
+        """Test that text is spilled only when it overflows by more than spill_bytes."""
+        rendered = render_tool_result("x" * 100, "t", "c", self.budget(max_bytes=10, spill_bytes=90))
+        self.assertIsNone(rendered.artifact)
+        self.assertEqual(list(Path(self.directory).iterdir()), [])
+
+        rendered = render_tool_result("x" * 100, "read_file", "call/1", self.budget(max_bytes=10, spill_bytes=89))
+        self.assertEqual(Path(rendered.artifact), Path(self.directory) / "read_file-call_1.txt")
+        self.assertEqual(Path(rendered.artifact).read_text(encoding="utf-8"), "x" * 100)
+        self.assertTrue(rendered.content.endswith(f"; full result saved to {rendered.artifact}]"))
+
+    def test_items_spilled_in_full(self):
+        """Test that a large item result is written whole and counted exactly."""
+        rendered = render_tool_result(CountingItems(100), "t", "c", self.budget(max_items=3, spill_bytes=10))
+        lines = Path(rendered.artifact).read_text(encoding="utf-8").splitlines()
+        self.assertEqual(lines, [f"- item {n}" for n in range(1, 101)])
+        self.assertEqual(rendered.total_items, 100)
+        self.assertEqual(
+            rendered.content.splitlines()[-1],
+            f"[truncated: showing 3 of 100 items; full result saved to {rendered.artifact}]",
+        )
+
+    def test_spill_cap(self):
+        """Test that the artifact stops at spill_max_bytes and stops reading the generator."""
+        items = CountingItems()
+        budget = self.budget(max_items=3, spill_bytes=10, spill_max_bytes=50)
+        rendered = render_tool_result(iter(items), "t", "c", budget)
+        text = Path(rendered.artifact).read_text(encoding="utf-8")
+        self.assertTrue(text.endswith("\n[artifact truncated at 50 bytes]\n"))
+        self.assertLessEqual(len(text.split("\n[artifact")[0].encode("utf-8")), 50)
+        self.assertLess(items.read, 20)
+        self.assertIsNone(rendered.total_items)
+        self.assertIn("[truncated: showing 3 of more than", rendered.content)
+
+        rendered = render_tool_result("x" * 100, "t", "d", self.budget(max_bytes=10, spill_bytes=0, spill_max_bytes=40))
+        text = Path(rendered.artifact).read_text(encoding="utf-8")
+        self.assertEqual(text, "x" * 40 + "\n[artifact truncated at 40 bytes]\n")
+
+
+class TestResultBudget(unittest.TestCase):
+    """Test cases for reading budgets from tool policies."""
+
+    def test_per_tool_overrides_default(self):
+        """Test that per-tool settings override the default entry and unknown keys are ignored."""
+        policies = {"result_budgets": {
+            "default": {"max_items": 2, "max_bytes": 100},
+            "list_files": {"max_items": 200, "colour": "red"},
+        }}
+        self.assertEqual(ResultBudget.for_tool(policies, "list_files"), ResultBudget(max_items=200, max_bytes=100))
+        self.assertEqual(ResultBudget.for_tool(policies, "read_file"), ResultBudget(max_items=2, max_bytes=100))
+        self.assertEqual(ResultBudget.for_tool({}, "read_file"), ResultBudget())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,49 @@
 """Handle tool calls from LLM responses."""
 import json
+from functools import partial
 
+from .plugins.core.tool_execution import resolve_max_concurrency, run_tool_calls
+from .tool_result_renderer import ResultBudget, render_tool_result
 
-def handle_tool_calls(resp_msg, tool_map: dict, msgs: dict, args, policies: dict, logger) -> list:
-    """Execute tool calls and return tool result messages."""
+
+def _tool_message(call_id: str, function_name: str, content: str) -> dict:
+    return {
+        "tool_call_id": call_id,
+        "role": "tool",
+        "name": function_name,
+        "content": content,
+    }
+
+
+def _execute_tool(handler, function_name: str, payload: dict, msgs: dict, logger):
+    """Run one tool handler; called from the tool pool."""
+    exec_template = msgs.get("info_executing_tool", "Executing tool: {name}")
+    logger.info(exec_template.format(name=function_name))
+    return handler(**payload)
+
+
+def handle_tool_calls(
+    resp_msg, tool_map: dict, msgs: dict, args, policies: dict, logger, latencies: list | None = None
+) -> list:
+    """Execute tool calls and return tool result messages.
+
+    Confirmation prompts and dry-run checks happen first, one call at a
+    time. The approved calls then run with read-only tools in parallel and
+    modifying tools serially, in their original order. Results are
+    returned in the order of the tool calls, rendered within the budgets
+    of tool_result_renderer.
+
+    Tool messages go back to the chat API as they are, so latencies are
+    kept out of them. Pass a list as latencies to receive one
+    {"tool_call_id", "name", "latency_ms"} entry per executed call, the
+    same entries core.run_tool_calls returns as tool_latencies.
+    """
     if not resp_msg.tool_calls:
         return []
 
     modifying_tools = set(policies.get("modifying_tools", []))
     tool_results = []
+    pending = []
 
     for tool_call in resp_msg.tool_calls:
         function_name = tool_call.function.name
@@ -24,12 +59,7 @@ def handle_tool_calls(resp_msg, tool_map: dict, msgs: dict, args, policies: dict
             )
             msg = msg_template.format(name=function_name)
             logger.error(msg)
-            tool_results.append({
-                "tool_call_id": call_id,
-                "role": "tool",
-                "name": function_name,
-                "content": msg,
-            })
+            tool_results.append(_tool_message(call_id, function_name, msg))
             continue
 
         if not args.yolo:
@@ -42,12 +72,7 @@ def handle_tool_calls(resp_msg, tool_map: dict, msgs: dict, args, policies: dict
             if confirm.lower() != "y":
                 skipped_template = msgs.get("info_tool_skipped", "Skipping tool: {name}")
                 logger.info(skipped_template.format(name=function_name))
-                tool_results.append({
-                    "tool_call_id": call_id,
-                    "role": "tool",
-                    "name": function_name,
-                    "content": "Skipped by user.",
-                })
+                tool_results.append(_tool_message(call_id, function_name, "Skipped by user."))
                 continue
 
         if args.dry_run and function_name in modifying_tools:
@@ -57,40 +82,39 @@ def handle_tool_calls(resp_msg, tool_map: dict, msgs: dict, args, policies: dict
                     "DRY RUN: Skipping state-modifying tool {name}"
                 ).format(name=function_name)
             )
-            tool_results.append({
-                "tool_call_id": call_id,
-                "role": "tool",
-                "name": function_name,
-                "content": "Skipped due to dry-run.",
-            })
+            tool_results.append(_tool_message(call_id, function_name, "Skipped due to dry-run."))
             continue
 
-        exec_template = msgs.get("info_executing_tool", "Executing tool: {name}")
-        logger.info(exec_template.format(name=function_name))
-        try:
-            result = handler(**payload)
-            content = str(result) if result is not None else "Success"
-            if hasattr(result, "__iter__") and not isinstance(result, str):
-                items = list(result)[:5]
-                content = "\n".join([f"- {item}" for item in items])
-                logger.info(content)
-            elif result is not None:
-                logger.info(result)
-
-            tool_results.append({
-                "tool_call_id": call_id,
-                "role": "tool",
-                "name": function_name,
-                "content": content,
-            })
-        except Exception as error:  # pylint: disable=broad-exception-caught
-            error_msg = f"Error executing {function_name}: {error}"
+        # Placeholder keeps the result in tool call order
+        tool_results.append(None)
+        pending.append((len(tool_results) - 1, call_id, function_name, handler, payload))
+
+    outcomes = run_tool_calls(
+        (
+            (partial(_execute_tool, handler, function_name, payload, msgs, logger),
+             function_name in modifying_tools)
+            for _, _, function_name, handler, payload in pending
+        ),
+        resolve_max_concurrency(policies),
+    )
+
+    for (position, call_id, function_name, _, _), outcome in zip(pending, outcomes):
+        logger.debug("Tool %s finished in %.1f ms", function_name, outcome.latency_ms)
+        if latencies is not None:
+            latencies.append({"tool_call_id": call_id, "name": function_name, "latency_ms": outcome.latency_ms})
+        if outcome.error is not None:
+            error_msg = f"Error executing {function_name}: {outcome.error}"
             logger.error(error_msg)
-            tool_results.append({
-                "tool_call_id": call_id,
-                "role": "tool",
-                "name": function_name,
-                "content": error_msg,
-            })
+            tool_results[position] = _tool_message(call_id, function_name, error_msg)
+            continue
+
+        rendered = render_tool_result(
+            outcome.value, function_name, call_id, ResultBudget.for_tool(policies, function_name)
+        )
+        if outcome.value is not None:
+            logger.info(rendered.content)
+        if rendered.artifact:
+            logger.debug("Tool %s result saved to %s", function_name, rendered.artifact)
+        tool_results[position] = _tool_message(call_id, function_name, rendered.content)
 
     return tool_results
@@ -0,0 +1,226 @@
+"""Render tool results into bounded conversation content.
+
+Tools may return huge strings, lists or generators (a recursive directory
+listing, say). Iterable results are read lazily with ``itertools.islice``;
+only as many items as the budget allows are rendered, one ``- item`` line
+each, and anything cut off is marked explicitly in the content. Results
+that overflow the budget by more than ``spill_bytes`` are written in full
+to an artifact file, which the content references, so the model can ask
+for it with a file tool instead of receiving it inline.
+
+Budgets come from ``tool_policies["result_budgets"]``: a ``default`` entry
+and optional per-tool entries, e.g.
+``{"default": {"max_items": 5}, "list_files": {"max_items": 200}}``.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, fields
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ITEMS = 5
+DEFAULT_MAX_BYTES = 8 * 1024
+DEFAULT_SPILL_BYTES = 64 * 1024
+DEFAULT_SPILL_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_ARTIFACT_DIR = ".tool_artifacts"
+
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+_END = object()
+
+
+@dataclass
+class ResultBudget:
+    """Limits on what one tool result may put into the conversation."""
+    max_items: int = DEFAULT_MAX_ITEMS
+    max_bytes: int = DEFAULT_MAX_BYTES
+    spill_bytes: int = DEFAULT_SPILL_BYTES
+    spill_max_bytes: int = DEFAULT_SPILL_MAX_BYTES
+    artifact_dir: Optional[str] = DEFAULT_ARTIFACT_DIR
+
+    @classmethod
+    def for_tool(cls, policies: Dict[str, Any], name: str) -> "ResultBudget":
+        """Merge the default and per-tool budgets from tool policies."""
+        budgets = (policies or {}).get("result_budgets") or {}
+        settings = {**(budgets.get("default") or {}), **(budgets.get(name) or {})}
+        known = {item.name for item in fields(cls)}
+        return cls(**{key: value for key, value in settings.items() if key in known})
+
+
+@dataclass
+class RenderedResult:
+    """Conversation content for a tool result and how it was cut."""
+    content: str
+    truncated: bool = False
+    items_shown: Optional[int] = None
+    total_items: Optional[int] = None
+    artifact: Optional[str] = None
+
+
+def _is_item_sequence(result: Any) -> bool:
+    """Return True for results rendered as one line per item."""
+    return hasattr(result, "__iter__") and not isinstance(result, (str, bytes, bytearray, dict))
+
+
+def _clip(text: str, max_bytes: int) -> str:
+    """Cut text to at most max_bytes of UTF-8 without splitting a character."""
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode("utf-8", "ignore")
+
+
+class _Spill:
+    """Artifact file receiving the full text of an oversized result."""
+
+    def __init__(self, budget: ResultBudget, name: str, call_id: str):
+        directory = Path(budget.artifact_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = _UNSAFE_NAME.sub("_", f"{name}-{call_id}")
+        self.path = directory / f"{stem}.txt"
+        self.limit = budget.spill_max_bytes
+        self.written = 0
+        self.complete = True
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def write(self, text: str) -> bool:
+        """Write text; returns False once the spill limit is reached."""
+        size = len(text.encode("utf-8"))
+        if self.written + size > self.limit:
+            self.complete = False
+            return False
+        self._file.write(text)
+        self.written += size
+        return True
+
+    def close(self) -> None:
+        """Close the file, noting if the result did not fit."""
+        if not self.complete:
+            self._file.write(f"\n[artifact truncated at {self.limit} bytes]\n")
+        self._file.close()
+
+
+def render_tool_result(result: Any, name: str, call_id: str, budget: ResultBudget) -> RenderedResult:
+    """Render result within budget, spilling very large results to a file."""
+    if result is None:
+        return RenderedResult("Success")
+    if _is_item_sequence(result):
+        return _render_items(iter(result), name, call_id, budget)
+    if isinstance(result, (bytes, bytearray)):
+        result = bytes(result).decode("utf-8", "replace")
+    return _render_text(str(result), name, call_id, budget)
+
+
+def _render_text(text: str, name: str, call_id: str, budget: ResultBudget) -> RenderedResult:
+    """Render a text result, clipping it to the byte budget."""
+    size = len(text.encode("utf-8"))
+    if size <= budget.max_bytes:
+        return RenderedResult(text)
+
+    artifact = None
+    if budget.artifact_dir and size - budget.max_bytes > budget.spill_bytes:
+        artifact = _spill_text(text, name, call_id, budget)
+    shown = _clip(text, budget.max_bytes)
+    marker = f"[truncated: showing {len(shown.encode('utf-8'))} of {size} bytes"
+    marker += f"; full result saved to {artifact}]" if artifact else "]"
+    return RenderedResult(f"{shown}\n{marker}", truncated=True, artifact=artifact)
+
+
+def _render_items(iterator: Iterator[Any], name: str, call_id: str, budget: ResultBudget) -> RenderedResult:
+    """Render an iterable result lazily, one line per item."""
+    consumed: List[str] = []
+    lines: List[str] = []
+    shown_size = 0
+    clipped = False
+    for item in islice(iterator, max(budget.max_items, 0)):
+        line = f"- {item}"
+        consumed.append(line)
+        line_size = len(line.encode("utf-8")) + 1
+        if shown_size + line_size > budget.max_bytes:
+            if not lines:
+                # A single oversized item still shows its beginning
+                lines.append(_clip(line, budget.max_bytes))
+                shown_size = len(lines[0].encode("utf-8"))
+                clipped = True
+            break
+        lines.append(line)
+        shown_size += line_size
+    shown = len(lines)
+
+    # Read a bounded amount past the budget to tell a small overflow from a large one
+    hidden_size = sum(len(line.encode("utf-8")) + 1 for line in consumed) - shown_size
+    exhausted = True
+    while hidden_size <= budget.spill_bytes:
+        item = next(iterator, _END)
+        if item is _END:
+            break
+        consumed.append(f"- {item}")
+        hidden_size += len(consumed[-1].encode("utf-8")) + 1
+    else:
+        exhausted = False
+
+    if len(consumed) == shown and not clipped:
+        return RenderedResult("\n".join(lines), items_shown=shown, total_items=shown)
+
+    total: Optional[int] = len(consumed) if exhausted else None
+    seen = len(consumed)
+    artifact = None
+    if hidden_size > budget.spill_bytes and budget.artifact_dir:
+        artifact, seen, complete = _spill_items(consumed, iterator, name, call_id, budget)
+        if artifact:
+            total = seen if complete else None
+        seen = max(seen, len(consumed))
+
+    if total is None:
+        marker = f"[truncated: showing {shown} of more than {seen} items"
+    else:
+        marker = f"[truncated: showing {shown} of {total} items"
+    if clipped:
+        marker += f", item 1 cut at {budget.max_bytes} bytes"
+    marker += f"; full result saved to {artifact}]" if artifact else "]"
+    return RenderedResult(
+        "\n".join(lines + [marker]), truncated=True, items_shown=shown, total_items=total, artifact=artifact
+    )
+
+
+def _spill_text(text: str, name: str, call_id: str, budget: ResultBudget) -> Optional[str]:
+    """Write a text result to an artifact; returns its path."""
+    try:
+        spill = _Spill(budget, name, call_id)
+    except OSError as error:
+        logger.warning("Cannot write tool result artifact for %s: %s", name, error)
+        return None
+    try:
+        if not spill.write(text):
+            spill.write(_clip(text, budget.spill_max_bytes))
+    finally:
+        spill.close()
+    return str(spill.path)
+
+
+def _spill_items(
+    consumed: List[str],
+    iterator: Iterator[Any],
+    name: str,
+    call_id: str,
+    budget: ResultBudget
+) -> Tuple[Optional[str], int, bool]:
+    """Write every item to an artifact; returns (path, items written, all written)."""
+    try:
+        spill = _Spill(budget, name, call_id)
+    except OSError as error:
+        logger.warning("Cannot write tool result artifact for %s: %s", name, error)
+        return None, 0, False
+    count = 0
+    try:
+        for line in chain(consumed, (f"- {item}" for item in iterator)):
+            if not spill.write(line + "\n"):
+                break
+            count += 1
+    finally:
+        spill.close()
+    return str(spill.path), count, spill.complete
@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
+from .execution_report import ExecutionReport
 from .n8n_executor import N8NExecutor
 
 logger = logging.getLogger(__name__)
@@ -33,16 +34,35 @@ def is_n8n_workflow(workflow: Dict[str, Any]) -> bool:
 class WorkflowAdapter:
     """Execute n8n workflows (breaking change: legacy format no longer supported)."""
 
-    def __init__(self, node_executor, runtime, plugin_registry):
+    def __init__(self, node_executor, runtime, plugin_registry, checkpoint_store=None):
         self.runtime = runtime
         self.plugin_registry = plugin_registry
-        self.n8n_executor = N8NExecutor(runtime, plugin_registry)
+        self.n8n_executor = N8NExecutor(runtime, plugin_registry, checkpoint_store=checkpoint_store)
 
-    def execute(self, workflow: Dict[str, Any]) -> None:
+    def execute(
+        self,
+        workflow: Dict[str, Any],
+        run_id: str | None = None,
+        items: List[Dict[str, Any]] | None = None
+    ) -> ExecutionReport:
         """Execute n8n workflow."""
+        self._require_n8n(workflow)
+        logger.debug("Executing n8n workflow")
+        return self.n8n_executor.execute(workflow, run_id, items)
+
+    def resume(self, workflow: Dict[str, Any], run_id: str) -> ExecutionReport:
+        """Resume a checkpointed n8n workflow run."""
+        self._require_n8n(workflow)
+        logger.debug("Resuming n8n workflow run %s", run_id)
+        return self.n8n_executor.resume(workflow, run_id)
+
+    @property
+    def last_report(self) -> ExecutionReport | None:
+        """Report of the most recent run."""
+        return self.n8n_executor.last_report
+
+    def _require_n8n(self, workflow: Dict[str, Any]) -> None:
+        """Reject workflows that are not in n8n format."""
         if not is_n8n_workflow(workflow):
             logger.error("Legacy workflow format is no longer supported. Please migrate to n8n schema.")
             raise ValueError("Only n8n workflow format is supported")
-
-        logger.debug("Executing n8n workflow")
-        self.n8n_executor.execute(workflow)
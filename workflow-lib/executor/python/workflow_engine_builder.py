@@ -1,25 +1,40 @@
 """Build workflow engine with dependencies."""
+from .checkpoint import CheckpointStore
 from .engine import WorkflowEngine
 from .input_resolver import InputResolver
 from .loop_executor import LoopExecutor
 from .node_executor import NodeExecutor
-from .plugin_registry import PluginRegistry, load_plugin_map
+from .plugin_registry import PluginRegistry, load_plugin_capabilities, load_plugin_map
 from .runtime import WorkflowRuntime
 from .tool_runner import ToolRunner
 
 
-def build_workflow_engine(workflow_config: dict, context: dict, logger):
-    """Assemble workflow engine dependencies."""
+def build_workflow_engine(
+    workflow_config: dict,
+    context: dict,
+    logger,
+    prewarm: bool = False,
+    checkpoint_dir=None
+):
+    """Assemble workflow engine dependencies.
+
+    With prewarm, the plugins the workflow references are imported up front
+    instead of on first use. With checkpoint_dir, progress is saved there
+    after every node and ``engine.resume(run_id)`` continues a failed run.
+    """
     runtime = WorkflowRuntime(context=context, store={}, tool_runner=None, logger=logger)
     # Only create ToolRunner if tool_map and msgs are provided (needed for AI workflows)
     if "tool_map" in context and "msgs" in context:
         tool_runner = ToolRunner(context["tool_map"], context["msgs"], logger)
         runtime.tool_runner = tool_runner
 
-    plugin_registry = PluginRegistry(load_plugin_map())
+    plugin_registry = PluginRegistry(load_plugin_map(), load_plugin_capabilities())
+    if prewarm:
+        plugin_registry.prewarm_workflow(workflow_config or {})
     input_resolver = InputResolver(runtime.store)
     loop_executor = LoopExecutor(runtime, input_resolver)
     node_executor = NodeExecutor(runtime, plugin_registry, input_resolver, loop_executor)
     loop_executor.set_node_executor(node_executor)
 
-    return WorkflowEngine(workflow_config, node_executor, logger, runtime, plugin_registry)
+    checkpoint_store = CheckpointStore(checkpoint_dir) if checkpoint_dir else None
+    return WorkflowEngine(workflow_config, node_executor, logger, runtime, plugin_registry, checkpoint_store)
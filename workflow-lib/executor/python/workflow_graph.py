@@ -5,7 +5,9 @@ import json
 import logging
 from typing import Any, Dict, Iterable, List
 
-from autometabuilder.data import get_workflow_content, load_metadata
+from autometabuilder.data import get_workflow_content
+
+from .plugins.manifest_index import load_manifest_index
 
 logger = logging.getLogger(__name__)
 
@@ -75,7 +77,7 @@ def _build_n8n_edges(
 def build_workflow_graph() -> Dict[str, Any]:
     """Build workflow graph from n8n format (breaking change: legacy format removed)."""
     definition = _parse_workflow_definition()
-    plugin_map = load_metadata().get("workflow_plugins", {})
+    plugin_map = load_manifest_index()["plugins"]
 
     # Only support n8n format now
     nodes = _gather_n8n_nodes(definition.get("nodes", []), plugin_map)
@@ -0,0 +1 @@
+"""Load workflow plugins plugin."""
@@ -1,9 +1,9 @@
 """Workflow plugin: load workflow plugins."""
 
 import os
-import json
 
 from ...base import NodeExecutor
+from ...manifest_index import load_manifest_index
 
 
 class LoadPlugins(NodeExecutor):
@@ -24,31 +24,18 @@ class LoadPlugins(NodeExecutor):
         if not os.path.exists(path):
             return {"success": False, "error": f"Path not found: {path}"}
 
+        index = load_manifest_index(path)
+        categories = index["categories"]
         plugins = {}
-        categories = []
-
-        for category in os.listdir(path):
-            category_path = os.path.join(path, category)
-            if not os.path.isdir(category_path) or category.startswith("_"):
-                continue
-
-            categories.append(category)
-
-            for plugin_name in os.listdir(category_path):
-                plugin_path = os.path.join(category_path, plugin_name)
-                if not os.path.isdir(plugin_path):
-                    continue
-
-                package_json = os.path.join(plugin_path, "package.json")
-                if os.path.exists(package_json):
-                    with open(package_json) as f:
-                        metadata = json.load(f)
-                        plugin_type = metadata.get("metadata", {}).get("plugin_type")
-                        if plugin_type:
-                            plugins[plugin_type] = {
-                                "path": plugin_path,
-                                "metadata": metadata
-                            }
+
+        for name, entry in index["plugins"].items():
+            metadata = index["packages"][name]
+            plugin_type = metadata.get("metadata", {}).get("plugin_type")
+            if plugin_type:
+                plugins[plugin_type] = {
+                    "path": os.path.join(path, entry["path"]),
+                    "metadata": metadata
+                }
 
         runtime.context["plugins"] = plugins
 
@@ -0,0 +1,66 @@
+"""Tests for LoadPlugins plugin."""
+
+import json
+import os
+import shutil
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+from .backend_load_plugins import LoadPlugins
+
+
+def write_plugin(root, category, name, plugin_type, **metadata):
+    """Create a plugin directory with a package.json manifest."""
+    directory = os.path.join(root, category, name)
+    os.makedirs(directory)
+    manifest = {"name": name, "main": f"{name}.py", "metadata": {"plugin_type": plugin_type, **metadata}}
+    with open(os.path.join(directory, "package.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+class TestLoadPlugins(unittest.TestCase):
+    """Test cases for loading plugins from a directory."""
+
+    def setUp(self):
+        """Set up a plugins directory and a runtime."""
+        self.root = tempfile.mkdtemp(prefix="load-plugins-test-")
+        write_plugin(self.root, "math", "math_add", "math.add", description="Add numbers")
+        self.runtime = types.SimpleNamespace(context={})
+        self.plugin = LoadPlugins()
+
+    def tearDown(self):
+        """Remove the plugins directory."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_loads_full_manifests(self):
+        """Test that loaded plugins carry their whole package.json."""
+        result = self.plugin.execute({"path": self.root}, self.runtime)
+        self.assertEqual(result, {"success": True, "categories": ["math"], "plugin_count": 1})
+        plugin = self.runtime.context["plugins"]["math.add"]
+        self.assertEqual(plugin["path"], os.path.join(self.root, "math/math_add"))
+        self.assertEqual(plugin["metadata"]["metadata"]["description"], "Add numbers")
+
+    def test_manifests_not_read_again(self):
+        """Test that a fresh index is used without opening any package.json."""
+        self.plugin.execute({"path": self.root}, self.runtime)
+        self.runtime.context.clear()
+        with mock.patch("builtins.open", side_effect=AssertionError("package.json read")):
+            result = self.plugin.execute({"path": self.root}, self.runtime)
+        self.assertEqual(result["plugin_count"], 1)
+        self.assertEqual(self.runtime.context["plugins"]["math.add"]["metadata"]["name"], "math_add")
+
+    def test_directory_left_unchanged(self):
+        """Test that no index file is written into the directory."""
+        self.plugin.execute({"path": self.root}, self.runtime)
+        self.assertEqual(os.listdir(self.root), ["math"])
+
+    def test_missing_path(self):
+        """Test that a missing directory is reported."""
+        result = self.plugin.execute({"path": os.path.join(self.root, "missing")}, self.runtime)
+        self.assertFalse(result["success"])
+
+
+if __name__ == "__main__":
+    unittest.main()
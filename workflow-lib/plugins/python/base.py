@@ -18,6 +18,7 @@ class NodeStatus(Enum):
     ERROR = "error"
     SKIPPED = "skipped"
     PENDING = "pending"
+    PARTIAL = "partial"
 
 
 @dataclass
@@ -28,7 +29,8 @@ class NodeResult:
     error: Optional[str] = None
     error_code: Optional[str] = None
     timestamp: int = field(default_factory=lambda: int(time.time() * 1000))
-    duration: Optional[int] = None
+    duration: Optional[float] = None  # milliseconds
+    output_size: Optional[int] = None  # estimated bytes
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -44,6 +46,8 @@ class NodeResult:
             result["errorCode"] = self.error_code
         if self.duration is not None:
             result["duration"] = self.duration
+        if self.output_size is not None:
+            result["outputSize"] = self.output_size
         return result
 
 
@@ -140,6 +144,24 @@ class NodeExecutor(ABC):
         """
         pass
 
+    def execute_batch(self, items: List[Dict[str, Any]], runtime: Any = None) -> List[Dict[str, Any]]:
+        """
+        Execute the node logic for a batch of items.
+
+        Override this method when a plugin can process many items more
+        cheaply than one execute() call per item. The default calls
+        execute() for each item; the n8n executor only uses overrides and
+        otherwise calls the plugin per item, memoizing pure plugins.
+
+        Args:
+            items: Input parameter dictionaries, one per item
+            runtime: Optional runtime context (for advanced use)
+
+        Returns:
+            One result dict per item, in the same order as items
+        """
+        return [self.execute(item, runtime) for item in items]
+
     def validate(self, inputs: Dict[str, Any]) -> ValidationResult:
         """
         Validate inputs.
@@ -21,3 +21,18 @@ class ConvertToJson(NodeExecutor):
             return {"result": result}
         except (TypeError, ValueError) as e:
             return {"result": None, "error": str(e)}
+
+    def execute_batch(self, items, runtime=None):
+        # One encoder per indent instead of one per call
+        encoders = {}
+        results = []
+        for item in items:
+            indent = item.get("indent")
+            encoder = encoders.get(indent)
+            if encoder is None:
+                encoder = encoders[indent] = json.JSONEncoder(indent=indent)
+            try:
+                results.append({"result": encoder.encode(item.get("value"))})
+            except (TypeError, ValueError) as e:
+                results.append({"result": None, "error": str(e)})
+        return results
@@ -0,0 +1,144 @@
+"""Assemble a streamed chat completion into the shape of a regular one.
+
+Chunks carry text deltas and fragments of tool calls: the first fragment
+of a call holds its id and function name, and later fragments with the
+same ``index`` append to its JSON arguments. StreamAssembler joins them
+and reports progress as it goes, either to an event callback or, without
+one, to the logger one completed line at a time.
+
+Callback events are dicts:
+    {"type": "content", "delta": text}
+    {"type": "tool_call", "index": i, "id": id, "name": name, "arguments": fragment}
+    {"type": "done", "ttft_ms": ..., "total_ms": ...}
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class StreamAssembler:
+    """Collect chunks of one streamed completion."""
+
+    def __init__(
+        self,
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+        logger=None,
+        started: Optional[float] = None
+    ):
+        self.on_event = on_event
+        self.logger = logger
+        self.started = started if started is not None else time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.response_id: Optional[str] = None
+        self.model: Optional[str] = None
+        self.role = "assistant"
+        self.finish_reason: Optional[str] = None
+        self._content: List[str] = []
+        self._line: List[str] = []
+        self._tool_calls: Dict[int, Dict[str, Any]] = {}
+
+    def feed(self, chunk: Any) -> None:
+        """Add one stream chunk."""
+        self.response_id = self.response_id or getattr(chunk, "id", None)
+        self.model = self.model or getattr(chunk, "model", None)
+        for choice in getattr(chunk, "choices", None) or []:
+            if getattr(choice, "index", 0):
+                continue
+            if getattr(choice, "finish_reason", None):
+                self.finish_reason = choice.finish_reason
+            delta = getattr(choice, "delta", None)
+            if delta is None:
+                continue
+            self.role = getattr(delta, "role", None) or self.role
+            text = getattr(delta, "content", None)
+            if text:
+                self._mark_first_token()
+                self._content.append(text)
+                self._publish_text(text)
+            for fragment in getattr(delta, "tool_calls", None) or []:
+                self._mark_first_token()
+                self._add_tool_fragment(fragment)
+
+    def finish(self) -> Dict[str, Any]:
+        """Flush pending output and return the completion as a dict."""
+        self.finished_at = time.perf_counter()
+        if self._line and self.on_event is None and self.logger is not None:
+            self.logger.info("".join(self._line))
+        self._line = []
+        if self.on_event is not None:
+            self.on_event({"type": "done", **self.timing()})
+
+        message: Dict[str, Any] = {
+            "role": self.role,
+            "content": "".join(self._content) if self._content else None,
+        }
+        if self._tool_calls:
+            message["tool_calls"] = [self._tool_calls[index] for index in sorted(self._tool_calls)]
+        return {
+            "id": self.response_id or "",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": self.model or "",
+            "choices": [{
+                "index": 0,
+                "finish_reason": self.finish_reason or ("tool_calls" if self._tool_calls else "stop"),
+                "message": message,
+            }],
+        }
+
+    def timing(self) -> Dict[str, Optional[float]]:
+        """Return time to first token and total latency in milliseconds."""
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return {
+            "ttft_ms": (self.first_token_at - self.started) * 1000 if self.first_token_at else None,
+            "total_ms": (end - self.started) * 1000,
+        }
+
+    @property
+    def content_published(self) -> bool:
+        """True once any text has been handed to the logger or callback."""
+        return bool(self._content)
+
+    def _mark_first_token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+    def _publish_text(self, text: str) -> None:
+        if self.on_event is not None:
+            self.on_event({"type": "content", "delta": text})
+            return
+        if self.logger is None:
+            return
+        *complete, rest = text.split("\n")
+        for part in complete:
+            self._line.append(part)
+            self.logger.info("".join(self._line))
+            self._line = []
+        if rest:
+            self._line.append(rest)
+
+    def _add_tool_fragment(self, fragment: Any) -> None:
+        index = getattr(fragment, "index", None)
+        if index is None:
+            index = len(self._tool_calls)
+        call = self._tool_calls.get(index)
+        function = getattr(fragment, "function", None)
+        name = getattr(function, "name", None)
+        arguments = getattr(function, "arguments", None) or ""
+        if call is None:
+            call = self._tool_calls[index] = {
+                "id": "", "type": "function", "function": {"name": "", "arguments": ""},
+            }
+        call["id"] = getattr(fragment, "id", None) or call["id"]
+        call["type"] = getattr(fragment, "type", None) or call["type"]
+        if name:
+            call["function"]["name"] += name
+            if self.logger is not None:
+                self.logger.debug("Streaming tool call %s", name)
+        call["function"]["arguments"] += arguments
+        if self.on_event is not None:
+            self.on_event({
+                "type": "tool_call", "index": index, "id": call["id"],
+                "name": call["function"]["name"], "arguments": arguments,
+            })
@@ -0,0 +1 @@
+"""AI request plugin."""
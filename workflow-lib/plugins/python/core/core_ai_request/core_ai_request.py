@@ -1,23 +1,107 @@
 """Workflow plugin: AI request."""
 
+import os
+import time
+
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ...base import NodeExecutor
+from ..completion_stream import StreamAssembler
+from ..llm_cache import (
+    DEFAULT_DIRECTORY, DEFAULT_MAX_BYTES, DEFAULT_TTL, MODE_OFF, MODE_READ_ONLY,
+    MODE_READ_WRITE, MODE_RECORD, MODES, get_response_cache, request_key,
+    restore_response, to_jsonable,
+)
+from ..message_compaction import (
+    DEFAULT_KEEP_LAST_TURNS, DEFAULT_SUMMARY_CHARS, CompactionPolicy, compact_messages,
+)
+from ..message_log import MessageLog
+
+SAMPLING = {"tool_choice": "auto", "temperature": 1.0, "top_p": 1.0}
+STREAM_CALLBACK_KEY = "ai_stream_callback"
+_TRUE_VALUES = (True, "true", "True", "1", "yes", "on")
 
 
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _get_completion(client, model, messages, tools):
-    """Request a chat completion with retries."""
+def _get_completion(client, model, messages, tools, stream=False):
+    """Request a chat completion (or open a completion stream) with retries."""
+    options = {"stream": True} if stream else {}
     return client.chat.completions.create(
         model=model,
         messages=messages,
         tools=tools,
-        tool_choice="auto",
-        temperature=1.0,
-        top_p=1.0,
+        **SAMPLING,
+        **options,
+    )
+
+
+def _setting(inputs, name, env_var, default):
+    """Read an option from node inputs, then the environment."""
+    value = inputs.get(name)
+    if value is None or value == "":
+        value = os.getenv(env_var)
+    return default if value is None or value == "" else value
+
+
+def _compaction_policy(inputs):
+    """Return the automatic compaction policy, or None when it is off."""
+    max_tokens = _setting(inputs, "compact_max_tokens", "LLM_COMPACT_MAX_TOKENS", None)
+    if max_tokens is None:
+        return None
+    return CompactionPolicy(
+        max_tokens=int(max_tokens),
+        keep_last_turns=int(_setting(
+            inputs, "compact_keep_last_turns", "LLM_COMPACT_KEEP_LAST_TURNS", DEFAULT_KEEP_LAST_TURNS
+        )),
+        summary_chars=int(_setting(
+            inputs, "compact_summary_chars", "LLM_COMPACT_SUMMARY_CHARS", DEFAULT_SUMMARY_CHARS
+        )),
     )
 
 
+def _request_completion(runtime, model, messages, tools, stream, timing):
+    """Call the model, consuming the stream when streaming is on."""
+    client = runtime.context["client"]
+    started = time.perf_counter()
+    if not stream:
+        response = _get_completion(client, model, messages, tools)
+        timing["total_ms"] = (time.perf_counter() - started) * 1000
+        return response
+
+    assembler = StreamAssembler(runtime.context.get(STREAM_CALLBACK_KEY), runtime.logger, started)
+    for chunk in _get_completion(client, model, messages, tools, stream=True):
+        assembler.feed(chunk)
+    completion = assembler.finish()
+    timing.update(assembler.timing())
+    timing["streamed"] = assembler.content_published
+    return restore_response(completion)
+
+
+def _cached_completion(mode, inputs, runtime, model, messages, tools, stream, timing):
+    """Request a completion through the response cache in the given mode."""
+    if mode == MODE_OFF:
+        return _request_completion(runtime, model, messages, tools, stream, timing)
+
+    cache = get_response_cache(
+        _setting(inputs, "cache_dir", "LLM_CACHE_DIR", DEFAULT_DIRECTORY),
+        int(_setting(inputs, "cache_max_bytes", "LLM_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+        float(_setting(inputs, "cache_ttl", "LLM_CACHE_TTL", DEFAULT_TTL)),
+    )
+    key = request_key({"model": model, "messages": messages, "tools": tools, **SAMPLING})
+    if mode in (MODE_READ_WRITE, MODE_READ_ONLY):
+        started = time.perf_counter()
+        cached = cache.get(key)
+        if cached is not None:
+            runtime.logger.debug("AI response served from cache (%s)", key[:12])
+            timing.update(total_ms=(time.perf_counter() - started) * 1000, cached=True)
+            return restore_response(cached)
+
+    response = _request_completion(runtime, model, messages, tools, stream, timing)
+    if mode in (MODE_READ_WRITE, MODE_RECORD):
+        cache.put(key, to_jsonable(response), model)
+    return response
+
+
 class CoreAiRequest(NodeExecutor):
     """Invoke the AI model with current messages."""
 
@@ -26,24 +110,66 @@ class CoreAiRequest(NodeExecutor):
     description = "Invoke the AI model with current messages and return the response"
 
     def execute(self, inputs, runtime=None):
-        """Invoke the model with current messages."""
-        messages = list(inputs.get("messages") or [])
-        response = _get_completion(
-            runtime.context["client"],
+        """Invoke the model with current messages.
+
+        Inputs:
+            messages: Conversation so far
+            cache_mode: off, read-write, read-only or record
+                (defaults to LLM_CACHE_MODE env var, then off)
+            cache_dir: Response cache directory (LLM_CACHE_DIR)
+            cache_ttl: Seconds a cached response stays valid (LLM_CACHE_TTL)
+            cache_max_bytes: Cache size budget (LLM_CACHE_MAX_BYTES)
+            stream: Stream the completion (LLM_STREAM), publishing text and
+                tool call deltas to runtime.context["ai_stream_callback"]
+                if set, otherwise to the logger line by line
+            compact_max_tokens: Compact the conversation before the request
+                when its estimated size exceeds this (LLM_COMPACT_MAX_TOKENS);
+                see core.compact_messages. compact_keep_last_turns and
+                compact_summary_chars tune the policy.
+
+        Returns request_timing with ttft_ms (streaming only) and total_ms.
+        """
+        mode = _setting(inputs, "cache_mode", "LLM_CACHE_MODE", MODE_OFF)
+        if mode not in MODES:
+            return {"error": f"Unknown cache_mode {mode!r}; expected one of {', '.join(MODES)}"}
+
+        stream = _setting(inputs, "stream", "LLM_STREAM", False) in _TRUE_VALUES
+        try:
+            policy = _compaction_policy(inputs)
+        except (TypeError, ValueError) as error:
+            return {"error": f"Invalid compaction setting: {error}"}
+
+        messages = MessageLog.of(inputs.get("messages"))
+        if policy is not None:
+            messages, _ = compact_messages(messages, policy)
+        timing = {"ttft_ms": None, "total_ms": None, "cached": False, "streamed": False}
+        response = _cached_completion(
+            mode,
+            inputs,
+            runtime,
             runtime.context["model_name"],
-            messages,
-            runtime.context["tools"]
+            messages.to_list(),
+            runtime.context["tools"],
+            stream,
+            timing
         )
         resp_msg = response.choices[0].message
-        runtime.logger.info(
-            resp_msg.content
-            if resp_msg.content
-            else runtime.context["msgs"]["info_tool_call_requested"]
+        # Without a callback, streamed text was already logged line by line
+        if not (timing["streamed"] and runtime.context.get(STREAM_CALLBACK_KEY) is None):
+            runtime.logger.info(
+                resp_msg.content
+                if resp_msg.content
+                else runtime.context["msgs"]["info_tool_call_requested"]
+            )
+        runtime.logger.debug(
+            "AI request took %s ms (first token after %s ms)", timing["total_ms"], timing["ttft_ms"]
         )
-        messages.append(resp_msg)
+        messages = messages.append(resp_msg)
         tool_calls = getattr(resp_msg, "tool_calls", None) or []
         return {
+            "messages": messages,
             "response": resp_msg,
             "has_tool_calls": bool(tool_calls),
-            "tool_calls_count": len(tool_calls)
+            "tool_calls_count": len(tool_calls),
+            "request_timing": timing
         }
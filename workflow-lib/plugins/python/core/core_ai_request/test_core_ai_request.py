@@ -0,0 +1,161 @@
+"""Tests for the AI request plugin against a fake OpenAI-compatible stream."""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from ..test_completion_stream import text_chunk, tool_call_stream
+from .core_ai_request import CoreAiRequest, _request_completion
+
+
+class FakeClient:
+    """OpenAI-compatible client that replays prepared stream chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **request):
+        self.requests.append(request)
+        if not request.get("stream"):
+            raise AssertionError("expected a streaming request")
+        return iter(self.chunks)
+
+
+def _runtime(client, callback=None):
+    context = {
+        "client": client,
+        "model_name": "fake-model",
+        "tools": [],
+        "msgs": {"info_tool_call_requested": "Tool call requested"},
+    }
+    if callback is not None:
+        context["ai_stream_callback"] = callback
+    return SimpleNamespace(context=context, logger=mock.Mock())
+
+
+class TestRequestCompletion(unittest.TestCase):
+    """Test cases for consuming a completion stream."""
+
+    def test_stream_assembled(self):
+        """Test that the stream becomes a response with attribute access and timing."""
+        client = FakeClient(tool_call_stream())
+        timing = {}
+        response = _request_completion(_runtime(client), "fake-model", [], [], True, timing)
+        self.assertTrue(client.requests[0]["stream"])
+        message = response.choices[0].message
+        self.assertEqual([call.function.name for call in message.tool_calls], ["read_file", "list_dir"])
+        self.assertEqual(message.tool_calls[0].function.arguments, '{"path": "a.py"}')
+        self.assertIsNotNone(timing["ttft_ms"])
+        self.assertGreaterEqual(timing["total_ms"], timing["ttft_ms"])
+        self.assertFalse(timing["streamed"])
+
+    def test_text_logged_line_by_line(self):
+        """Test that without a callback streamed text is logged once, line by line."""
+        runtime = _runtime(FakeClient([text_chunk("first\nsec"), text_chunk("ond", "stop")]))
+        result = CoreAiRequest().execute({"messages": [], "stream": True}, runtime)
+        self.assertEqual(result["response"].content, "first\nsecond")
+        self.assertTrue(result["request_timing"]["streamed"])
+        self.assertEqual([call.args[0] for call in runtime.logger.info.call_args_list], ["first", "second"])
+
+    def test_callback_receives_events(self):
+        """Test that a stream callback receives deltas and the content is logged whole."""
+        events = []
+        runtime = _runtime(FakeClient([text_chunk("hi\nthere", "stop")]), events.append)
+        CoreAiRequest().execute({"messages": [], "stream": "true"}, runtime)
+        self.assertEqual([event["type"] for event in events], ["content", "done"])
+        runtime.logger.info.assert_called_once_with("hi\nthere")
+
+
+class TestStreamedResponseCache(unittest.TestCase):
+    """Test cases for caching streamed responses."""
+
+    def setUp(self):
+        """Set up a private cache directory."""
+        self.directory = tempfile.mkdtemp(prefix="ai-request-cache-")
+
+    def tearDown(self):
+        """Remove the cache directory."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_streamed_response_served_from_cache(self):
+        """Test that a streamed response is stored and later served without calling the model."""
+        inputs = {
+            "messages": [{"role": "user", "content": "read a.py"}],
+            "stream": True,
+            "cache_mode": "read-write",
+            "cache_dir": self.directory,
+        }
+        client = FakeClient(tool_call_stream())
+        first = CoreAiRequest().execute(dict(inputs), _runtime(client))
+        second = CoreAiRequest().execute(dict(inputs), _runtime(client))
+
+        self.assertEqual(len(client.requests), 1)
+        self.assertFalse(first["request_timing"]["cached"])
+        self.assertTrue(second["request_timing"]["cached"])
+        self.assertEqual(second["tool_calls_count"], 2)
+        calls = second["response"].tool_calls
+        self.assertEqual([call.id for call in calls], ["call-a", "call-b"])
+        self.assertEqual(calls[1].function.arguments, '{"path": "src"}')
+
+
+class TestCacheModes(unittest.TestCase):
+    """Test cases for reading and writing the cache in each mode."""
+
+    def setUp(self):
+        """Set up a private cache directory."""
+        self.directory = tempfile.mkdtemp(prefix="ai-request-cache-")
+
+    def tearDown(self):
+        """Remove the cache directory."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def request(self, mode, answer):
+        client = FakeClient([text_chunk(answer, "stop")])
+        inputs = {
+            "messages": [{"role": "user", "content": "hello"}],
+            "stream": True,
+            "cache_mode": mode,
+            "cache_dir": self.directory,
+        }
+        result = CoreAiRequest().execute(inputs, _runtime(client))
+        return result["response"].content, len(client.requests)
+
+    def entries(self):
+        return list(Path(self.directory).glob("*/*.json"))
+
+    def test_off_never_touches_the_cache(self):
+        """Test that mode off calls the model every time and writes nothing."""
+        self.assertEqual(self.request("off", "one"), ("one", 1))
+        self.assertEqual(self.request("off", "two"), ("two", 1))
+        self.assertEqual(self.entries(), [])
+
+    def test_read_only_serves_but_never_writes(self):
+        """Test that read-only serves stored entries and does not store misses."""
+        self.assertEqual(self.request("read-only", "one"), ("one", 1))
+        self.assertEqual(self.entries(), [])
+        self.request("read-write", "stored")
+        self.assertEqual(self.request("read-only", "fresh"), ("stored", 0))
+        self.assertEqual(len(self.entries()), 1)
+
+    def test_record_always_calls_the_model(self):
+        """Test that record ignores stored entries and overwrites them."""
+        self.request("read-write", "stored")
+        self.assertEqual(self.request("record", "recorded"), ("recorded", 1))
+        self.assertEqual(self.request("read-write", "fresh"), ("recorded", 0))
+        self.assertEqual(len(self.entries()), 1)
+
+    def test_unknown_mode(self):
+        """Test that an unknown mode is reported without calling the model."""
+        client = FakeClient([])
+        result = CoreAiRequest().execute({"messages": [], "cache_mode": "sometimes"}, _runtime(client))
+        self.assertIn("sometimes", result["error"])
+        self.assertEqual(client.requests, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 """Workflow plugin: append context message."""
 
 from ...base import NodeExecutor
+from ..message_log import MessageLog
 
 
 class CoreAppendContextMessage(NodeExecutor):
@@ -12,10 +13,10 @@ class CoreAppendContextMessage(NodeExecutor):
 
     def execute(self, inputs, runtime=None):
         """Append context to the message list."""
-        messages = list(inputs.get("messages") or [])
+        messages = MessageLog.of(inputs.get("messages"))
         context_val = inputs.get("context")
         if context_val:
-            messages.append({
+            messages = messages.append({
                 "role": "system",
                 "content": f"{runtime.context['msgs']['sdlc_context_label']}{context_val}",
             })
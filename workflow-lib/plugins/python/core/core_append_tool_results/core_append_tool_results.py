@@ -4,6 +4,7 @@ import os
 import re
 
 from ...base import NodeExecutor
+from ..message_log import MessageLog
 
 
 def _is_mvp_reached() -> bool:
@@ -43,10 +44,10 @@ class CoreAppendToolResults(NodeExecutor):
 
     def execute(self, inputs, runtime=None):
         """Append tool results to the message list."""
-        messages = list(inputs.get("messages") or [])
+        messages = MessageLog.of(inputs.get("messages"))
         tool_results = inputs.get("tool_results") or []
         if tool_results:
-            messages.extend(tool_results)
+            messages = messages.extend(tool_results)
 
         if runtime.context.get("args", {}).get("yolo") and _is_mvp_reached():
             runtime.logger.info("MVP reached. Stopping YOLO loop.")
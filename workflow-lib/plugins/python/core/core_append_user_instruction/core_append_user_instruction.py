@@ -1,6 +1,7 @@
 """Workflow plugin: append user instruction."""
 
 from ...base import NodeExecutor
+from ..message_log import MessageLog
 
 
 class CoreAppendUserInstruction(NodeExecutor):
@@ -12,6 +13,6 @@ class CoreAppendUserInstruction(NodeExecutor):
 
     def execute(self, inputs, runtime=None):
         """Append the next user instruction."""
-        messages = list(inputs.get("messages") or [])
-        messages.append({"role": "user", "content": runtime.context["msgs"]["user_next_step"]})
+        messages = MessageLog.of(inputs.get("messages"))
+        messages = messages.append({"role": "user", "content": runtime.context["msgs"]["user_next_step"]})
         return {"messages": messages}
@@ -0,0 +1,28 @@
+"""Workflow plugin: compact messages."""
+
+from ...base import NodeExecutor
+from ..message_compaction import CompactionPolicy, compact_messages
+
+
+class CoreCompactMessages(NodeExecutor):
+    """Shrink the message list to fit a token budget."""
+
+    node_type = "core.compact_messages"
+    category = "core"
+    description = "Summarize old tool results and drop old turns to fit a token budget"
+
+    def execute(self, inputs, runtime=None):
+        """Compact the message list.
+
+        Inputs:
+            messages: Conversation to compact
+            max_tokens: Estimated token budget (default: 64000)
+            keep_last_turns: Recent turns kept verbatim (default: 4)
+            summary_chars: Characters kept from each folded tool result (default: 200)
+        """
+        try:
+            policy = CompactionPolicy.from_inputs(inputs)
+        except (TypeError, ValueError) as error:
+            return {"error": f"Invalid compaction setting: {error}"}
+        messages, report = compact_messages(inputs.get("messages"), policy)
+        return {"messages": messages, "compaction": report.to_dict()}
@@ -0,0 +1,8 @@
+"""Factory for CoreCompactMessages plugin."""
+
+from .core_compact_messages import CoreCompactMessages
+
+
+def create():
+    """Create a new CoreCompactMessages instance."""
+    return CoreCompactMessages()
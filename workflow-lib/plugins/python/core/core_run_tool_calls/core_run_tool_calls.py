@@ -1,8 +1,15 @@
 """Workflow plugin: run tool calls."""
 
 import json
+from functools import partial
 
 from ...base import NodeExecutor
+from ..tool_execution import resolve_max_concurrency, run_tool_calls
+
+
+def _invoke(handler, arguments):
+    """Decode JSON arguments and call the tool handler."""
+    return handler(**json.loads(arguments))
 
 
 class CoreRunToolCalls(NodeExecutor):
@@ -13,35 +20,50 @@ class CoreRunToolCalls(NodeExecutor):
     description = "Execute tool calls from an AI response and return results"
 
     def execute(self, inputs, runtime=None):
-        """Execute tool calls from an AI response."""
+        """Execute tool calls from an AI response.
+
+        Read-only tools run concurrently; tools listed in
+        tool_policies["modifying_tools"] run one at a time in order.
+        Results keep the order of the tool calls, and tool_latencies
+        records how long each call took.
+        """
         resp_msg = inputs.get("response")
         tool_calls = getattr(resp_msg, "tool_calls", None) or []
         if not resp_msg:
-            return {"tool_results": [], "no_tool_calls": True}
+            return {"tool_results": [], "tool_latencies": [], "no_tool_calls": True}
 
         # Handle tool calls using tool map from context
-        tool_results = []
         tool_map = runtime.context.get("tool_map", {})
+        policies = runtime.context.get("tool_policies") or {}
+        modifying_tools = set(policies.get("modifying_tools", []))
+
+        known_calls = [tool_call for tool_call in tool_calls if tool_call.function.name in tool_map]
+        outcomes = run_tool_calls(
+            (
+                (partial(_invoke, tool_map[tool_call.function.name], tool_call.function.arguments),
+                 tool_call.function.name in modifying_tools)
+                for tool_call in known_calls
+            ),
+            resolve_max_concurrency(policies, inputs.get("max_concurrency")),
+        )
 
-        for tool_call in tool_calls:
-            func_name = tool_call.function.name
-            if func_name in tool_map:
-                try:
-                    args = json.loads(tool_call.function.arguments)
-                    result = tool_map[func_name](**args)
-                    tool_results.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": str(result)
-                    })
-                except Exception as e:
-                    tool_results.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": f"Error: {str(e)}"
-                    })
+        tool_results = []
+        tool_latencies = []
+        for tool_call, outcome in zip(known_calls, outcomes):
+            content = f"Error: {str(outcome.error)}" if outcome.error is not None else str(outcome.value)
+            tool_results.append({
+                "role": "tool",
+                "tool_call_id": tool_call.id,
+                "content": content
+            })
+            tool_latencies.append({
+                "tool_call_id": tool_call.id,
+                "name": tool_call.function.name,
+                "latency_ms": outcome.latency_ms,
+            })
 
         return {
             "tool_results": tool_results,
+            "tool_latencies": tool_latencies,
             "no_tool_calls": not bool(tool_calls)
         }
@@ -1,6 +1,7 @@
 """Workflow plugin: seed messages."""
 
 from ...base import NodeExecutor
+from ..message_log import MessageLog
 
 
 class CoreSeedMessages(NodeExecutor):
@@ -13,4 +14,4 @@ class CoreSeedMessages(NodeExecutor):
     def execute(self, inputs, runtime=None):
         """Seed messages from the prompt."""
         prompt = runtime.context["prompt"]
-        return {"messages": list(prompt["messages"])}
+        return {"messages": MessageLog(prompt["messages"])}
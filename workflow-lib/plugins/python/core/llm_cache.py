@@ -0,0 +1,271 @@
+"""On-disk cache of chat completion responses for core.ai_request.
+
+Development, CI and replayed runs often send byte-identical requests. With
+the cache enabled, a response is stored under a SHA-256 of the canonical
+JSON of the request (model, messages, tools and sampling options) and
+served from disk the next time the same request is made.
+
+Modes:
+    off         never read or write (default)
+    read-write  serve hits, store misses
+    read-only   serve hits, never write
+    record      always call the model and overwrite the stored response
+
+Entries are JSON files under the cache directory. Entries older than the
+TTL are ignored and removed; when the directory grows past its byte
+budget, the least recently used entries (by file mtime, refreshed on every
+hit) are evicted.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger("autometabuilder")
+
+MODE_OFF = "off"
+MODE_READ_WRITE = "read-write"
+MODE_READ_ONLY = "read-only"
+MODE_RECORD = "record"
+MODES = (MODE_OFF, MODE_READ_WRITE, MODE_READ_ONLY, MODE_RECORD)
+
+CACHE_VERSION = 1
+DEFAULT_DIRECTORY = ".llm_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL = 7 * 24 * 3600.0
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert SDK objects (pydantic models, namespaces) into plain JSON values."""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    to_list = getattr(value, "to_list", None)
+    if callable(to_list):
+        return [to_jsonable(item) for item in to_list()]
+    model_dump = getattr(value, "model_dump", None)
+    if callable(model_dump):
+        return to_jsonable(model_dump(exclude_none=True))
+    if hasattr(value, "__dict__"):
+        return {
+            key: to_jsonable(item) for key, item in vars(value).items()
+            if not key.startswith("_") and item is not None
+        }
+    raise TypeError(f"Cannot serialize {type(value).__name__} for the response cache")
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """Return the cache key of a chat completion request."""
+    payload = json.dumps(to_jsonable(request), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _namespace(value: Any) -> Any:
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_namespace(item) for item in value]
+    return value
+
+
+def restore_response(data: Dict[str, Any]) -> Any:
+    """Rebuild a cached completion with the attribute access callers expect.
+
+    The OpenAI SDK types are used when available, so cached responses are
+    indistinguishable from live ones (``choices[0].message.tool_calls``
+    included). Without the SDK, nested namespaces provide the same shape.
+    """
+    try:
+        from openai.types.chat import ChatCompletion
+    except ImportError:
+        ChatCompletion = None
+    if ChatCompletion is not None:
+        try:
+            return ChatCompletion.model_validate(data)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.debug("Cached response is not a ChatCompletion, using namespaces")
+    response = _namespace(data)
+    for choice in getattr(response, "choices", []):
+        message = getattr(choice, "message", None)
+        if message is not None:
+            for name in ("content", "tool_calls"):
+                if not hasattr(message, name):
+                    setattr(message, name, None)
+    return response
+
+
+class ResponseCache:
+    """Directory of cached responses with TTL and size-bounded LRU eviction."""
+
+    def __init__(
+        self,
+        directory: str | Path = DEFAULT_DIRECTORY,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_TTL
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index: Optional[Dict[str, Tuple[int, float]]] = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def path_for(self, key: str) -> Path:
+        """Return the file holding the entry for key."""
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for key, or None on a miss."""
+        path = self.path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return self._miss()
+        except (OSError, json.JSONDecodeError) as error:
+            logger.warning("Dropping unreadable cache entry %s: %s", path, error)
+            self._remove(key)
+            return self._miss()
+
+        if entry.get("version") != CACHE_VERSION or time.time() - entry.get("createdAt", 0) > self.ttl:
+            self._remove(key)
+            return self._miss()
+
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+            if self._index is not None and key in self._index:
+                self._index[key] = (self._index[key][0], now)
+        return entry["response"]
+
+    def put(self, key: str, response: Dict[str, Any], model: str | None = None) -> None:
+        """Store a serialized response under key and enforce the byte budget."""
+        payload = json.dumps({
+            "version": CACHE_VERSION,
+            "createdAt": time.time(),
+            "model": model,
+            "response": response,
+        })
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.debug("Response of %d bytes exceeds the cache budget, not caching", size)
+            return
+
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{key[:12]}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            index = self._load_index()
+            previous = index.pop(key, None)
+            if previous is not None:
+                self._size -= previous[0]
+            index[key] = (size, time.time())
+            self._size += size
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            for key in list(self._load_index()):
+                self._unlink(key)
+            self._index = {}
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the indexed size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": self._size,
+            }
+
+    def _miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _remove(self, key: str) -> None:
+        with self._lock:
+            self._unlink(key)
+            if self._index is not None:
+                entry = self._index.pop(key, None)
+                if entry is not None:
+                    self._size -= entry[0]
+
+    def _unlink(self, key: str) -> None:
+        try:
+            self.path_for(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _load_index(self) -> Dict[str, Tuple[int, float]]:
+        """Scan the directory once per process; caller holds the lock."""
+        if self._index is None:
+            self._index = {}
+            self._size = 0
+            for path in self.directory.glob("*/*.json"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                self._index[path.stem] = (stat.st_size, stat.st_mtime)
+                self._size += stat.st_size
+        return self._index
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until within budget; caller holds the lock."""
+        if self._size <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._size <= self.max_bytes:
+                break
+            self._unlink(key)
+            del self._index[key]
+            self._size -= size
+            self.evictions += 1
+
+
+_caches: Dict[Tuple[str, int, float], ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(
+    directory: str | Path = DEFAULT_DIRECTORY,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    ttl: float = DEFAULT_TTL
+) -> ResponseCache:
+    """Return the process-wide cache for a directory and its limits."""
+    key = (str(Path(directory).resolve()), int(max_bytes), float(ttl))
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = ResponseCache(directory, max_bytes, ttl)
+        return cache
@@ -0,0 +1,242 @@
+"""Keep the agent conversation within a token budget.
+
+Token counts are estimated locally (about four characters per token plus a
+small per-message overhead), which is fast and close enough to decide when
+to compact. Compaction never touches the leading system messages, the
+last user message or the last ``keep_last_turns`` turns. A turn starts at
+a user message, or at an assistant message that follows tool results, so
+each round of an agent loop (an assistant message and the results of the
+tools it called) is a turn even when one user instruction started them
+all. Older messages are reduced in two steps until the estimate fits:
+
+1. Tool results are folded into short summaries. The tool message itself
+   stays, because the assistant message that requested it refers to its
+   ``tool_call_id``.
+2. Whole turns are dropped, oldest first, and replaced by a single note
+   saying how much was left out. The last user message is kept in place.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from .message_log import MessageLog
+
+logger = logging.getLogger("autometabuilder")
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+DEFAULT_MAX_TOKENS = 64_000
+DEFAULT_KEEP_LAST_TURNS = 4
+DEFAULT_SUMMARY_CHARS = 200
+COMPACTED_MARKER = "[compacted"
+
+
+@dataclass
+class CompactionPolicy:
+    """Budget and limits applied when compacting a conversation."""
+    max_tokens: int = DEFAULT_MAX_TOKENS
+    keep_last_turns: int = DEFAULT_KEEP_LAST_TURNS
+    summary_chars: int = DEFAULT_SUMMARY_CHARS
+
+    @classmethod
+    def from_inputs(cls, inputs: Dict[str, Any], prefix: str = "") -> "CompactionPolicy":
+        """Read max_tokens, keep_last_turns and summary_chars from node inputs.
+
+        Missing or empty settings take their defaults; an explicit 0 is kept.
+        """
+        def setting(name: str, default: int) -> int:
+            value = inputs.get(f"{prefix}{name}")
+            return default if value is None or value == "" else int(value)
+
+        return cls(
+            max_tokens=setting("max_tokens", DEFAULT_MAX_TOKENS),
+            keep_last_turns=setting("keep_last_turns", DEFAULT_KEEP_LAST_TURNS),
+            summary_chars=setting("summary_chars", DEFAULT_SUMMARY_CHARS),
+        )
+
+
+@dataclass
+class CompactionReport:
+    """What a compaction run changed."""
+    tokens_before: int
+    tokens_after: int
+    messages_before: int
+    messages_after: int
+    summarized_tool_results: int = 0
+    dropped_turns: int = 0
+    dropped_messages: int = 0
+
+    @property
+    def compacted(self) -> bool:
+        """True if any message was summarized or dropped."""
+        return bool(self.summarized_tool_results or self.dropped_turns)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            "compacted": self.compacted,
+            "tokensBefore": self.tokens_before,
+            "tokensAfter": self.tokens_after,
+            "messagesBefore": self.messages_before,
+            "messagesAfter": self.messages_after,
+            "summarizedToolResults": self.summarized_tool_results,
+            "droppedTurns": self.dropped_turns,
+            "droppedMessages": self.dropped_messages,
+        }
+
+
+def _field(message: Any, name: str) -> Any:
+    """Read a message field from a dict or an SDK message object."""
+    if isinstance(message, dict):
+        return message.get(name)
+    return getattr(message, name, None)
+
+
+def estimate_tokens(message: Any) -> int:
+    """Estimate the tokens a message costs in a chat request."""
+    chars = 0
+    content = _field(message, "content")
+    if isinstance(content, str):
+        chars += len(content)
+    elif isinstance(content, list):
+        for part in content:
+            text = _field(part, "text")
+            chars += len(text) if isinstance(text, str) else 0
+    for tool_call in _field(message, "tool_calls") or []:
+        function = _field(tool_call, "function")
+        chars += len(_field(function, "name") or "") + len(_field(function, "arguments") or "")
+    return chars // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+def _summarize_tool_result(message: Any, summary_chars: int) -> Dict[str, Any]:
+    """Replace a tool result by its beginning and original length."""
+    content = str(_field(message, "content") or "")
+    summary = {
+        "role": "tool",
+        "tool_call_id": _field(message, "tool_call_id"),
+        "content": f"{COMPACTED_MARKER} tool result of {len(content)} chars] {content[:summary_chars]}",
+    }
+    name = _field(message, "name")
+    if name:
+        summary["name"] = name
+    return summary
+
+
+def _is_note(message: Any) -> bool:
+    """Return True for the system note added when turns are dropped."""
+    content = _field(message, "content")
+    return _field(message, "role") == "system" and isinstance(content, str) and content.startswith(COMPACTED_MARKER)
+
+
+def _note(messages: int, turns: int) -> Dict[str, Any]:
+    """Build the system note standing in for dropped turns."""
+    return {
+        "role": "system",
+        "content": f"{COMPACTED_MARKER}: earlier messages were removed to fit the context "
+                   f"budget, most recently {messages} messages from {turns} turns]",
+    }
+
+
+def _split_turns(messages: List[Any]) -> Tuple[List[Any], List[List[Any]]]:
+    """Split into leading system messages and turns.
+
+    A turn starts at a user message or at an assistant message following
+    a tool result, so every tool round of an agent loop is a turn.
+    """
+    start = 0
+    while start < len(messages) and _field(messages[start], "role") == "system":
+        start += 1
+    turns: List[List[Any]] = []
+    previous_role = None
+    for message in messages[start:]:
+        role = _field(message, "role")
+        if not turns or role == "user" or (role == "assistant" and previous_role == "tool"):
+            turns.append([])
+        turns[-1].append(message)
+        previous_role = role
+    return messages[:start], turns
+
+
+def compact_messages(messages: Any, policy: CompactionPolicy) -> Tuple[MessageLog, CompactionReport]:
+    """Return the conversation reduced to fit policy, and what was done.
+
+    When the estimate already fits, the original log is returned unchanged.
+    """
+    log = MessageLog.of(messages)
+    total = sum(estimate_tokens(message) for message in log)
+    report = CompactionReport(total, total, len(log), len(log))
+    if total <= policy.max_tokens:
+        return log, report
+
+    items = log.to_list()
+    prefix, turns = _split_turns(items)
+    keep = max(policy.keep_last_turns, 0)
+    old_turns, recent_turns = (turns[:-keep], turns[-keep:]) if keep else (turns, [])
+
+    # Step 1: fold old tool results into summaries, oldest first
+    for turn in old_turns:
+        for position, message in enumerate(turn):
+            if total <= policy.max_tokens:
+                break
+            content = _field(message, "content")
+            if _field(message, "role") != "tool" or not isinstance(content, str):
+                continue
+            if content.startswith(COMPACTED_MARKER) or len(content) <= policy.summary_chars:
+                continue
+            summary = _summarize_tool_result(message, policy.summary_chars)
+            total += estimate_tokens(summary) - estimate_tokens(message)
+            turn[position] = summary
+            report.summarized_tool_results += 1
+
+    # Step 2: drop whole old turns, oldest first, leaving room for the note;
+    # the instruction the remaining rounds answer is kept
+    last_user = next((message for message in reversed(items) if _field(message, "role") == "user"), None)
+    previous_notes = [message for message in prefix if _is_note(message)]
+    note_cost = estimate_tokens(_note(len(items), len(turns))) - sum(map(estimate_tokens, previous_notes))
+    dropped = 0
+    pinned: List[Any] = []
+    if total > policy.max_tokens:
+        while dropped < len(old_turns) and total + note_cost > policy.max_tokens:
+            for message in old_turns[dropped]:
+                if message is last_user:
+                    pinned.append(message)
+                    continue
+                total -= estimate_tokens(message)
+                report.dropped_messages += 1
+            dropped += 1
+    report.dropped_turns = dropped
+
+    compacted = list(prefix)
+    if dropped:
+        # One note covers every compaction so far; replace the previous one
+        compacted = [message for message in prefix if not _is_note(message)]
+        note = _note(report.dropped_messages, dropped)
+        compacted.append(note)
+        total += estimate_tokens(note) - sum(map(estimate_tokens, previous_notes))
+    compacted.extend(pinned)
+    for turn in old_turns[dropped:] + recent_turns:
+        compacted.extend(turn)
+
+    if not report.compacted:
+        logger.warning(
+            "Conversation estimated at %d tokens exceeds the budget of %d, "
+            "but only the last %d turns remain", total, policy.max_tokens, keep
+        )
+        return log, report
+
+    report.tokens_after = total
+    report.messages_after = len(compacted)
+    if total > policy.max_tokens:
+        logger.warning(
+            "Conversation still estimated at %d tokens after compaction (budget %d); "
+            "the last %d turns are kept verbatim",
+            total, policy.max_tokens, keep
+        )
+    logger.info(
+        "Compacted conversation from %d to %d estimated tokens (%d to %d messages): "
+        "%d tool results summarized, %d turns dropped",
+        report.tokens_before, report.tokens_after, report.messages_before,
+        report.messages_after, report.summarized_tool_results, report.dropped_turns
+    )
+    return MessageLog(compacted), report
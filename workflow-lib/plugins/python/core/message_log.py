@@ -0,0 +1,89 @@
+"""Append-only conversation log shared between the core AI plugins.
+
+Every core plugin used to start with ``list(inputs["messages"])``, so a
+conversation of n messages was copied once per step. A MessageLog is a
+view of the first ``len`` entries of a backing list. Appending to the
+newest view extends the backing list in place and returns a longer view,
+leaving earlier views unchanged. Only appending to an older view, which
+forks the conversation, copies its prefix.
+
+Convert to a plain list with ``to_list()`` where a real list is required,
+such as the OpenAI client.
+"""
+
+import threading
+from collections.abc import Sequence
+from typing import Any, Iterable, List
+
+
+class MessageLog(Sequence):
+    """Immutable view of a conversation; append and extend return new logs."""
+
+    __slots__ = ("_items", "_length", "_lock")
+
+    def __init__(self, messages: Iterable[Any] = ()):
+        self._items: List[Any] = list(messages)
+        self._length = len(self._items)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def of(cls, messages: Any) -> "MessageLog":
+        """Return messages as a MessageLog, copying only plain sequences."""
+        if isinstance(messages, MessageLog):
+            return messages
+        return cls(messages or ())
+
+    @classmethod
+    def _view(cls, items: List[Any], length: int, lock: threading.Lock) -> "MessageLog":
+        log = cls.__new__(cls)
+        log._items = items
+        log._length = length
+        log._lock = lock
+        return log
+
+    def append(self, message: Any) -> "MessageLog":
+        """Return a new log ending with message."""
+        return self.extend((message,))
+
+    def extend(self, messages: Iterable[Any]) -> "MessageLog":
+        """Return a new log ending with messages."""
+        messages = list(messages)
+        if not messages:
+            return self
+        with self._lock:
+            if len(self._items) == self._length:
+                self._items.extend(messages)
+                return self._view(self._items, len(self._items), self._lock)
+        # Someone already appended to this prefix: fork the conversation
+        return MessageLog(self._items[:self._length] + messages)
+
+    def to_list(self) -> List[Any]:
+        """Return the messages as a new plain list."""
+        return self._items[:self._length]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._items[:self._length][index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("message index out of range")
+        return self._items[index]
+
+    def __iter__(self):
+        items = self._items
+        for index in range(self._length):
+            yield items[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (MessageLog, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"MessageLog({self.to_list()!r})"
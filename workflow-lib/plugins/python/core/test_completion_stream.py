@@ -0,0 +1,108 @@
+"""Tests for assembling streamed chat completions."""
+
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from .completion_stream import StreamAssembler
+
+
+def text_chunk(text, finish_reason=None):
+    """Build a stream chunk carrying a text delta."""
+    delta = SimpleNamespace(content=text, tool_calls=None, role=None)
+    return SimpleNamespace(
+        id="chatcmpl-1", model="fake-model",
+        choices=[SimpleNamespace(index=0, delta=delta, finish_reason=finish_reason)],
+    )
+
+
+def tool_chunk(index, arguments, call_id=None, name=None, finish_reason=None):
+    """Build a stream chunk carrying one tool call fragment."""
+    fragment = SimpleNamespace(
+        index=index, id=call_id, type="function" if call_id else None,
+        function=SimpleNamespace(name=name, arguments=arguments),
+    )
+    delta = SimpleNamespace(content=None, tool_calls=[fragment], role=None)
+    return SimpleNamespace(
+        id="chatcmpl-1", model="fake-model",
+        choices=[SimpleNamespace(index=0, delta=delta, finish_reason=finish_reason)],
+    )
+
+
+def tool_call_stream():
+    """Fragments of two tool calls, interleaved, with id and name only in the first of each."""
+    return [
+        tool_chunk(0, "", call_id="call-a", name="read_file"),
+        tool_chunk(1, '{"pa', call_id="call-b", name="list_dir"),
+        tool_chunk(0, '{"path": '),
+        tool_chunk(1, 'th": "src"}'),
+        tool_chunk(0, '"a.py"}', finish_reason="tool_calls"),
+    ]
+
+
+class TestStreamAssembler(unittest.TestCase):
+    """Test cases for StreamAssembler."""
+
+    def assemble(self, chunks, **kwargs):
+        assembler = StreamAssembler(**kwargs)
+        for chunk in chunks:
+            assembler.feed(chunk)
+        return assembler, assembler.finish()
+
+    def test_text_deltas_joined(self):
+        """Test that text deltas form the message content."""
+        _, completion = self.assemble([text_chunk("Hel"), text_chunk("lo"), text_chunk(None, "stop")])
+        self.assertEqual(completion["id"], "chatcmpl-1")
+        self.assertEqual(completion["model"], "fake-model")
+        choice = completion["choices"][0]
+        self.assertEqual(choice["finish_reason"], "stop")
+        self.assertEqual(choice["message"], {"role": "assistant", "content": "Hello"})
+
+    def test_tool_call_fragments_merged_by_index(self):
+        """Test that fragments sharing an index build one tool call."""
+        _, completion = self.assemble(tool_call_stream())
+        message = completion["choices"][0]["message"]
+        self.assertIsNone(message["content"])
+        self.assertEqual(message["tool_calls"], [
+            {"id": "call-a", "type": "function", "function": {"name": "read_file", "arguments": '{"path": "a.py"}'}},
+            {"id": "call-b", "type": "function", "function": {"name": "list_dir", "arguments": '{"path": "src"}'}},
+        ])
+        self.assertEqual(completion["choices"][0]["finish_reason"], "tool_calls")
+
+    def test_timing(self):
+        """Test that ttft_ms and total_ms are measured from the request start."""
+        started = time.perf_counter() - 0.05
+        assembler, _ = self.assemble([text_chunk("a"), text_chunk("b")], started=started)
+        timing = assembler.timing()
+        self.assertGreaterEqual(timing["ttft_ms"], 50)
+        self.assertGreaterEqual(timing["total_ms"], timing["ttft_ms"])
+
+    def test_no_tokens_no_ttft(self):
+        """Test that a stream without content or tool calls has no first token time."""
+        assembler, _ = self.assemble([text_chunk(None, "stop")])
+        self.assertIsNone(assembler.timing()["ttft_ms"])
+
+    def test_callback_events(self):
+        """Test that a callback receives every delta and a final done event instead of log lines."""
+        events = []
+        logger = mock.Mock()
+        self.assemble([text_chunk("Hi\n"), *tool_call_stream()[:2]], on_event=events.append, logger=logger)
+        self.assertEqual([event["type"] for event in events], ["content", "tool_call", "tool_call", "done"])
+        self.assertEqual(events[0], {"type": "content", "delta": "Hi\n"})
+        self.assertEqual(events[2], {
+            "type": "tool_call", "index": 1, "id": "call-b", "name": "list_dir", "arguments": '{"pa',
+        })
+        self.assertEqual(set(events[3]), {"type", "ttft_ms", "total_ms"})
+        logger.info.assert_not_called()
+
+    def test_logged_line_by_line(self):
+        """Test that without a callback each completed line is logged once."""
+        logger = mock.Mock()
+        assembler, _ = self.assemble([text_chunk("Hel"), text_chunk("lo\nwor"), text_chunk("ld\n!")], logger=logger)
+        self.assertEqual([call.args[0] for call in logger.info.call_args_list], ["Hello", "world", "!"])
+        self.assertTrue(assembler.content_published)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""Tests for the on-disk response cache."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from . import llm_cache
+from .core_run_tool_calls.core_run_tool_calls import CoreRunToolCalls
+from .llm_cache import ResponseCache, request_key, restore_response
+
+
+def _completion(content=None, tool_calls=None):
+    message = {"role": "assistant"}
+    if content is not None:
+        message["content"] = content
+    if tool_calls is not None:
+        message["tool_calls"] = tool_calls
+    return {"id": "chatcmpl-1", "model": "fake-model", "choices": [{"index": 0, "message": message}]}
+
+
+TOOL_CALL = {"id": "call-a", "type": "function", "function": {"name": "echo", "arguments": '{"text": "hi"}'}}
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for TTL expiry and the byte budget."""
+
+    def setUp(self):
+        """Set up a private cache directory."""
+        self.directory = tempfile.mkdtemp(prefix="llm-cache-test-")
+
+    def tearDown(self):
+        """Remove the cache directory."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def entry_size(self, response):
+        cache = ResponseCache(self.directory)
+        with mock.patch.object(llm_cache.time, "time", return_value=1000.0):
+            cache.put("k0", response)
+        size = cache.stats()["bytes"]
+        cache.clear()
+        return size
+
+    def test_round_trip(self):
+        """Test that a stored response is returned and counted as a hit."""
+        cache = ResponseCache(self.directory)
+        self.assertIsNone(cache.get("k1"))
+        cache.put("k1", _completion("hello"), "fake-model")
+        self.assertEqual(cache.get("k1"), _completion("hello"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_expired_entry_removed(self):
+        """Test that an entry older than the TTL is a miss and is deleted."""
+        cache = ResponseCache(self.directory, ttl=60)
+        with mock.patch.object(llm_cache.time, "time", return_value=1000.0):
+            cache.put("k1", _completion("old"))
+        with mock.patch.object(llm_cache.time, "time", return_value=1059.0):
+            self.assertIsNotNone(cache.get("k1"))
+        with mock.patch.object(llm_cache.time, "time", return_value=1061.0):
+            self.assertIsNone(cache.get("k1"))
+        self.assertFalse(cache.path_for("k1").exists())
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+    def test_least_recently_used_evicted(self):
+        """Test that going over the budget evicts the entry read longest ago."""
+        size = self.entry_size(_completion("x"))
+        cache = ResponseCache(self.directory, max_bytes=size * 2)
+        clock = iter(range(1000, 2000, 10))
+        with mock.patch.object(llm_cache.time, "time", side_effect=lambda: float(next(clock))):
+            cache.put("k1", _completion("x"))
+            cache.put("k2", _completion("x"))
+            # Reading k1 makes k2 the least recently used entry
+            self.assertIsNotNone(cache.get("k1"))
+            cache.put("k3", _completion("x"))
+            self.assertIsNone(cache.get("k2"))
+            self.assertIsNotNone(cache.get("k1"))
+            self.assertIsNotNone(cache.get("k3"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertLessEqual(cache.stats()["bytes"], size * 2)
+
+    def test_oversized_response_not_stored(self):
+        """Test that a response larger than the whole budget is not written."""
+        cache = ResponseCache(self.directory, max_bytes=10)
+        cache.put("k1", _completion("too large"))
+        self.assertFalse(cache.path_for("k1").exists())
+
+    def test_budget_covers_existing_files(self):
+        """Test that entries written by an earlier process count toward the budget."""
+        size = self.entry_size(_completion("x"))
+        cache = ResponseCache(self.directory, max_bytes=size)
+        with mock.patch.object(llm_cache.time, "time", return_value=1000.0):
+            ResponseCache(self.directory).put("k1", _completion("x"))
+            os.utime(cache.path_for("k1"), (900.0, 900.0))
+            cache.put("k2", _completion("x"))
+        self.assertFalse(cache.path_for("k1").exists())
+        self.assertTrue(cache.path_for("k2").exists())
+
+    def test_unreadable_entry_dropped(self):
+        """Test that a corrupt entry is a miss and is deleted."""
+        cache = ResponseCache(self.directory)
+        cache.put("k1", _completion("x"))
+        cache.path_for("k1").write_text("{not json", encoding="utf-8")
+        with self.assertLogs("autometabuilder", "WARNING"):
+            self.assertIsNone(cache.get("k1"))
+        self.assertFalse(cache.path_for("k1").exists())
+
+
+class TestRequestKey(unittest.TestCase):
+    """Test cases for cache keys."""
+
+    def test_key_ignores_dict_order_and_sdk_objects(self):
+        """Test that equal requests get one key whatever their key order or object type."""
+        message = SimpleNamespace(role="user", content="hi", name=None)
+        self.assertEqual(
+            request_key({"model": "m", "messages": [{"role": "user", "content": "hi"}]}),
+            request_key({"messages": [message], "model": "m"}),
+        )
+        self.assertNotEqual(request_key({"model": "m"}), request_key({"model": "n"}))
+
+
+class TestRestoreResponse(unittest.TestCase):
+    """Test cases for rebuilding cached responses."""
+
+    def test_tool_calls_attribute_access(self):
+        """Test that a restored response drives core.run_tool_calls like a live one."""
+        data = json.loads(json.dumps(_completion(tool_calls=[TOOL_CALL])))
+        message = restore_response(data).choices[0].message
+        self.assertIsNone(message.content)
+        self.assertEqual(message.tool_calls[0].function.name, "echo")
+
+        runtime = SimpleNamespace(context={"tool_map": {"echo": lambda text: text.upper()}})
+        result = CoreRunToolCalls().execute({"response": message}, runtime)
+        self.assertEqual(result["tool_results"], [{"role": "tool", "tool_call_id": "call-a", "content": "HI"}])
+        self.assertFalse(result["no_tool_calls"])
+
+    def test_missing_fields_default_to_none(self):
+        """Test that a text response has tool_calls set to None rather than missing."""
+        message = restore_response(_completion("hello")).choices[0].message
+        self.assertEqual(message.content, "hello")
+        self.assertIsNone(message.tool_calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Tests for conversation compaction."""
+
+import unittest
+
+from .message_compaction import (
+    DEFAULT_KEEP_LAST_TURNS, DEFAULT_MAX_TOKENS, DEFAULT_SUMMARY_CHARS, CompactionPolicy, compact_messages,
+)
+
+
+class TestCompactionPolicy(unittest.TestCase):
+    """Test cases for reading a policy from node inputs."""
+
+    def test_defaults(self):
+        """Test that missing and empty settings fall back to the defaults."""
+        for inputs in ({}, {"max_tokens": None, "keep_last_turns": "", "summary_chars": None}):
+            self.assertEqual(
+                CompactionPolicy.from_inputs(inputs),
+                CompactionPolicy(DEFAULT_MAX_TOKENS, DEFAULT_KEEP_LAST_TURNS, DEFAULT_SUMMARY_CHARS),
+            )
+
+    def test_explicit_zero_kept(self):
+        """Test that 0 is used as given rather than replaced by a default."""
+        policy = CompactionPolicy.from_inputs({"max_tokens": 0, "keep_last_turns": "0", "summary_chars": 0})
+        self.assertEqual(policy, CompactionPolicy(0, 0, 0))
+
+    def test_prefix(self):
+        """Test that prefixed settings are read."""
+        policy = CompactionPolicy.from_inputs({"compact_keep_last_turns": 0, "keep_last_turns": 9}, "compact_")
+        self.assertEqual(policy.keep_last_turns, 0)
+
+    def test_invalid_value(self):
+        """Test that a non-numeric setting raises ValueError."""
+        with self.assertRaises(ValueError):
+            CompactionPolicy.from_inputs({"max_tokens": "lots"})
+
+
+class TestCompactMessages(unittest.TestCase):
+    """Test cases for compacting with explicit zero limits."""
+
+    def test_keep_no_turns(self):
+        """Test that keep_last_turns=0 drops every turn but keeps the last user message."""
+        messages = [{"role": "system", "content": "rules"}]
+        for turn in range(3):
+            messages.append({"role": "user", "content": f"question {turn} " * 20})
+            messages.append({"role": "assistant", "content": f"answer {turn} " * 20})
+        compacted, report = compact_messages(messages, CompactionPolicy(max_tokens=50, keep_last_turns=0))
+        self.assertEqual(report.dropped_turns, 3)
+        self.assertEqual(report.dropped_messages, 5)
+        self.assertEqual([message["role"] for message in compacted.to_list()], ["system", "system", "user"])
+        self.assertEqual(compacted.to_list()[-1], messages[-2])
+
+
+def _agent_loop(rounds, result_chars=20_000):
+    """Build one user instruction followed by tool rounds, like the iterative_loop example."""
+    messages = [{"role": "system", "content": "rules"}, {"role": "user", "content": "fix the bug"}]
+    for number in range(rounds):
+        call_id = f"call-{number}"
+        messages.append({
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"id": call_id, "type": "function",
+                            "function": {"name": "read_file", "arguments": f'{{"path": "f{number}.py"}}'}}],
+        })
+        messages.append({"role": "tool", "tool_call_id": call_id, "name": "read_file",
+                         "content": f"file {number} " + "x" * result_chars})
+    messages.append({"role": "assistant", "content": "done"})
+    return messages
+
+
+class TestAgentLoopCompaction(unittest.TestCase):
+    """Test cases for one user message followed by many tool rounds."""
+
+    def test_tool_rounds_are_turns(self):
+        """Test that old rounds are summarized although only one user message exists."""
+        messages = _agent_loop(30)
+        compacted, report = compact_messages(messages, CompactionPolicy(max_tokens=8000, keep_last_turns=2))
+        self.assertTrue(report.compacted)
+        self.assertGreaterEqual(report.summarized_tool_results, 28)
+        self.assertEqual(report.dropped_turns, 0)
+        self.assertLessEqual(report.tokens_after, 8000)
+        result = compacted.to_list()
+        self.assertEqual(result[1], messages[1])
+        # The last two turns, the final tool round and the answer, are kept verbatim
+        self.assertEqual(result[-3:], messages[-3:])
+        self.assertTrue(result[-4]["content"].startswith("[compacted tool result"))
+
+    def test_dropped_rounds_keep_the_instruction(self):
+        """Test that dropping rounds keeps the user message and pairs of calls and results."""
+        messages = _agent_loop(30)
+        compacted, report = compact_messages(
+            messages, CompactionPolicy(max_tokens=600, keep_last_turns=1, summary_chars=0)
+        )
+        self.assertGreater(report.dropped_turns, 0)
+        result = compacted.to_list()
+        self.assertEqual([message["role"] for message in result[:3]], ["system", "system", "user"])
+        self.assertEqual(result[2], messages[1])
+        self.assertEqual(result[3]["role"], "assistant")
+        call_ids = {call["id"] for message in result for call in message.get("tool_calls") or []}
+        self.assertEqual(call_ids, {message["tool_call_id"] for message in result if message["role"] == "tool"})
+
+
+if __name__ == "__main__":
+    unittest.main()
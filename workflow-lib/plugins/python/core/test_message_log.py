@@ -0,0 +1,97 @@
+"""Tests for the shared conversation log."""
+
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from ...checkpoint import Checkpoint, CheckpointStore, ExecutionCheckpointer
+from .message_log import MessageLog
+
+
+def _message(number):
+    return {"role": "user", "content": f"message {number}"}
+
+
+class TestMessageLog(unittest.TestCase):
+    """Test cases for appending to and forking a MessageLog."""
+
+    def test_earlier_views_unchanged(self):
+        """Test that appending returns a longer log and leaves every earlier log as it was."""
+        first = MessageLog([_message(0)])
+        second = first.append(_message(1))
+        third = second.extend([_message(2), _message(3)])
+        self.assertEqual(first, [_message(0)])
+        self.assertEqual(second, [_message(0), _message(1)])
+        self.assertEqual(len(third), 4)
+        self.assertEqual(list(second), second.to_list())
+        self.assertEqual(second[-1], _message(1))
+        self.assertEqual(third[1:3], [_message(1), _message(2)])
+        with self.assertRaises(IndexError):
+            second[2]  # pylint: disable=pointless-statement
+
+    def test_append_to_newest_shares_backing_list(self):
+        """Test that appending to the newest log extends one list in place without copying."""
+        log = MessageLog([_message(0)])
+        newer = log.append(_message(1)).append(_message(2))
+        # pylint: disable=protected-access
+        self.assertIs(newer._items, log._items)
+        self.assertEqual(len(log._items), 3)
+
+    def test_append_to_older_view_forks(self):
+        """Test that appending to an older log copies its prefix and leaves the other branch intact."""
+        base = MessageLog([_message(0)])
+        left = base.append(_message(1))
+        right = base.append(_message(2))
+        self.assertEqual(left, [_message(0), _message(1)])
+        self.assertEqual(right, [_message(0), _message(2)])
+        # pylint: disable=protected-access
+        self.assertIsNot(right._items, left._items)
+        self.assertEqual(left.append(_message(3)), [_message(0), _message(1), _message(3)])
+
+    def test_of(self):
+        """Test that of() keeps an existing log and copies a plain list."""
+        log = MessageLog([_message(0)])
+        self.assertIs(MessageLog.of(log), log)
+        messages = [_message(0)]
+        copied = MessageLog.of(messages)
+        messages.append(_message(1))
+        self.assertEqual(copied, [_message(0)])
+        self.assertEqual(MessageLog.of(None), [])
+
+    def test_to_list_is_a_copy(self):
+        """Test that changing the list from to_list() does not change the log."""
+        log = MessageLog([_message(0)]).append(_message(1))
+        messages = log.to_list()
+        messages.append(_message(2))
+        self.assertEqual(len(log), 2)
+        self.assertEqual(len(log.append(_message(3))), 3)
+
+
+class TestMessageLogCheckpoint(unittest.TestCase):
+    """Test cases for persisting a MessageLog in a checkpoint."""
+
+    def setUp(self):
+        """Set up a checkpoint directory."""
+        self.directory = tempfile.mkdtemp(prefix="message-log-test-")
+
+    def tearDown(self):
+        """Remove the checkpoint directory."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_log_saved_as_list(self):
+        """Test that a log in the store is written as a list and each append is journaled."""
+        store = CheckpointStore(self.directory)
+        runtime = SimpleNamespace(store={"messages": MessageLog([_message(0)])}, context={})
+        checkpointer = ExecutionCheckpointer(store, runtime, Checkpoint("run", "hash"))
+        checkpointer.start()
+        runtime.store["messages"] = runtime.store["messages"].append(_message(1))
+        checkpointer.node_completed("append", ["messages"])
+
+        restored = store.load("run").store["messages"]
+        self.assertEqual(restored, [_message(0), _message(1)])
+        self.assertEqual(MessageLog.of(restored).append(_message(2)), [_message(n) for n in range(3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Tests for running the tool calls of one model response."""
+
+import threading
+import time
+import unittest
+
+from .tool_execution import DEFAULT_MAX_CONCURRENCY, resolve_max_concurrency, run_tool_calls
+
+
+class Timeline:
+    """Thread-safe log of tool calls starting and finishing."""
+
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def call(self, name, delay=0.05, result=None):
+        def run():
+            with self.lock:
+                self.events.append(("start", name))
+            time.sleep(delay)
+            with self.lock:
+                self.events.append(("end", name))
+            return result if result is not None else name
+        return run
+
+    def position(self, event, name):
+        return self.events.index((event, name))
+
+
+class TestRunToolCalls(unittest.TestCase):
+    """Test cases for ordering and concurrency of tool calls."""
+
+    def test_read_only_calls_overlap(self):
+        """Test that read-only calls run at the same time."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def read(name):
+            def run():
+                barrier.wait()
+                return name
+            return run
+
+        outcomes = run_tool_calls([(read(name), False) for name in "abc"], max_concurrency=3)
+        self.assertEqual([outcome.value for outcome in outcomes], ["a", "b", "c"])
+        self.assertTrue(all(outcome.error is None for outcome in outcomes))
+
+    def test_modifying_call_runs_alone(self):
+        """Test that a modifying call waits for earlier calls and blocks later ones."""
+        timeline = Timeline()
+        calls = [
+            (timeline.call("read1"), False),
+            (timeline.call("read2"), False),
+            (timeline.call("write", delay=0.1), True),
+            (timeline.call("read3"), False),
+            (timeline.call("read4"), False),
+        ]
+        outcomes = run_tool_calls(calls, max_concurrency=4)
+        self.assertEqual([outcome.value for outcome in outcomes], ["read1", "read2", "write", "read3", "read4"])
+        write_start = timeline.position("start", "write")
+        write_end = timeline.position("end", "write")
+        self.assertEqual(write_end, write_start + 1)
+        for name in ("read1", "read2"):
+            self.assertLess(timeline.position("end", name), write_start)
+        for name in ("read3", "read4"):
+            self.assertGreater(timeline.position("start", name), write_end)
+
+    def test_results_in_call_order(self):
+        """Test that outcomes follow the calls, not the order they finish in."""
+        timeline = Timeline()
+        delays = [0.15, 0.0, 0.1, 0.05]
+        calls = [(timeline.call(str(index), delay), False) for index, delay in enumerate(delays)]
+        outcomes = run_tool_calls(calls, max_concurrency=4)
+        self.assertEqual([outcome.value for outcome in outcomes], ["0", "1", "2", "3"])
+        self.assertEqual(timeline.events[-1], ("end", "0"))
+
+    def test_errors_and_latency_captured(self):
+        """Test that an exception becomes that call's outcome without stopping the others."""
+        def fail():
+            raise ValueError("bad input")
+
+        outcomes = run_tool_calls([(fail, False), (lambda: 1, False)], max_concurrency=2)
+        self.assertIsInstance(outcomes[0].error, ValueError)
+        self.assertEqual(outcomes[1].value, 1)
+        self.assertTrue(all(outcome.latency_ms >= 0 for outcome in outcomes))
+
+    def test_serial_when_concurrency_is_one(self):
+        """Test that max_concurrency=1 runs calls one after another."""
+        timeline = Timeline()
+        run_tool_calls([(timeline.call(name, 0.01), False) for name in "abc"], max_concurrency=1)
+        self.assertEqual(timeline.events, [(event, name) for name in "abc" for event in ("start", "end")])
+
+
+class TestResolveMaxConcurrency(unittest.TestCase):
+    """Test cases for reading the pool size."""
+
+    def test_sources(self):
+        """Test that the override wins over policies and bad values fall back."""
+        self.assertEqual(resolve_max_concurrency({}), DEFAULT_MAX_CONCURRENCY)
+        self.assertEqual(resolve_max_concurrency({"max_concurrency": 2}), 2)
+        self.assertEqual(resolve_max_concurrency({"max_concurrency": 2}, "6"), 6)
+        self.assertEqual(resolve_max_concurrency({"max_concurrency": 0}), 1)
+        self.assertEqual(resolve_max_concurrency({"max_concurrency": "many"}), DEFAULT_MAX_CONCURRENCY)
+
+
+if __name__ == "__main__":
+    unittest.main()
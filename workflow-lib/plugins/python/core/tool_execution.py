@@ -0,0 +1,72 @@
+"""Run the tool calls of one model response on a bounded thread pool.
+
+Read-only tools run concurrently. A tool listed in
+``tool_policies["modifying_tools"]`` waits for every earlier call, runs on
+its own, and finishes before any later call starts. Modifying tools
+therefore keep their original order, and reads see the writes requested
+before them. Outcomes are returned in the order of the calls.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+@dataclass
+class ToolOutcome:
+    """Result or exception of one tool call and how long it took."""
+    value: Any = None
+    error: Optional[BaseException] = None
+    latency_ms: float = 0.0
+
+
+def _timed(call: Callable[[], Any]) -> ToolOutcome:
+    """Run call and capture its value or exception with its latency."""
+    started = time.perf_counter()
+    try:
+        value = call()
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        return ToolOutcome(error=error, latency_ms=(time.perf_counter() - started) * 1000)
+    return ToolOutcome(value=value, latency_ms=(time.perf_counter() - started) * 1000)
+
+
+def resolve_max_concurrency(policies: dict, override: Any = None) -> int:
+    """Read the tool pool size from an override or tool policies."""
+    value = override if override is not None else (policies or {}).get("max_concurrency")
+    try:
+        return max(1, int(value)) if value is not None else DEFAULT_MAX_CONCURRENCY
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_CONCURRENCY
+
+
+def run_tool_calls(
+    calls: Iterable[Tuple[Callable[[], Any], bool]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+) -> List[ToolOutcome]:
+    """Run (call, modifying) pairs and return one ToolOutcome per call, in order."""
+    calls = list(calls)
+    outcomes: List[Optional[ToolOutcome]] = [None] * len(calls)
+    if max_concurrency <= 1 or sum(1 for _, modifying in calls if not modifying) <= 1:
+        for index, (call, _) in enumerate(calls):
+            outcomes[index] = _timed(call)
+        return outcomes
+
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="tool-call") as pool:
+        batch: List[Tuple[int, Any]] = []
+
+        def drain():
+            for position, future in batch:
+                outcomes[position] = future.result()
+            batch.clear()
+
+        for index, (call, modifying) in enumerate(calls):
+            if modifying:
+                drain()
+                outcomes[index] = _timed(call)
+            else:
+                batch.append((index, pool.submit(_timed, call)))
+        drain()
+    return outcomes
@@ -0,0 +1,235 @@
+"""
+Precompiled index of plugin package.json manifests.
+
+Walking the plugins tree and parsing every package.json costs a noticeable
+share of cold start. The index stores the result of that walk in a single
+JSON file (node type -> module path, class, category, capabilities, label
+and directory, plus each package.json for backend.load_plugins) and is
+rebuilt automatically when a recorded manifest or
+plugin directory changes. Only the bundled plugins directory gets an index
+file, next to it or at WORKFLOW_PLUGIN_INDEX; other directories are indexed
+in memory so nothing is written into them.
+
+Regenerate it explicitly with:
+
+    python -m autometabuilder.workflow.plugins.manifest_index [--plugins-dir DIR] [--output FILE] [--check]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("autometabuilder")
+
+INDEX_VERSION = 3
+INDEX_FILE_MODE = 0o644
+INDEX_FILENAME = "plugin_index.json"
+INDEX_ENV_VAR = "WORKFLOW_PLUGIN_INDEX"
+MODULE_PREFIX = ["autometabuilder", "workflow", "plugins"]
+
+_loaded: Dict[str, Dict[str, Any]] = {}
+_lock = threading.Lock()
+
+
+def default_plugins_dir() -> Path:
+    """Return the directory this module lives in (the plugins root)."""
+    return Path(__file__).parent
+
+
+def default_index_path(plugins_dir: Path) -> Path:
+    """Return the index file location, honouring WORKFLOW_PLUGIN_INDEX."""
+    override = os.environ.get(INDEX_ENV_VAR)
+    return Path(override) if override else plugins_dir / INDEX_FILENAME
+
+
+def build_manifest_index(plugins_dir: Path) -> Dict[str, Any]:
+    """Walk plugins_dir and build a fresh index from every package.json."""
+    plugins_dir = Path(plugins_dir)
+    plugins: Dict[str, Dict[str, Any]] = {}
+    packages: Dict[str, Dict[str, Any]] = {}
+    manifests: Dict[str, int] = {}
+    directories: Dict[str, int] = {}
+
+    for package_json_path in sorted(plugins_dir.rglob("package.json")):
+        rel_manifest = package_json_path.relative_to(plugins_dir)
+        manifests[rel_manifest.as_posix()] = _mtime(package_json_path)
+
+        # Record the directories above each plugin so added plugins are noticed
+        for parent in rel_manifest.parent.parents:
+            if parent.parts:
+                directories[parent.as_posix()] = _mtime(plugins_dir / parent)
+
+        try:
+            with open(package_json_path, "r", encoding="utf-8") as f:
+                package_data = json.load(f)
+        except json.JSONDecodeError:
+            logger.warning("Invalid JSON in %s", package_json_path)
+            continue
+
+        metadata = package_data.get("metadata", {})
+        plugin_name = metadata.get("plugin_type") or package_data.get("name")
+        main_file = package_data.get("main")
+        if not plugin_name or not main_file:
+            continue
+
+        rel_dir = rel_manifest.parent
+        module_path = ".".join(MODULE_PREFIX + list(rel_dir.parts) + [Path(main_file).stem])
+        plugins[plugin_name] = {
+            "module": module_path,
+            "class": metadata.get("class"),
+            "category": metadata.get("category") or (rel_dir.parts[0] if rel_dir.parts else None),
+            "capabilities": list(metadata.get("capabilities", [])),
+            "label": metadata.get("label"),
+            "path": rel_dir.as_posix(),
+        }
+        packages[plugin_name] = package_data
+
+    return {
+        "version": INDEX_VERSION,
+        "categories": _list_categories(plugins_dir),
+        "plugins": plugins,
+        "packages": packages,
+        "manifests": manifests,
+        "directories": directories,
+    }
+
+
+def is_index_fresh(index: Dict[str, Any], plugins_dir: Path) -> bool:
+    """Check recorded manifest and directory mtimes against the filesystem.
+
+    The plugins root itself is compared by its category listing rather than
+    its mtime, because writing the index file into it changes that mtime.
+    """
+    if index.get("version") != INDEX_VERSION:
+        return False
+    plugins_dir = Path(plugins_dir)
+    try:
+        if _list_categories(plugins_dir) != index.get("categories"):
+            return False
+    except OSError:
+        return False
+    for section in ("manifests", "directories"):
+        for rel_path, mtime in index.get(section, {}).items():
+            try:
+                if _mtime(plugins_dir / rel_path) != mtime:
+                    return False
+            except OSError:
+                return False
+    return True
+
+
+def write_manifest_index(index: Dict[str, Any], index_path: Path) -> None:
+    """Atomically write the index file, readable like any other created file."""
+    index_path = Path(index_path)
+    fd, tmp_path = tempfile.mkstemp(dir=index_path.parent, prefix=".plugin_index.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            # mkstemp creates the file 0600
+            os.fchmod(f.fileno(), INDEX_FILE_MODE & ~_umask())
+            json.dump(index, f, sort_keys=True)
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load_manifest_index(
+    plugins_dir: Optional[Path] = None,
+    index_path: Optional[Path] = None,
+    rebuild: bool = False
+) -> Dict[str, Any]:
+    """
+    Return the manifest index for plugins_dir, rebuilding it when stale.
+
+    The index is kept in memory per plugins directory; each call only stats
+    the recorded files. For the bundled plugins directory, or with an
+    explicit index_path, it is also read from and written back to disk
+    when the location is writable.
+    """
+    plugins_dir = Path(plugins_dir) if plugins_dir else default_plugins_dir()
+    key = str(plugins_dir.resolve())
+    if index_path:
+        index_path = Path(index_path)
+    elif key == str(default_plugins_dir().resolve()):
+        index_path = default_index_path(plugins_dir)
+
+    with _lock:
+        index = None if rebuild else _loaded.get(key)
+        if index is not None and is_index_fresh(index, plugins_dir):
+            return index
+
+        if index is None and not rebuild and index_path:
+            index = _read_index(index_path)
+
+        if index is None or rebuild or not is_index_fresh(index, plugins_dir):
+            index = build_manifest_index(plugins_dir)
+            logger.info("Rebuilt plugin manifest index (%d plugins)", len(index["plugins"]))
+            if index_path:
+                try:
+                    write_manifest_index(index, index_path)
+                except OSError as error:
+                    logger.debug("Could not write plugin index %s: %s", index_path, error)
+
+        _loaded[key] = index
+        return index
+
+
+def _read_index(index_path: Path) -> Optional[Dict[str, Any]]:
+    """Read an index file, returning None if it is missing or unreadable."""
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _list_categories(plugins_dir: Path) -> list:
+    """Return the sorted category directory names under plugins_dir."""
+    return sorted(
+        entry.name for entry in os.scandir(plugins_dir)
+        if entry.is_dir() and not entry.name.startswith(("_", "."))
+    )
+
+
+def _umask() -> int:
+    """Return the process umask (reading it requires setting it)."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _mtime(path: Path) -> int:
+    return os.stat(path).st_mtime_ns
+
+
+def main(argv=None) -> int:
+    """Regenerate or check the plugin manifest index."""
+    parser = argparse.ArgumentParser(description="Build the workflow plugin manifest index")
+    parser.add_argument("--plugins-dir", type=Path, default=default_plugins_dir(), help="Plugins root directory")
+    parser.add_argument("--output", type=Path, default=None, help="Index file to write")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the index is missing or stale")
+    args = parser.parse_args(argv)
+
+    index_path = args.output or default_index_path(args.plugins_dir)
+    if args.check:
+        index = _read_index(index_path)
+        fresh = index is not None and is_index_fresh(index, args.plugins_dir)
+        print(f"{index_path}: {'fresh' if fresh else 'stale'}")
+        return 0 if fresh else 1
+
+    index = build_manifest_index(args.plugins_dir)
+    write_manifest_index(index, index_path)
+    print(f"Wrote {len(index['plugins'])} plugins to {index_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
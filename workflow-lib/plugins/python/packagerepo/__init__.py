@@ -11,8 +11,14 @@ __all__ = [
     "create_validate_entity",
     "create_kv_get",
     "create_kv_put",
+    "create_kv_multi_get",
+    "create_kv_write_batch",
+    "create_kv_scan_prefix",
     "create_blob_put",
+    "create_blob_get",
     "create_index_upsert",
+    "create_index_upsert_batch",
+    "create_index_query",
     "create_respond_json",
     "create_respond_error",
 ]
@@ -41,12 +47,30 @@ def __getattr__(name):
     elif name == "create_kv_put":
         from .kv_put.factory import create
         return create
+    elif name == "create_kv_multi_get":
+        from .kv_multi_get.factory import create
+        return create
+    elif name == "create_kv_write_batch":
+        from .kv_write_batch.factory import create
+        return create
+    elif name == "create_kv_scan_prefix":
+        from .kv_scan_prefix.factory import create
+        return create
     elif name == "create_blob_put":
         from .blob_put.factory import create
         return create
+    elif name == "create_blob_get":
+        from .blob_get.factory import create
+        return create
     elif name == "create_index_upsert":
         from .index_upsert.factory import create
         return create
+    elif name == "create_index_upsert_batch":
+        from .index_upsert_batch.factory import create
+        return create
+    elif name == "create_index_query":
+        from .index_query.factory import create
+        return create
     elif name == "create_respond_json":
         from .respond_json.factory import create
         return create
@@ -0,0 +1,61 @@
+"""Workflow plugin: read blob from content-addressed storage."""
+
+from typing import Dict, Any
+
+from ...base import NodeExecutor
+from ..blob_serving import DEFAULT_CONTENT_TYPE, prepare_blob_response
+from ..blob_store import get_blob_store
+
+
+class BlobGet(NodeExecutor):
+    """Read blob from content-addressed storage."""
+
+    node_type = "packagerepo.blob_get"
+    category = "packagerepo"
+    description = "Read blob from content-addressed storage"
+
+    def execute(self, inputs: Dict[str, Any], runtime: Any = None) -> Dict[str, Any]:
+        """Build the response for a blob, honouring Range and ETag headers.
+
+        The result has status and headers like respond_json, and a "file"
+        entry (path, offset, length) instead of a body; pass it to
+        blob_serving.to_flask_response to send it without copying it
+        through Python. The blob is named by digest, or by the key it was
+        stored under with blob_put.
+        """
+        digest = inputs.get("digest")
+        key = inputs.get("key")
+
+        if not digest and not key:
+            return {"error": "digest or key is required"}
+
+        if not runtime or not (hasattr(runtime, "blob_dir") or hasattr(runtime, "blob_store")):
+            return {"error": "blob_dir not available in runtime"}
+
+        store = get_blob_store(runtime)
+        if not digest:
+            try:
+                digest = store.resolve_ref(key)
+            except ValueError as e:
+                return {"error": str(e), "error_code": "BLOB_INVALID_KEY"}
+            if digest is None:
+                return {"error": f"blob not found: {key}", "error_code": "BLOB_NOT_FOUND"}
+
+        try:
+            response = prepare_blob_response(
+                store,
+                digest,
+                range_header=inputs.get("range"),
+                if_none_match=inputs.get("if_none_match"),
+                if_range=inputs.get("if_range"),
+                content_type=inputs.get("content_type") or DEFAULT_CONTENT_TYPE,
+            )
+        except ValueError as e:
+            return {"error": str(e), "error_code": "BLOB_INVALID_DIGEST"}
+        except Exception as e:
+            return {"error": f"failed to read blob: {str(e)}", "error_code": "BLOB_GET_FAILED"}
+
+        if response is None:
+            return {"error": f"blob not found: {digest}", "error_code": "BLOB_NOT_FOUND"}
+
+        return {"result": response.to_dict()}
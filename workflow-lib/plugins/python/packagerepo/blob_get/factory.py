@@ -0,0 +1,7 @@
+"""Factory for BlobGet plugin."""
+
+from .blob_get import BlobGet
+
+
+def create():
+    return BlobGet()
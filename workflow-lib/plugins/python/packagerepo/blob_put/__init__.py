@@ -0,0 +1 @@
+"""Write blob plugin."""
@@ -1,21 +1,26 @@
-"""Workflow plugin: write blob to filesystem."""
+"""Workflow plugin: write blob to content-addressed storage."""
 
 from typing import Dict, Any
-from pathlib import Path
-import base64
 
 from ...base import NodeExecutor
+from ..blob_store import get_blob_store
 
 
 class BlobPut(NodeExecutor):
-    """Write blob to filesystem."""
+    """Write blob to content-addressed storage."""
 
     node_type = "packagerepo.blob_put"
     category = "packagerepo"
-    description = "Write blob to filesystem"
+    description = "Write blob to content-addressed storage"
 
     def execute(self, inputs: Dict[str, Any], runtime: Any = None) -> Dict[str, Any]:
-        """Write blob to filesystem."""
+        """Stream blob into the store under key and return its digest and size.
+
+        data may be a string, bytes, a file object or an iterable of chunks;
+        it is hashed and written chunk by chunk, never held whole in memory.
+        The content is stored by digest and key is recorded as a reference to
+        it, so blob_get can look the blob up by either.
+        """
         key = inputs.get("key")
         data = inputs.get("data")
         encoding = inputs.get("encoding", "utf-8")  # utf-8, base64, or binary
@@ -26,41 +31,21 @@ class BlobPut(NodeExecutor):
         if data is None:
             return {"error": "data is required"}
 
-        if not runtime or not hasattr(runtime, "blob_dir"):
+        if not runtime or not (hasattr(runtime, "blob_dir") or hasattr(runtime, "blob_store")):
             return {"error": "blob_dir not available in runtime"}
 
+        store = get_blob_store(runtime)
         try:
-            # Ensure blob directory exists
-            blob_dir = Path(runtime.blob_dir)
-            blob_dir.mkdir(parents=True, exist_ok=True)
-
-            # Construct file path
-            file_path = blob_dir / key
-
-            # Ensure parent directory exists
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Convert data to bytes based on encoding
-            if encoding == "base64":
-                if isinstance(data, str):
-                    data_bytes = base64.b64decode(data)
-                else:
-                    return {"error": "data must be a string for base64 encoding"}
-            elif encoding == "binary":
-                if isinstance(data, bytes):
-                    data_bytes = data
-                else:
-                    return {"error": "data must be bytes for binary encoding"}
-            else:  # utf-8 or other text encoding
-                if isinstance(data, str):
-                    data_bytes = data.encode(encoding)
-                else:
-                    return {"error": f"data must be a string for {encoding} encoding"}
-
-            # Write to file
-            file_path.write_bytes(data_bytes)
-
-            return {"result": {"success": True, "key": key, "path": str(file_path), "size": len(data_bytes)}}
+            store.ref_path(key)
+        except ValueError as e:
+            return {"error": str(e), "error_code": "BLOB_INVALID_KEY"}
 
+        try:
+            info = store.put(data, encoding)
+            store.set_ref(key, info.digest)
+        except (TypeError, ValueError) as e:
+            return {"error": f"invalid blob data: {str(e)}", "error_code": "BLOB_INVALID_DATA"}
         except Exception as e:
             return {"error": f"failed to write blob: {str(e)}", "error_code": "BLOB_PUT_FAILED"}
+
+        return {"result": {"success": True, "key": key, **info.to_dict()}}
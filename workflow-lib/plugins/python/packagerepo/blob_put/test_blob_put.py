@@ -0,0 +1,52 @@
+"""Tests for BlobPut plugin."""
+
+import shutil
+import tempfile
+import types
+import unittest
+
+from ..blob_get.blob_get import BlobGet
+from .blob_put import BlobPut
+
+
+class TestBlobPut(unittest.TestCase):
+    """Test cases for storing blobs under a key."""
+
+    def setUp(self):
+        """Set up a runtime with a blob directory."""
+        self.root = tempfile.mkdtemp(prefix="blob-put-test-")
+        self.runtime = types.SimpleNamespace(blob_dir=self.root)
+        self.plugin = BlobPut()
+
+    def tearDown(self):
+        """Remove the blob directory."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_key_required(self):
+        """Test that a missing key is reported."""
+        self.assertEqual(self.plugin.execute({"data": "x"}, self.runtime), {"error": "key is required"})
+
+    def test_invalid_key(self):
+        """Test that a key leaving the blob directory is refused before writing."""
+        result = self.plugin.execute({"key": "../x", "data": "x"}, self.runtime)
+        self.assertEqual(result["error_code"], "BLOB_INVALID_KEY")
+
+    def test_key_resolves_to_stored_blob(self):
+        """Test that the key is recorded so blob_get can find the blob by it."""
+        result = self.plugin.execute({"key": "pkg/1.0/readme", "data": "hello"}, self.runtime)["result"]
+        self.assertEqual(result["key"], "pkg/1.0/readme")
+        self.assertEqual(result["size"], 5)
+        self.assertTrue(result["digest"].startswith("sha256:"))
+
+        response = BlobGet().execute({"key": "pkg/1.0/readme"}, self.runtime)["result"]
+        self.assertEqual(response["status"], 200)
+        self.assertEqual(response["file"]["path"], result["path"])
+
+    def test_unknown_key_not_found(self):
+        """Test that blob_get reports a key that was never stored."""
+        result = BlobGet().execute({"key": "nothing"}, self.runtime)
+        self.assertEqual(result["error_code"], "BLOB_NOT_FOUND")
+
+
+if __name__ == "__main__":
+    unittest.main()
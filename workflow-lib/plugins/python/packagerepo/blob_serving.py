@@ -0,0 +1,198 @@
+"""Serve blobs from the blob store without reading them into memory.
+
+``prepare_blob_response`` answers conditional and range requests for a
+stored blob. The ETag is the content digest, so it is strong and never
+changes for a given URL; ``If-None-Match`` yields 304, a single
+``Range: bytes=...`` yields 206 (multiple ranges are served whole, as RFC
+9110 allows) and an unsatisfiable range yields 416.
+
+The response describes the bytes to send as (path, offset, length) rather
+than a body. ``to_flask_response`` turns it into a Flask response whose
+body is passed to the server's ``wsgi.file_wrapper``: gunicorn and other
+servers with sendfile support send the range straight from the page cache,
+others read it in bounded chunks. ``sendfile_range`` does the same over a
+raw socket for servers outside WSGI.
+"""
+
+import os
+import re
+import socket
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from .blob_store import ALGORITHM, BlobStore
+
+BUFFER_SIZE = 256 * 1024
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+_RANGE = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$", re.IGNORECASE)
+
+
+class RangeNotSatisfiable(ValueError):
+    """The requested byte range lies outside the blob."""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Return the inclusive (start, end) of a single byte range, or None.
+
+    Missing, malformed and multi-range headers return None, meaning the
+    whole blob is served.
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header)
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    end = int(last) if last else size - 1
+    return start, min(end, size - 1)
+
+
+def _etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    """Return True if an If-None-Match or If-Range value names etag."""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+@dataclass
+class BlobResponse:
+    """Status, headers and the byte range of a blob to send."""
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    path: Optional[str] = None
+    offset: int = 0
+    length: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the response shape used by the respond_* plugins."""
+        response: Dict[str, Any] = {"status": self.status, "headers": self.headers, "body": ""}
+        if self.path is not None:
+            response["file"] = {"path": self.path, "offset": self.offset, "length": self.length}
+        return response
+
+
+def prepare_blob_response(
+    store: BlobStore,
+    digest: str,
+    range_header: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+    if_range: Optional[str] = None,
+    content_type: str = DEFAULT_CONTENT_TYPE
+) -> Optional[BlobResponse]:
+    """Answer a GET for a stored blob; returns None if it does not exist."""
+    info = store.stat(digest)
+    if info is None:
+        return None
+    etag = f'"{ALGORITHM}:{info.digest}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Accept-Ranges": "bytes"}
+
+    if _etag_matches(if_none_match, etag):
+        return BlobResponse(304, headers)
+
+    # A stale If-Range means the client's partial copy is useless: send it all
+    if if_range and not _etag_matches(if_range, etag, weak=False):
+        range_header = None
+    try:
+        byte_range = parse_range(range_header, info.size)
+    except RangeNotSatisfiable:
+        headers["Content-Range"] = f"bytes */{info.size}"
+        return BlobResponse(416, headers)
+
+    headers["Content-Type"] = content_type
+    if byte_range is None:
+        headers["Content-Length"] = str(info.size)
+        return BlobResponse(200, headers, str(info.path), 0, info.size)
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+    return BlobResponse(206, headers, str(info.path), start, end - start + 1)
+
+
+class RangeFile:
+    """Unbuffered file object positioned at offset that ends after length bytes.
+
+    ``fileno`` lets sendfile-capable file wrappers use the descriptor from
+    its current position, bounded by Content-Length; ``read`` serves the
+    rest, never past the range.
+    """
+
+    def __init__(self, path: str, offset: int = 0, length: Optional[int] = None):
+        self._file = open(path, "rb", buffering=0)
+        self._file.seek(offset)
+        self.remaining = length if length is not None else os.fstat(self._file.fileno()).st_size - offset
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self._file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def to_flask_response(response: Any, environ: Optional[Dict[str, Any]] = None):
+    """Build a Flask response from a blob_get result.
+
+    environ defaults to the current Flask request's; its
+    ``wsgi.file_wrapper`` carries the body when the server provides one.
+    """
+    from flask import Response, request
+    from werkzeug.wsgi import FileWrapper
+
+    if isinstance(response, BlobResponse):
+        response = response.to_dict()
+    file_range = response.get("file")
+    if not file_range:
+        return Response(response.get("body", ""), status=response["status"], headers=response.get("headers"))
+
+    if environ is None:
+        environ = request.environ
+    wrapper = environ.get("wsgi.file_wrapper", FileWrapper)
+    body = wrapper(RangeFile(file_range["path"], file_range["offset"], file_range["length"]), BUFFER_SIZE)
+    return Response(body, status=response["status"], headers=response.get("headers"), direct_passthrough=True)
+
+
+def sendfile_range(sock: socket.socket, path: str, offset: int, length: int) -> int:
+    """Send a byte range of a file over a socket; returns the bytes sent.
+
+    Uses os.sendfile where the platform supports it, so the data never
+    enters Python, and falls back to socket.sendfile's chunked copy.
+    """
+    with open(path, "rb") as handle:
+        if not hasattr(os, "sendfile"):
+            return sock.sendfile(handle, offset, length)
+        sent = 0
+        while sent < length:
+            count = os.sendfile(sock.fileno(), handle.fileno(), offset + sent, length - sent)
+            if count == 0:
+                break
+            sent += count
+        return sent
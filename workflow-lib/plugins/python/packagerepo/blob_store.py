@@ -0,0 +1,225 @@
+"""Content-addressed blob storage on the local filesystem.
+
+Blobs are stored by SHA-256 digest under ``<root>/sha256/ab/cd/<digest>``.
+Content is streamed in fixed-size chunks to a temporary file in
+``<root>/tmp`` while it is hashed, fsynced, and then renamed into place
+atomically, so readers never see a partial blob and memory use does not
+grow with blob size. Storing content that already exists keeps the
+existing file and discards the new copy.
+
+Named references map a caller's key to a digest, so blobs can still be
+looked up by the key they were stored under. A reference is a small file
+``<root>/refs/<key>`` holding ``sha256:<hex>``, replaced atomically when
+the key is stored again.
+"""
+
+import base64
+import binascii
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger("autometabuilder")
+
+CHUNK_SIZE = 1024 * 1024
+ALGORITHM = "sha256"
+
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+_WHITESPACE = re.compile(rb"\s+")
+
+
+@dataclass
+class BlobInfo:
+    """Digest, size and location of a stored blob."""
+    digest: str
+    size: int
+    path: Path
+    created: bool = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            "digest": f"{ALGORITHM}:{self.digest}",
+            "size": self.size,
+            "path": str(self.path),
+            "deduplicated": not self.created,
+        }
+
+
+def parse_digest(value: str) -> str:
+    """Return the hex digest from ``sha256:<hex>`` or ``<hex>``."""
+    digest = value.split(":", 1)[1] if value.startswith(f"{ALGORITHM}:") else value
+    digest = digest.lower()
+    if not _DIGEST.match(digest):
+        raise ValueError(f"invalid {ALGORITHM} digest: {value}")
+    return digest
+
+
+def iter_chunks(data: Any, encoding: str = "binary", chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the bytes of data in chunks.
+
+    data may be bytes, a string, a binary or text file object, or an
+    iterable of bytes or string chunks. Strings are encoded with encoding,
+    or decoded from base64 when encoding is ``base64``.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview, str)):
+        view = memoryview(data) if not isinstance(data, str) else data
+        chunks: Iterable[Any] = (view[start:start + chunk_size] for start in range(0, len(view), chunk_size))
+    elif hasattr(data, "read"):
+        chunks = iter(lambda: data.read(chunk_size), data.read(0))
+    elif hasattr(data, "__iter__"):
+        chunks = data
+    else:
+        raise TypeError(f"cannot store blob data of type {type(data).__name__}")
+
+    if encoding == "base64":
+        yield from _decode_base64(chunks)
+        return
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            if encoding == "binary":
+                raise TypeError("data must be bytes for binary encoding")
+            yield chunk.encode(encoding)
+        else:
+            yield bytes(chunk)
+
+
+def _decode_base64(chunks: Iterable[Any]) -> Iterator[bytes]:
+    """Decode base64 text arriving in arbitrary chunks."""
+    pending = b""
+    for chunk in chunks:
+        chunk = chunk.encode("ascii") if isinstance(chunk, str) else bytes(chunk)
+        pending += _WHITESPACE.sub(b"", chunk)
+        usable = len(pending) - len(pending) % 4
+        if usable:
+            yield base64.b64decode(pending[:usable])
+            pending = pending[usable:]
+    if pending:
+        raise binascii.Error("base64 data is not padded to a multiple of 4 characters")
+
+
+class BlobStore:
+    """Filesystem blob store keyed by SHA-256 digest."""
+
+    def __init__(self, root: Any, chunk_size: int = CHUNK_SIZE):
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+        self.tmp_dir = self.root / "tmp"
+        self.refs_dir = self.root / "refs"
+
+    def path_for(self, digest: str) -> Path:
+        """Return the sharded path of a digest."""
+        digest = parse_digest(digest)
+        return self.root / ALGORITHM / digest[:2] / digest[2:4] / digest
+
+    def exists(self, digest: str) -> bool:
+        """Return True if a blob with this digest is stored."""
+        return self.path_for(digest).is_file()
+
+    def stat(self, digest: str) -> Optional[BlobInfo]:
+        """Return the stored blob's info, or None if it is missing."""
+        path = self.path_for(digest)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return None
+        return BlobInfo(parse_digest(digest), size, path, created=False)
+
+    def put(self, data: Any, encoding: str = "binary") -> BlobInfo:
+        """Stream data into the store and return the blob's info."""
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        hasher = hashlib.sha256()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=self.tmp_dir, prefix="blob-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                for chunk in iter_chunks(data, encoding, self.chunk_size):
+                    hasher.update(chunk)
+                    handle.write(chunk)
+                    size += len(chunk)
+                handle.flush()
+                os.fsync(handle.fileno())
+
+            digest = hasher.hexdigest()
+            path = self.path_for(digest)
+            if path.is_file():
+                os.unlink(tmp_name)
+                logger.debug("Blob %s:%s already stored", ALGORITHM, digest)
+                return BlobInfo(digest, size, path, created=False)
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_name, path)
+            _fsync_dir(path.parent)
+            return BlobInfo(digest, size, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    def set_ref(self, key: str, digest: str) -> Path:
+        """Point key at a stored digest and return the reference file."""
+        path = self.ref_path(key)
+        value = f"{ALGORITHM}:{parse_digest(digest)}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.tmp_dir, prefix="ref-")
+        try:
+            with os.fdopen(fd, "w", encoding="ascii") as handle:
+                handle.write(value)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        return path
+
+    def resolve_ref(self, key: str) -> Optional[str]:
+        """Return the hex digest key points at, or None if it has no reference."""
+        try:
+            value = self.ref_path(key).read_text(encoding="ascii")
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            return None
+        return parse_digest(value.strip())
+
+    def ref_path(self, key: str) -> Path:
+        """Return the reference file of key, rejecting keys that leave refs/."""
+        parts = PurePosixPath(key).parts if isinstance(key, str) else ()
+        if not parts or parts[0] == "/" or ".." in parts or "\\" in key:
+            raise ValueError(f"invalid blob key: {key!r}")
+        return self.refs_dir.joinpath(*parts)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist a rename by syncing its directory, where the OS allows it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+_stores: Dict[str, BlobStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_blob_store(runtime: Any) -> BlobStore:
+    """Return the runtime's blob store, creating one over runtime.blob_dir."""
+    store = getattr(runtime, "blob_store", None)
+    if isinstance(store, BlobStore):
+        return store
+    root = str(Path(runtime.blob_dir).resolve())
+    with _stores_lock:
+        if root not in _stores:
+            _stores[root] = BlobStore(root)
+        return _stores[root]
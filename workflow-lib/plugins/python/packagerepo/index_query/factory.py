@@ -0,0 +1,7 @@
+"""Factory for IndexQuery plugin."""
+
+from .index_query import IndexQuery
+
+
+def create():
+    return IndexQuery()
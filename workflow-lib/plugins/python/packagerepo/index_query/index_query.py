@@ -0,0 +1,60 @@
+"""Workflow plugin: query index store by term and prefix."""
+
+from typing import Dict, Any
+
+from ...base import NodeExecutor
+from ..index_store import DEFAULT_LIMIT, MAX_LIMIT, get_index_store
+
+
+class IndexQuery(NodeExecutor):
+    """Query index store by term and prefix."""
+
+    node_type = "packagerepo.index_query"
+    category = "packagerepo"
+    description = "Query index store by term and prefix"
+
+    def execute(self, inputs: Dict[str, Any], runtime: Any = None) -> Dict[str, Any]:
+        """Find documents containing every query term, one page at a time.
+
+        Inputs:
+            index_name: Name of the index
+            query: Search text
+            prefix: Match the last word as a prefix (default: True)
+            offset: Number of hits to skip (default: 0)
+            limit: Page size (default: 20, at most 1000)
+        """
+        index_name = inputs.get("index_name")
+        query = inputs.get("query")
+        prefix = inputs.get("prefix", True)
+        offset = inputs.get("offset", 0)
+        limit = inputs.get("limit", DEFAULT_LIMIT)
+
+        if not index_name:
+            return {"error": "index_name is required"}
+
+        if query is None:
+            return {"error": "query is required"}
+
+        if not isinstance(query, str):
+            return {"error": "query must be a string"}
+
+        if not isinstance(offset, int) or offset < 0:
+            return {"error": "offset must be a non-negative integer"}
+
+        if not isinstance(limit, int) or not 0 <= limit <= MAX_LIMIT:
+            return {"error": f"limit must be an integer between 0 and {MAX_LIMIT}"}
+
+        index_store = get_index_store(runtime) if runtime else None
+        if index_store is None:
+            return {"error": "index_store not available in runtime"}
+
+        if not hasattr(index_store, "query"):
+            return {"error": "index_store does not support queries", "error_code": "INDEX_QUERY_UNSUPPORTED"}
+
+        try:
+            result = index_store.query(index_name, query, prefix=bool(prefix), offset=offset, limit=limit)
+
+            return {"result": result}
+
+        except Exception as e:
+            return {"error": f"failed to query index: {str(e)}", "error_code": "INDEX_QUERY_FAILED"}
@@ -0,0 +1,520 @@
+"""Inverted index store for the packagerepo index plugins.
+
+The index_* plugins use ``runtime.index_store`` when the host provides
+one. Otherwise ``get_index_store`` opens an ``InvertedIndexStore`` in
+``runtime.index_dir`` (or ``PACKAGEREPO_INDEX_DIR``), indexing the fields
+listed per index in ``runtime.index_fields``, or every top-level string
+field when an index has no entry.
+
+Each index keeps its documents, a posting set of document keys per term
+and sorted term lists in memory, so a term query is a slice or a few set
+intersections and a prefix query a bisect over a term list. Results
+are ordered by when each key was first indexed, which keeps pagination
+stable.
+
+Every upsert or batch is persisted as one segment file of document
+operations, written to a temp file, fsynced and renamed into
+``<index_dir>/<index>/seg-<first>-<last>.json``. Segments are merged by
+size tier: a segment's tier grows by one each time its file is
+``merge_threshold`` times larger, starting above MERGE_FLOOR_BYTES. Once
+``merge_threshold`` adjacent segments share a tier, a background thread
+merges that run into one segment, so a document is rewritten about once
+per tier rather than on every merge. A merge that includes the oldest
+segment drops deletes; other merges keep them, because the documents they
+delete may live in older segments. ``merge`` merges every segment at once.
+Opening the store replays the segments and rebuilds the in-memory index.
+"""
+
+import bisect
+import copy
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger("autometabuilder")
+
+DEFAULT_MERGE_THRESHOLD = 8
+# Segments up to this size are all in the lowest merge tier
+MERGE_FLOOR_BYTES = 64 * 1024
+DEFAULT_LIMIT = 20
+SHORT_PREFIX_CHARS = 2
+MAX_LIMIT = 1000
+
+_WORD = re.compile(r"[0-9a-z][0-9a-z._@/-]*")
+_PART = re.compile(r"[0-9a-z]+")
+_SEGMENT = re.compile(r"^seg-(\d+)-(\d+)\.json$")
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+def tokenize(text: str) -> Set[str]:
+    """Return the lowercased words of text and the parts of compound words.
+
+    "react-dom" yields "react-dom", "react" and "dom", so both the full
+    package name and its parts can be searched.
+    """
+    terms = set()
+    for word in _WORD.findall(text.lower()):
+        word = word.rstrip("._@/-")
+        terms.add(word)
+        parts = _PART.findall(word)
+        if len(parts) > 1:
+            terms.update(parts)
+    return terms
+
+
+class _Index:
+    """In-memory documents and inverted index of one named index.
+
+    Documents get an integer id when their key is first indexed. Posting
+    lists hold ids in ascending order, so new documents are appended and
+    the first page of a single-term query is a slice.
+
+    Compound terms ("react-dom") are kept apart from simple ones: a prefix
+    without separators that matches a compound term also matches its first
+    part, so only prefixes with separators need to expand them. Prefixes of
+    up to SHORT_PREFIX_CHARS characters, which would expand to thousands of
+    terms, have posting lists of their own.
+    """
+
+    def __init__(self, fields: Optional[List[str]] = None):
+        self.fields = fields
+        self.ids: Dict[str, int] = {}
+        self.keys: Dict[int, str] = {}
+        self.documents: Dict[int, Dict[str, Any]] = {}
+        self.doc_terms: Dict[int, FrozenSet[str]] = {}
+        self.postings: Dict[str, List[int]] = {}
+        self.prefixes: Dict[str, List[int]] = {}
+        self.terms: List[str] = []
+        self.compound_terms: List[str] = []
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def document_terms(self, document: Dict[str, Any]) -> FrozenSet[str]:
+        """Tokenize the indexed fields of a document."""
+        names = self.fields if self.fields is not None else list(document)
+        terms: Set[str] = set()
+        for name in names:
+            value = document.get(name)
+            values = value if isinstance(value, list) else [value]
+            for item in values:
+                if isinstance(item, str):
+                    terms |= tokenize(item)
+        return frozenset(terms)
+
+    def apply(self, operations: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> None:
+        """Apply (key, document) upserts and (key, None) deletes."""
+        touched: Set[str] = set()
+        for key, document in operations:
+            doc_id = self.ids.get(key)
+            if document is None:
+                if doc_id is not None:
+                    previous = self.doc_terms.pop(doc_id)
+                    self._unlink(self.postings, doc_id, previous, touched)
+                    self._unlink(self.prefixes, doc_id, _short_prefixes(previous))
+                    del self.documents[doc_id], self.keys[doc_id], self.ids[key]
+                continue
+            terms = self.document_terms(document)
+            if doc_id is None:
+                doc_id = self.ids[key] = self._next_id
+                self._next_id += 1
+                self.keys[doc_id] = key
+                previous = _EMPTY
+            else:
+                previous = self.doc_terms[doc_id]
+                self._unlink(self.postings, doc_id, previous - terms, touched)
+            self.documents[doc_id] = document
+            self.doc_terms[doc_id] = terms
+            self._link(self.postings, doc_id, terms - previous, touched)
+            previous_prefixes, prefixes = _short_prefixes(previous), _short_prefixes(terms)
+            self._unlink(self.prefixes, doc_id, previous_prefixes - prefixes)
+            self._link(self.prefixes, doc_id, prefixes - previous_prefixes)
+        self._update_terms(touched)
+
+    def search(self, terms: List[str], prefix: Optional[str], offset: int, limit: int) -> Tuple[int, List[str]]:
+        """Return the total match count and one page of matching keys."""
+        lists = sorted((self.postings.get(term, []) for term in terms), key=len)
+        if lists and not lists[0]:
+            return 0, []
+        expansions: List[List[int]] = []
+        if prefix is not None:
+            if not _PART.fullmatch(prefix):
+                expansions = self._expand(self.compound_terms, prefix)
+            elif len(prefix) <= SHORT_PREFIX_CHARS:
+                expansions = [self.prefixes.get(prefix, [])]
+            else:
+                expansions = self._expand(self.terms, prefix)
+            if not expansions or not expansions[0]:
+                return 0, []
+
+        if not lists:
+            if len(expansions) == 1:
+                ids = expansions[0]
+                return len(ids), self._keys(ids[offset:offset + limit])
+            matches = set().union(*expansions)
+            return len(matches), self._keys(sorted(matches)[offset:offset + limit])
+
+        if len(lists) == 1 and not expansions:
+            ids = lists[0]
+            return len(ids), self._keys(ids[offset:offset + limit])
+
+        matches = set(lists[0])
+        for ids in lists[1:]:
+            matches.intersection_update(ids)
+            if not matches:
+                return 0, []
+        if expansions:
+            if sum(map(len, expansions)) <= 4 * len(matches):
+                matches.intersection_update(set().union(*expansions))
+            else:
+                # Many expansions: check the few candidates' own terms instead
+                matches = {
+                    doc_id for doc_id in matches
+                    if any(term.startswith(prefix) for term in self.doc_terms[doc_id])
+                }
+        return len(matches), self._keys(sorted(matches)[offset:offset + limit])
+
+    def get(self, doc_key: str) -> Optional[Dict[str, Any]]:
+        """Return the document stored under a key."""
+        doc_id = self.ids.get(doc_key)
+        return None if doc_id is None else self.documents[doc_id]
+
+    def _expand(self, terms: List[str], prefix: str) -> List[List[int]]:
+        """Return the posting lists of every term in terms starting with prefix."""
+        start = bisect.bisect_left(terms, prefix)
+        end = bisect.bisect_left(terms, prefix + "\uffff")
+        return [self.postings[term] for term in terms[start:end]]
+
+    def _keys(self, ids: Iterable[int]) -> List[str]:
+        return [self.keys[doc_id] for doc_id in ids]
+
+    @staticmethod
+    def _link(
+        postings: Dict[str, List[int]], doc_id: int, terms: Iterable[str], touched: Optional[Set[str]] = None
+    ) -> None:
+        for term in terms:
+            ids = postings.get(term)
+            if ids is None:
+                postings[term] = [doc_id]
+                if touched is not None:
+                    touched.add(term)
+            elif ids[-1] < doc_id:
+                ids.append(doc_id)
+            else:
+                bisect.insort(ids, doc_id)
+
+    @staticmethod
+    def _unlink(
+        postings: Dict[str, List[int]], doc_id: int, terms: Iterable[str], touched: Optional[Set[str]] = None
+    ) -> None:
+        for term in terms:
+            ids = postings[term]
+            del ids[bisect.bisect_left(ids, doc_id)]
+            if not ids:
+                del postings[term]
+                if touched is not None:
+                    touched.add(term)
+
+    def _update_terms(self, touched: Set[str]) -> None:
+        """Bring the sorted term lists in line with the postings."""
+        if len(touched) > max(64, (len(self.terms) + len(self.compound_terms)) // 16):
+            self.terms = sorted(term for term in self.postings if _PART.fullmatch(term))
+            self.compound_terms = sorted(term for term in self.postings if not _PART.fullmatch(term))
+            return
+        for term in touched:
+            terms = self.terms if _PART.fullmatch(term) else self.compound_terms
+            position = bisect.bisect_left(terms, term)
+            listed = position < len(terms) and terms[position] == term
+            if term in self.postings and not listed:
+                terms.insert(position, term)
+            elif term not in self.postings and listed:
+                del terms[position]
+
+
+def _short_prefixes(terms: Iterable[str]) -> Set[str]:
+    """Return the prefixes of up to SHORT_PREFIX_CHARS characters of simple terms."""
+    return {
+        term[:length] for term in terms if _PART.fullmatch(term)
+        for length in range(1, min(len(term), SHORT_PREFIX_CHARS) + 1)
+    }
+
+
+class InvertedIndexStore:
+    """Named inverted indexes, in memory or persisted as merged segments."""
+
+    def __init__(
+        self,
+        directory: Any = None,
+        fields: Optional[Dict[str, List[str]]] = None,
+        merge_threshold: int = DEFAULT_MERGE_THRESHOLD
+    ):
+        self.directory = Path(directory) if directory is not None else None
+        self.fields = fields or {}
+        self.merge_threshold = merge_threshold
+        self._indexes: Dict[str, _Index] = {}
+        self._lock = threading.RLock()
+        self._segments_lock = threading.Lock()
+        # Held for a whole merge, so two merges never take the same segments
+        self._merge_lock = threading.Lock()
+        self._next_segment: Dict[str, int] = {}
+        self._merges: Dict[str, threading.Thread] = {}
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for path in sorted(self.directory.iterdir()):
+                if path.is_dir():
+                    self._load(path.name)
+
+    def upsert(self, index_name: str, key: str, document: Dict[str, Any]) -> None:
+        """Index a document under key, replacing any previous version."""
+        self.upsert_batch(index_name, [(key, document)])
+
+    def delete(self, index_name: str, key: str) -> None:
+        """Remove a document from the index."""
+        self.write_batch(index_name, [(key, None)])
+
+    def upsert_batch(self, index_name: str, documents: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Index several (key, document) pairs as one segment; returns the count."""
+        return self.write_batch(index_name, documents)
+
+    def write_batch(self, index_name: str, operations: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> int:
+        """Apply (key, document) upserts and (key, None) deletes as one segment.
+
+        Documents are copied, so later changes to the caller's dicts do not
+        reach the index.
+        """
+        operations = [
+            (key, None if document is None else copy.deepcopy(document)) for key, document in operations
+        ]
+        if not operations:
+            return 0
+        with self._lock:
+            if self.directory is not None:
+                self._write_segment(index_name, operations)
+            self._index(index_name).apply(operations)
+        self._maybe_merge(index_name)
+        return len(operations)
+
+    def query(
+        self,
+        index_name: str,
+        query: str,
+        prefix: bool = True,
+        offset: int = 0,
+        limit: int = DEFAULT_LIMIT
+    ) -> Dict[str, Any]:
+        """Find documents containing every query term.
+
+        With prefix, the last query word matches any term it starts, for
+        search as you type. Returns {"total", "offset", "limit", "hits"};
+        hit documents are copies the caller may modify.
+        """
+        words = [word.rstrip("._@/-") for word in _WORD.findall(query.lower())]
+        terms = [word for word in words if word]
+        prefix_word = terms.pop() if prefix and terms else None
+        limit = max(0, min(limit, MAX_LIMIT))
+        offset = max(offset, 0)
+
+        with self._lock:
+            index = self._indexes.get(index_name)
+            if index is None or (not terms and prefix_word is None):
+                return {"total": 0, "offset": offset, "limit": limit, "hits": []}
+            total, keys = index.search(terms, prefix_word, offset, limit)
+            hits = [{"key": key, "document": copy.deepcopy(index.get(key))} for key in keys]
+        return {"total": total, "offset": offset, "limit": limit, "hits": hits}
+
+    def count(self, index_name: str) -> int:
+        """Return the number of documents in an index."""
+        with self._lock:
+            index = self._indexes.get(index_name)
+            return len(index) if index else 0
+
+    def merge(self, index_name: str) -> None:
+        """Merge every segment of an index into one, keeping live documents."""
+        directory = self._index_dir(index_name)
+        with self._merge_lock:
+            with self._segments_lock:
+                segments = _list_segments(directory)
+            if len(segments) >= 2:
+                self._merge_run(index_name, segments, oldest=True)
+
+    def _merge_tiers(self, index_name: str) -> None:
+        """Merge runs of same-tier segments until none is long enough."""
+        directory = self._index_dir(index_name)
+        with self._merge_lock:
+            while True:
+                with self._segments_lock:
+                    segments = _list_segments(directory)
+                run = _tier_run(segments, self.merge_threshold)
+                if run is None:
+                    return
+                self._merge_run(index_name, run, oldest=run[0] == segments[0])
+
+    def _merge_run(self, index_name: str, run: List[Tuple[int, int, Path]], oldest: bool) -> None:
+        """Replace adjacent segments with one; caller holds the merge lock."""
+        documents: Dict[str, Optional[Dict[str, Any]]] = {}
+        for _, _, path in run:
+            for key, document in _read_segment(path):
+                documents[key] = document
+        first, last = run[0][0], run[-1][1]
+        if oldest:
+            # Nothing older is left for a delete to hide
+            operations = [(key, document) for key, document in documents.items() if document is not None]
+        else:
+            operations = list(documents.items())
+        merged = self._index_dir(index_name) / f"seg-{first:08d}-{last:08d}.json"
+        _write_json_atomic(merged, operations)
+        with self._segments_lock:
+            for _, _, path in run:
+                if path != merged:
+                    path.unlink(missing_ok=True)
+        logger.info("Merged %d segments of index %s into %s", len(run), index_name, merged.name)
+
+    def close(self) -> None:
+        """Wait for background merges to finish."""
+        for thread in list(self._merges.values()):
+            thread.join()
+
+    def _index(self, index_name: str) -> _Index:
+        index = self._indexes.get(index_name)
+        if index is None:
+            index = self._indexes[index_name] = _Index(self.fields.get(index_name))
+        return index
+
+    def _index_dir(self, index_name: str) -> Path:
+        if not index_name or "/" in index_name or index_name.startswith("."):
+            raise ValueError(f"invalid index name: {index_name}")
+        return self.directory / index_name
+
+    def _load(self, index_name: str) -> None:
+        """Rebuild an index from its segments, dropping ones a merge already covers."""
+        directory = self._index_dir(index_name)
+        segments = _list_segments(directory)
+        kept = []
+        for first, last, path in segments:
+            if any(other_first <= first and last <= other_last and other_path != path
+                   for other_first, other_last, other_path in segments):
+                path.unlink(missing_ok=True)
+                continue
+            kept.append((first, last, path))
+        index = self._index(index_name)
+        for _, _, path in kept:
+            index.apply(_read_segment(path))
+        self._next_segment[index_name] = kept[-1][1] + 1 if kept else 1
+        logger.debug("Loaded index %s: %d documents from %d segments", index_name, len(index), len(kept))
+
+    def _write_segment(self, index_name: str, operations: List[Tuple[str, Optional[Dict[str, Any]]]]) -> None:
+        directory = self._index_dir(index_name)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._segments_lock:
+            number = self._next_segment.get(index_name, 1)
+            self._next_segment[index_name] = number + 1
+        _write_json_atomic(directory / f"seg-{number:08d}-{number:08d}.json", operations)
+
+    def _maybe_merge(self, index_name: str) -> None:
+        if self.directory is None:
+            return
+        with self._segments_lock:
+            running = self._merges.get(index_name)
+            if running is not None and running.is_alive():
+                return
+            segments = _list_segments(self._index_dir(index_name))
+            if _tier_run(segments, self.merge_threshold) is None:
+                return
+            thread = threading.Thread(
+                target=self._merge_in_background, args=(index_name,), name=f"index-merge-{index_name}", daemon=True
+            )
+            self._merges[index_name] = thread
+            thread.start()
+
+    def _merge_in_background(self, index_name: str) -> None:
+        try:
+            self._merge_tiers(index_name)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logger.error("Merging segments of index %s failed: %s", index_name, error)
+
+
+def _list_segments(directory: Path) -> List[Tuple[int, int, Path]]:
+    """Return (first, last, path) of each segment, oldest first."""
+    if not directory.is_dir():
+        return []
+    segments = []
+    for path in directory.iterdir():
+        match = _SEGMENT.match(path.name)
+        if match:
+            segments.append((int(match.group(1)), int(match.group(2)), path))
+    segments.sort(key=lambda segment: (segment[1], segment[0]))
+    return segments
+
+
+def _tier(path: Path, fanout: int) -> int:
+    """Return the size tier of a segment file."""
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return -1
+    if size <= MERGE_FLOOR_BYTES:
+        return 0
+    return 1 + int(math.log(size / MERGE_FLOOR_BYTES, max(fanout, 2)))
+
+
+def _tier_run(
+    segments: List[Tuple[int, int, Path]], threshold: int
+) -> Optional[List[Tuple[int, int, Path]]]:
+    """Return the oldest run of at least threshold adjacent segments of one tier."""
+    threshold = max(threshold, 2)
+    run: List[Tuple[int, int, Path]] = []
+    run_tier = None
+    for segment in segments:
+        tier = _tier(segment[2], threshold)
+        if tier != run_tier:
+            if len(run) >= threshold:
+                return run
+            run, run_tier = [], tier
+        run.append(segment)
+    return run if len(run) >= threshold else None
+
+
+def _read_segment(path: Path) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+    with open(path, "r", encoding="utf-8") as handle:
+        return [(key, document) for key, document in json.load(handle)]
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON to a temp file, fsync it and rename it over path."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".seg-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, separators=(",", ":"))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+_stores: Dict[str, InvertedIndexStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_index_store(runtime: Any) -> Optional[Any]:
+    """Return runtime.index_store, or the store opened in the configured index directory."""
+    store = getattr(runtime, "index_store", None)
+    if store is not None:
+        return store
+    directory = getattr(runtime, "index_dir", None) or os.getenv("PACKAGEREPO_INDEX_DIR")
+    if not directory:
+        return None
+    directory = str(Path(directory).resolve())
+    with _stores_lock:
+        if directory not in _stores:
+            _stores[directory] = InvertedIndexStore(directory, getattr(runtime, "index_fields", None))
+        return _stores[directory]
@@ -3,6 +3,7 @@
 from typing import Dict, Any
 
 from ...base import NodeExecutor
+from ..index_store import get_index_store
 
 
 class IndexUpsert(NodeExecutor):
@@ -30,7 +31,8 @@ class IndexUpsert(NodeExecutor):
         if not isinstance(document, dict):
             return {"error": "document must be a dictionary"}
 
-        if not runtime or not hasattr(runtime, "index_store"):
+        index_store = get_index_store(runtime) if runtime else None
+        if index_store is None:
             return {"error": "index_store not available in runtime"}
 
         try:
@@ -39,7 +41,7 @@ class IndexUpsert(NodeExecutor):
             # - index_name: name of the index
             # - key: unique identifier for the document
             # - document: dictionary of fields to index
-            runtime.index_store.upsert(index_name, key, document)
+            index_store.upsert(index_name, key, document)
 
             return {"result": {"success": True, "index": index_name, "key": key}}
 
@@ -0,0 +1,7 @@
+"""Factory for IndexUpsertBatch plugin."""
+
+from .index_upsert_batch import IndexUpsertBatch
+
+
+def create():
+    return IndexUpsertBatch()
@@ -0,0 +1,52 @@
+"""Workflow plugin: upsert several entries in index store."""
+
+from typing import Dict, Any
+
+from ...base import NodeExecutor
+from ..index_store import get_index_store
+
+
+class IndexUpsertBatch(NodeExecutor):
+    """Upsert several entries in index store."""
+
+    node_type = "packagerepo.index_upsert_batch"
+    category = "packagerepo"
+    description = "Upsert several entries in index store"
+
+    def execute(self, inputs: Dict[str, Any], runtime: Any = None) -> Dict[str, Any]:
+        """Upsert entries as one batch.
+
+        Inputs:
+            index_name: Name of the index
+            documents: Dictionary of key -> document
+        """
+        index_name = inputs.get("index_name")
+        documents = inputs.get("documents")
+
+        if not index_name:
+            return {"error": "index_name is required"}
+
+        if not documents:
+            return {"error": "documents is required"}
+
+        if not isinstance(documents, dict):
+            return {"error": "documents must be a dictionary of key -> document"}
+
+        if any(not key or not isinstance(document, dict) for key, document in documents.items()):
+            return {"error": "each document must be a dictionary under a non-empty key"}
+
+        index_store = get_index_store(runtime) if runtime else None
+        if index_store is None:
+            return {"error": "index_store not available in runtime"}
+
+        try:
+            if hasattr(index_store, "upsert_batch"):
+                index_store.upsert_batch(index_name, list(documents.items()))
+            else:
+                for key, document in documents.items():
+                    index_store.upsert(index_name, key, document)
+
+            return {"result": {"success": True, "index": index_name, "count": len(documents)}}
+
+        except Exception as e:
+            return {"error": f"failed to upsert index entries: {str(e)}", "error_code": "INDEX_UPSERT_BATCH_FAILED"}
@@ -0,0 +1,243 @@
+"""In-process read-through cache in front of a key-value store.
+
+CachedKVStore keeps already-decoded values, so a hot key such as a package
+manifest costs one dictionary lookup instead of a store read and a
+``json.loads``. Entries live for at most ``ttl`` seconds, the cache holds
+at most ``max_entries`` keys and evicts the least recently used first, and
+missing keys are cached too. Writes through the wrapper (``put``,
+``delete``, ``write_batch``) invalidate the keys they touch; writes that
+bypass it, from another process say, are seen once the TTL expires.
+
+Dicts and lists are cached in ``marshal`` form and each read builds a
+fresh copy, so a caller that mutates its result never changes what other
+readers see; unmarshalling is still cheaper than a store read and
+``json.loads``.
+"""
+
+import copy
+import marshal
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL = 30.0
+
+_MISSING = object()
+
+
+class _Packed(bytes):
+    """A decoded dict or list held in the cache in marshal form."""
+
+
+class CachedKVStore:
+    """Size-bounded LRU of decoded values with TTL over any kv_store.
+
+    Methods other than the write methods and the ``*_decoded`` readers are
+    passed to the wrapped store unchanged.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.store = store
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a read started before it must not be cached
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "store":
+            raise AttributeError(name)
+        return getattr(self.store, name)
+
+    def get_decoded(self, key: bytes, decode: Callable[[bytes], Any]) -> Tuple[bool, Any]:
+        """Return (found, decoded value) for key, reading through on a miss."""
+        cached = self._lookup(key)
+        if cached is not _MISSING:
+            return _result(cached)
+        generation = self._generation
+        value_bytes = self.store.get(key)
+        if value_bytes is None:
+            self._insert({key: None}, generation)
+            return False, None
+        value = decode(value_bytes)
+        self._insert({key: (_pack(value),)}, generation)
+        return True, value
+
+    def get_many_decoded(self, keys: List[bytes], decode: Callable[[bytes], Any]) -> List[Tuple[bool, Any]]:
+        """Return (found, decoded value) for each key, reading misses in one call."""
+        results: List[Optional[Tuple[bool, Any]]] = []
+        pending: List[int] = []
+        for key in keys:
+            cached = self._lookup(key)
+            if cached is _MISSING:
+                results.append(None)
+                pending.append(len(results) - 1)
+            else:
+                results.append(_result(cached))
+        if not pending:
+            return results
+
+        generation = self._generation
+        missing_keys = [keys[position] for position in pending]
+        if hasattr(self.store, "multi_get"):
+            values_bytes = self.store.multi_get(missing_keys)
+        else:
+            values_bytes = [self.store.get(key) for key in missing_keys]
+        loaded = {}
+        for position, key, value_bytes in zip(pending, missing_keys, values_bytes):
+            if value_bytes is None:
+                loaded[key] = None
+                results[position] = (False, None)
+            else:
+                value = decode(value_bytes)
+                loaded[key] = (_pack(value),)
+                results[position] = (True, value)
+        self._insert(loaded, generation)
+        return results
+
+    def put(self, key: bytes, value: bytes) -> None:
+        """Write to the store and drop the cached value."""
+        try:
+            self.store.put(key, value)
+        finally:
+            self.invalidate([key])
+
+    def delete(self, key: bytes) -> None:
+        """Delete from the store and drop the cached value."""
+        try:
+            self.store.delete(key)
+        finally:
+            self.invalidate([key])
+
+    def write_batch(self, operations: Iterable[Tuple[bytes, Optional[bytes]]]) -> None:
+        """Apply a batch to the store and drop the cached values of its keys."""
+        operations = list(operations)
+        try:
+            if hasattr(self.store, "write_batch"):
+                self.store.write_batch(operations)
+            else:
+                for key, value in operations:
+                    if value is None:
+                        self.store.delete(key)
+                    else:
+                        self.store.put(key, value)
+        finally:
+            self.invalidate([key for key, _ in operations])
+
+    def invalidate(self, keys: Optional[Iterable[bytes]] = None) -> None:
+        """Drop the given keys, or every entry when keys is None."""
+        with self._lock:
+            self._generation += 1
+            if keys is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                return
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache metrics."""
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": self.hit_ratio,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _lookup(self, key: bytes) -> Any:
+        """Return (value,) or None for a cached missing key; _MISSING if not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _insert(self, values: Dict[bytes, Any], generation: int) -> None:
+        with self._lock:
+            if generation != self._generation or self.max_entries <= 0:
+                return
+            expires_at = self.clock() + self.ttl
+            for key, value in values.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+def _pack(value: Any) -> Any:
+    """Return the form in which a freshly decoded value is cached."""
+    if isinstance(value, (dict, list)):
+        try:
+            return _Packed(marshal.dumps(value))
+        except ValueError:
+            # Holds objects marshal cannot write; copied on each read instead
+            return copy.deepcopy(value)
+    return value
+
+
+def _result(cached: Optional[Tuple[Any]]) -> Tuple[bool, Any]:
+    """Turn a cached (value,) or None into (found, a value the caller owns)."""
+    if cached is None:
+        return False, None
+    value = cached[0]
+    if isinstance(value, _Packed):
+        return True, marshal.loads(value)
+    if isinstance(value, (dict, list)):
+        return True, copy.deepcopy(value)
+    return True, value
+
+
+def get_decoded(store: Any, key: bytes, decode: Callable[[bytes], Any]) -> Tuple[bool, Any]:
+    """Read and decode one key, through the cache when store has one."""
+    if isinstance(store, CachedKVStore):
+        return store.get_decoded(key, decode)
+    value_bytes = store.get(key)
+    return (False, None) if value_bytes is None else (True, decode(value_bytes))
+
+
+def get_many_decoded(store: Any, keys: List[bytes], decode: Callable[[bytes], Any]) -> List[Tuple[bool, Any]]:
+    """Read and decode several keys, through the cache when store has one."""
+    if isinstance(store, CachedKVStore):
+        return store.get_many_decoded(keys, decode)
+    if hasattr(store, "multi_get"):
+        values_bytes = store.multi_get(keys)
+    else:
+        values_bytes = [store.get(key) for key in keys]
+    return [(False, None) if value is None else (True, decode(value)) for value in values_bytes]
@@ -1,9 +1,10 @@
 """Workflow plugin: get value from RocksDB key-value store."""
 
 from typing import Dict, Any
-import json
 
 from ...base import NodeExecutor
+from ..kv_cache import get_decoded
+from ..kv_store import decode_value, get_kv_store
 
 
 class KvGet(NodeExecutor):
@@ -20,24 +21,15 @@ class KvGet(NodeExecutor):
         if not key:
             return {"error": "key is required"}
 
-        if not runtime or not hasattr(runtime, "kv_store"):
+        kv_store = get_kv_store(runtime) if runtime else None
+        if kv_store is None:
             return {"error": "kv_store not available in runtime"}
 
         try:
-            # Get value from KV store
-            value_bytes = runtime.kv_store.get(key.encode("utf-8"))
+            # Get value from KV store, or its in-process cache
+            found, value = get_decoded(kv_store, key.encode("utf-8"), decode_value)
 
-            if value_bytes is None:
-                return {"result": {"found": False, "value": None}}
-
-            # Try to decode as JSON
-            try:
-                value = json.loads(value_bytes.decode("utf-8"))
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                # Return raw bytes as string if not JSON
-                value = value_bytes.decode("utf-8", errors="replace")
-
-            return {"result": {"found": True, "value": value}}
+            return {"result": {"found": found, "value": value}}
 
         except Exception as e:
             return {"error": f"failed to get value: {str(e)}", "error_code": "KV_GET_FAILED"}
@@ -0,0 +1,7 @@
+"""Factory for KvMultiGet plugin."""
+
+from .kv_multi_get import KvMultiGet
+
+
+def create():
+    return KvMultiGet()
@@ -0,0 +1,44 @@
+"""Workflow plugin: get several values from key-value store."""
+
+from typing import Dict, Any
+
+from ...base import NodeExecutor
+from ..kv_cache import get_many_decoded
+from ..kv_store import decode_value, get_kv_store
+
+
+class KvMultiGet(NodeExecutor):
+    """Get several values from key-value store."""
+
+    node_type = "packagerepo.kv_multi_get"
+    category = "packagerepo"
+    description = "Get several values from key-value store"
+
+    def execute(self, inputs: Dict[str, Any], runtime: Any = None) -> Dict[str, Any]:
+        """Get values for a list of keys in one store call."""
+        keys = inputs.get("keys")
+
+        if not keys:
+            return {"error": "keys is required"}
+
+        if not isinstance(keys, list) or not all(isinstance(key, str) and key for key in keys):
+            return {"error": "keys must be a list of non-empty strings"}
+
+        kv_store = get_kv_store(runtime) if runtime else None
+        if kv_store is None:
+            return {"error": "kv_store not available in runtime"}
+
+        try:
+            results = get_many_decoded(kv_store, [key.encode("utf-8") for key in keys], decode_value)
+
+            values = {}
+            missing = []
+            for key, (found, value) in zip(keys, results):
+                if not found:
+                    missing.append(key)
+                values[key] = value
+
+            return {"result": {"values": values, "found": len(keys) - len(missing), "missing": missing}}
+
+        except Exception as e:
+            return {"error": f"failed to get values: {str(e)}", "error_code": "KV_MULTI_GET_FAILED"}
@@ -1,9 +1,9 @@
 """Workflow plugin: put value in RocksDB key-value store."""
 
 from typing import Dict, Any
-import json
 
 from ...base import NodeExecutor
+from ..kv_store import encode_value, get_kv_store
 
 
 class KvPut(NodeExecutor):
@@ -24,24 +24,13 @@ class KvPut(NodeExecutor):
         if value is None:
             return {"error": "value is required"}
 
-        if not runtime or not hasattr(runtime, "kv_store"):
+        kv_store = get_kv_store(runtime) if runtime else None
+        if kv_store is None:
             return {"error": "kv_store not available in runtime"}
 
         try:
-            # Convert value to bytes
-            if isinstance(value, (dict, list)):
-                # Serialize JSON objects
-                value_bytes = json.dumps(value).encode("utf-8")
-            elif isinstance(value, str):
-                value_bytes = value.encode("utf-8")
-            elif isinstance(value, bytes):
-                value_bytes = value
-            else:
-                # Convert other types to string
-                value_bytes = str(value).encode("utf-8")
-
             # Put value in KV store
-            runtime.kv_store.put(key.encode("utf-8"), value_bytes)
+            kv_store.put(key.encode("utf-8"), encode_value(value))
 
             return {"result": {"success": True, "key": key}}
 
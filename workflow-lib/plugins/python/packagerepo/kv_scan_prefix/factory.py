@@ -0,0 +1,7 @@
+"""Factory for KvScanPrefix plugin."""
+
+from .kv_scan_prefix import KvScanPrefix
+
+
+def create():
+    return KvScanPrefix()
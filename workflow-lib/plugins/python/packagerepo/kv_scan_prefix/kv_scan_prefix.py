@@ -0,0 +1,48 @@
+"""Workflow plugin: list key-value entries by key prefix."""
+
+from typing import Dict, Any
+
+from ...base import NodeExecutor
+from ..kv_store import decode_value, get_kv_store
+
+
+class KvScanPrefix(NodeExecutor):
+    """List key-value entries by key prefix."""
+
+    node_type = "packagerepo.kv_scan_prefix"
+    category = "packagerepo"
+    description = "List key-value entries by key prefix"
+
+    def execute(self, inputs: Dict[str, Any], runtime: Any = None) -> Dict[str, Any]:
+        """List entries whose key starts with prefix, sorted by key."""
+        prefix = inputs.get("prefix")
+        limit = inputs.get("limit")
+
+        if prefix is None:
+            return {"error": "prefix is required"}
+
+        if not isinstance(prefix, str):
+            return {"error": "prefix must be a string"}
+
+        if limit is not None and (not isinstance(limit, int) or limit < 0):
+            return {"error": "limit must be a non-negative integer"}
+
+        kv_store = get_kv_store(runtime) if runtime else None
+        if kv_store is None:
+            return {"error": "kv_store not available in runtime"}
+
+        if not hasattr(kv_store, "scan_prefix"):
+            return {"error": "kv_store does not support prefix scans", "error_code": "KV_SCAN_UNSUPPORTED"}
+
+        try:
+            entries = kv_store.scan_prefix(prefix.encode("utf-8"), limit)
+
+            items = [
+                {"key": key.decode("utf-8", errors="replace"), "value": decode_value(value)}
+                for key, value in entries
+            ]
+
+            return {"result": {"items": items, "count": len(items)}}
+
+        except Exception as e:
+            return {"error": f"failed to scan prefix: {str(e)}", "error_code": "KV_SCAN_PREFIX_FAILED"}
@@ -0,0 +1,407 @@
+"""Key-value storage for the packagerepo plugins.
+
+The kv_* plugins use ``runtime.kv_store`` when the host provides one.
+Otherwise ``get_kv_store`` opens a store in ``runtime.kv_dir`` (or
+``PACKAGEREPO_KV_DIR``): RocksDB through the ``rocksdb`` bindings when they
+are installed, else the bundled ``LogKVStore``. Either way the store is
+wrapped in a kv_cache.CachedKVStore when ``runtime.kv_cache`` (a dict with
+``max_entries`` and ``ttl``) or ``PACKAGEREPO_KV_CACHE_ENTRIES`` asks for one.
+
+LogKVStore is an append-only log with an in-memory hash index from key to
+the value's position in the log, plus a sorted list of the keys for prefix
+scans. Every write, single or batched, is one
+record guarded by a CRC32 and followed by one fsync, so a batch is atomic
+and durable at the cost of a single fsync. On open, the log is replayed and
+a torn trailing record from a crash is cut off. When superseded values
+make up enough of the log, it is compacted by rewriting the live entries
+to a new file that atomically replaces the old one.
+
+Record layout (big-endian)::
+
+    crc32:u32  length:u32  payload[length]
+    payload = count:u32 entry*
+    entry   = op:u8  key_len:u32  value_len:u32  key  value
+"""
+
+import bisect
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .kv_cache import DEFAULT_TTL, CachedKVStore
+
+logger = logging.getLogger("autometabuilder")
+
+LOG_NAME = "data.log"
+DEFAULT_COMPACT_RATIO = 0.5
+DEFAULT_COMPACT_MIN_BYTES = 4 * 1024 * 1024
+COMPACT_BATCH_BYTES = 1024 * 1024
+
+OP_PUT = 1
+OP_DELETE = 2
+
+_HEADER = struct.Struct(">II")
+_COUNT = struct.Struct(">I")
+_ENTRY = struct.Struct(">BII")
+
+Operation = Tuple[bytes, Optional[bytes]]
+
+
+class LogKVStore:
+    """Embedded key-value store on an append-only log.
+
+    The interface follows the RocksDB bindings (``get``/``put``/``delete``
+    on bytes) and adds ``multi_get``, ``write_batch`` and ``scan_prefix``.
+    """
+
+    def __init__(
+        self,
+        directory: Any,
+        sync: bool = True,
+        compact_ratio: float = DEFAULT_COMPACT_RATIO,
+        compact_min_bytes: int = DEFAULT_COMPACT_MIN_BYTES
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / LOG_NAME
+        self.sync = sync
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+        self._lock = threading.RLock()
+        # key -> (value offset in the log, value length, entry size)
+        self._index: Dict[bytes, Tuple[int, int, int]] = {}
+        # Sorted keys of _index; None while _replay rebuilds the index
+        self._keys: Optional[List[bytes]] = []
+        self._garbage = 0
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._size = self._replay()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """Return the value of key, or None if it is not set."""
+        with self._lock:
+            return self._read(self._index.get(key))
+
+    def multi_get(self, keys: Iterable[bytes]) -> List[Optional[bytes]]:
+        """Return the values of keys in order, None for missing keys."""
+        with self._lock:
+            return [self._read(self._index.get(key)) for key in keys]
+
+    def put(self, key: bytes, value: bytes) -> None:
+        """Set key to value."""
+        self.write_batch([(key, value)])
+
+    def delete(self, key: bytes) -> None:
+        """Remove key if it is set."""
+        self.write_batch([(key, None)])
+
+    def write_batch(self, operations: Iterable[Operation]) -> None:
+        """Apply (key, value) puts and (key, None) deletes atomically."""
+        operations = [(bytes(key), None if value is None else bytes(value)) for key, value in operations]
+        if not operations:
+            return
+        record = _encode_record(operations)
+
+        with self._lock:
+            self._write(record)
+            self._apply(record[_HEADER.size:], self._size + _HEADER.size)
+            self._size += len(record)
+            self._maybe_compact()
+
+    def scan_prefix(self, prefix: bytes, limit: Optional[int] = None) -> List[Tuple[bytes, bytes]]:
+        """Return (key, value) pairs whose key starts with prefix, sorted by key."""
+        with self._lock:
+            keys = self._keys
+            end = len(keys) if limit is None else max(limit, 0)
+            items = []
+            for position in range(bisect.bisect_left(keys, prefix), len(keys)):
+                key = keys[position]
+                if len(items) >= end or not key.startswith(prefix):
+                    break
+                items.append((key, self._read(self._index[key])))
+            return items
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._index
+
+    def compact(self) -> None:
+        """Rewrite the log with only the live entries."""
+        with self._lock:
+            tmp_path = self.path.with_suffix(".compact")
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                batch: List[Operation] = []
+                batch_bytes = 0
+                for key in self._index:
+                    value = self._read(self._index[key])
+                    batch.append((key, value))
+                    batch_bytes += len(key) + len(value)
+                    if batch_bytes >= COMPACT_BATCH_BYTES:
+                        _write_all(fd, _encode_record(batch))
+                        batch, batch_bytes = [], 0
+                if batch:
+                    _write_all(fd, _encode_record(batch))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+            before = self._size
+            os.replace(tmp_path, self.path)
+            _fsync_dir(self.directory)
+            os.close(self._fd)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND)
+            self._size = self._replay()
+            logger.info("Compacted KV log %s from %d to %d bytes", self.path, before, self._size)
+
+    def close(self) -> None:
+        """Close the log file."""
+        with self._lock:
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+
+    def _read(self, location: Optional[Tuple[int, int, int]]) -> Optional[bytes]:
+        if location is None:
+            return None
+        offset, length, _ = location
+        return os.pread(self._fd, length, offset)
+
+    def _write(self, record: bytes) -> None:
+        try:
+            _write_all(self._fd, record)
+            if self.sync:
+                os.fsync(self._fd)
+        except OSError:
+            # Drop a partial record so the next write does not follow garbage
+            os.ftruncate(self._fd, self._size)
+            raise
+
+    def _apply(self, payload: bytes, payload_offset: int) -> None:
+        """Update the index from one record payload."""
+        (count,) = _COUNT.unpack_from(payload, 0)
+        position = _COUNT.size
+        for _ in range(count):
+            op, key_len, value_len = _ENTRY.unpack_from(payload, position)
+            key_start = position + _ENTRY.size
+            key = payload[key_start:key_start + key_len]
+            entry_size = _ENTRY.size + key_len + value_len
+            previous = self._index.pop(key, None)
+            if previous is not None:
+                self._garbage += previous[2]
+            if op == OP_PUT:
+                self._index[key] = (payload_offset + key_start + key_len, value_len, entry_size)
+                if previous is None and self._keys is not None:
+                    bisect.insort(self._keys, key)
+            else:
+                self._garbage += entry_size
+                if previous is not None and self._keys is not None:
+                    del self._keys[bisect.bisect_left(self._keys, key)]
+            position += entry_size
+
+    def _replay(self) -> int:
+        """Rebuild the index from the log; returns the end of the last valid record."""
+        self._index = {}
+        self._keys = None
+        self._garbage = 0
+        size = os.fstat(self._fd).st_size
+        offset = 0
+        while offset + _HEADER.size <= size:
+            crc, length = _HEADER.unpack(os.pread(self._fd, _HEADER.size, offset))
+            if offset + _HEADER.size + length > size:
+                break
+            payload = os.pread(self._fd, length, offset + _HEADER.size)
+            if zlib.crc32(payload) != crc:
+                break
+            self._apply(payload, offset + _HEADER.size)
+            offset += _HEADER.size + length
+        if offset < size:
+            logger.warning("Discarding %d bytes of incomplete records at the end of %s", size - offset, self.path)
+            os.ftruncate(self._fd, offset)
+        # One sort here instead of an insertion per replayed key
+        self._keys = sorted(self._index)
+        return offset
+
+    def _maybe_compact(self) -> None:
+        if self._garbage >= self.compact_min_bytes and self._garbage >= self.compact_ratio * self._size:
+            self.compact()
+
+
+def _encode_record(operations: List[Operation]) -> bytes:
+    """Encode (key, value) puts and (key, None) deletes as one log record."""
+    payload = [_COUNT.pack(len(operations))]
+    for key, value in operations:
+        op = OP_DELETE if value is None else OP_PUT
+        payload.append(_ENTRY.pack(op, len(key), len(value or b"")) + key + (value or b""))
+    payload = b"".join(payload)
+    return _HEADER.pack(zlib.crc32(payload), len(payload)) + payload
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist a rename by syncing its directory, where the OS allows it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class RocksDBStore:
+    """The LogKVStore interface over the ``rocksdb`` bindings."""
+
+    def __init__(self, directory: Any):
+        import rocksdb
+
+        self._rocksdb = rocksdb
+        self.db = rocksdb.DB(str(directory), rocksdb.Options(create_if_missing=True))
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self.db.get(key)
+
+    def multi_get(self, keys: Iterable[bytes]) -> List[Optional[bytes]]:
+        keys = list(keys)
+        values = self.db.multi_get(keys)
+        return [values.get(key) for key in keys]
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self.db.put(key, value, sync=True)
+
+    def delete(self, key: bytes) -> None:
+        self.db.delete(key, sync=True)
+
+    def write_batch(self, operations: Iterable[Operation]) -> None:
+        batch = self._rocksdb.WriteBatch()
+        for key, value in operations:
+            if value is None:
+                batch.delete(key)
+            else:
+                batch.put(key, value)
+        self.db.write(batch, sync=True)
+
+    def scan_prefix(self, prefix: bytes, limit: Optional[int] = None) -> List[Tuple[bytes, bytes]]:
+        items = []
+        iterator = self.db.iteritems()
+        iterator.seek(prefix)
+        for key, value in iterator:
+            if not key.startswith(prefix) or (limit is not None and len(items) >= limit):
+                break
+            items.append((key, value))
+        return items
+
+
+def open_kv_store(directory: Any) -> Any:
+    """Open RocksDB in directory if the bindings are installed, else a LogKVStore."""
+    try:
+        return RocksDBStore(directory)
+    except ImportError:
+        return LogKVStore(directory)
+
+
+_stores: Dict[str, Any] = {}
+# Caches over the stores in _stores, by directory; caches over a host's
+# runtime.kv_store are kept on the runtime instead
+_caches: Dict[str, CachedKVStore] = {}
+_stores_lock = threading.Lock()
+_RUNTIME_CACHE_ATTR = "_kv_cache_store"
+
+
+def _cache_settings(runtime: Any) -> Tuple[int, float]:
+    """Read the cache size and TTL from runtime.kv_cache or the environment."""
+    settings = getattr(runtime, "kv_cache", None) or {}
+    max_entries = settings.get("max_entries", os.getenv("PACKAGEREPO_KV_CACHE_ENTRIES"))
+    ttl = settings.get("ttl", os.getenv("PACKAGEREPO_KV_CACHE_TTL"))
+    return int(max_entries or 0), float(ttl) if ttl not in (None, "") else DEFAULT_TTL
+
+
+def get_kv_store(runtime: Any) -> Optional[Any]:
+    """Return runtime.kv_store, or a store opened in the configured KV directory.
+
+    The store comes wrapped in its shared CachedKVStore when caching is on;
+    the cache is replaced when its size or TTL setting changes.
+    """
+    directory = None
+    store = getattr(runtime, "kv_store", None)
+    if store is None:
+        directory = getattr(runtime, "kv_dir", None) or os.getenv("PACKAGEREPO_KV_DIR")
+        if not directory:
+            return None
+        directory = str(Path(directory).resolve())
+        with _stores_lock:
+            if directory not in _stores:
+                _stores[directory] = open_kv_store(directory)
+            store = _stores[directory]
+    if isinstance(store, CachedKVStore):
+        return store
+
+    max_entries, ttl = _cache_settings(runtime)
+    with _stores_lock:
+        if directory is None:
+            cache = getattr(runtime, _RUNTIME_CACHE_ATTR, None)
+        else:
+            cache = _caches.get(directory)
+        if max_entries <= 0:
+            cache = None
+        elif cache is None or cache.store is not store or (cache.max_entries, cache.ttl) != (max_entries, ttl):
+            cache = CachedKVStore(store, max_entries, ttl)
+
+        if directory is None:
+            setattr(runtime, _RUNTIME_CACHE_ATTR, cache)
+        elif cache is None:
+            _caches.pop(directory, None)
+        else:
+            _caches[directory] = cache
+    return store if cache is None else cache
+
+
+def write_batch(store: Any, operations: List[Operation]) -> None:
+    """Apply a batch atomically; stores without write_batch apply it key by key."""
+    if hasattr(store, "write_batch"):
+        store.write_batch(operations)
+        return
+    logger.warning("KV store %s has no write_batch; applying %d writes one at a time",
+                   type(store).__name__, len(operations))
+    for key, value in operations:
+        if value is None:
+            store.delete(key)
+        else:
+            store.put(key, value)
+
+
+def encode_value(value: Any) -> bytes:
+    """Convert a node input value to stored bytes."""
+    if isinstance(value, (dict, list)):
+        # Serialize JSON objects
+        return json.dumps(value).encode("utf-8")
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    if isinstance(value, bytes):
+        return value
+    # Convert other types to string
+    return str(value).encode("utf-8")
+
+
+def decode_value(value_bytes: bytes) -> Any:
+    """Convert stored bytes back to JSON data, or text if they are not JSON."""
+    try:
+        return json.loads(value_bytes.decode("utf-8"))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        # Return raw bytes as string if not JSON
+        return value_bytes.decode("utf-8", errors="replace")
@@ -0,0 +1,7 @@
+"""Factory for KvWriteBatch plugin."""
+
+from .kv_write_batch import KvWriteBatch
+
+
+def create():
+    return KvWriteBatch()
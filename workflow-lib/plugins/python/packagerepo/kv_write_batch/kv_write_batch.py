@@ -0,0 +1,50 @@
+"""Workflow plugin: write several keys to key-value store atomically."""
+
+from typing import Dict, Any
+
+from ...base import NodeExecutor
+from ..kv_store import encode_value, get_kv_store, write_batch
+
+
+class KvWriteBatch(NodeExecutor):
+    """Write several keys to key-value store atomically."""
+
+    node_type = "packagerepo.kv_write_batch"
+    category = "packagerepo"
+    description = "Write several keys to key-value store atomically"
+
+    def execute(self, inputs: Dict[str, Any], runtime: Any = None) -> Dict[str, Any]:
+        """Apply puts and deletes as one batch with a single fsync.
+
+        Inputs:
+            puts: Dictionary of key -> value to set
+            deletes: List of keys to remove
+        """
+        puts = inputs.get("puts") or {}
+        deletes = inputs.get("deletes") or []
+
+        if not isinstance(puts, dict):
+            return {"error": "puts must be a dictionary"}
+
+        if not isinstance(deletes, list) or not all(isinstance(key, str) and key for key in deletes):
+            return {"error": "deletes must be a list of non-empty strings"}
+
+        if not puts and not deletes:
+            return {"error": "puts or deletes is required"}
+
+        if any(not key for key in puts) or any(value is None for value in puts.values()):
+            return {"error": "puts must map non-empty keys to values"}
+
+        kv_store = get_kv_store(runtime) if runtime else None
+        if kv_store is None:
+            return {"error": "kv_store not available in runtime"}
+
+        try:
+            operations = [(key.encode("utf-8"), encode_value(value)) for key, value in puts.items()]
+            operations.extend((key.encode("utf-8"), None) for key in deletes)
+            write_batch(kv_store, operations)
+
+            return {"result": {"success": True, "written": len(puts), "deleted": len(deletes)}}
+
+        except Exception as e:
+            return {"error": f"failed to write batch: {str(e)}", "error_code": "KV_WRITE_BATCH_FAILED"}
@@ -0,0 +1 @@
+"""Normalize entity plugin."""
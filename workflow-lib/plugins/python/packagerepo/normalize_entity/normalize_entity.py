@@ -1,9 +1,18 @@
 """Workflow plugin: normalize entity fields."""
 
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from ...base import NodeExecutor
 
+_STRING_OPERATIONS = (
+    ("trim", str.strip),
+    ("lowercase", str.lower),
+    ("uppercase", str.upper),
+    ("title", str.title),
+)
+# (field, string operations in order, unique, sort)
+_FieldRule = Tuple[str, List[Callable[[str], str]], bool, bool]
+
 
 class NormalizeEntity(NodeExecutor):
     """Normalize entity fields (trim, lowercase, etc.)."""
@@ -15,52 +24,78 @@ class NormalizeEntity(NodeExecutor):
     def execute(self, inputs: Dict[str, Any], runtime: Any = None) -> Dict[str, Any]:
         """Normalize entity fields."""
         entity = inputs.get("entity")
-        rules = inputs.get("rules", {})
-
-        if not entity:
-            return {"error": "entity is required"}
-
-        if not isinstance(entity, dict):
-            return {"error": "entity must be a dictionary"}
-
-        # Clone entity to avoid mutation
-        normalized = entity.copy()
-
-        # Apply normalization rules
-        for field, operations in rules.items():
-            if field not in normalized:
+        error = _check_entity(entity)
+        if error:
+            return error
+        return _normalize(entity, _compile_rules(inputs.get("rules", {})))
+
+    def execute_batch(self, items: List[Dict[str, Any]], runtime: Any = None) -> List[Dict[str, Any]]:
+        """Normalize many entities, compiling each distinct rules object once."""
+        # Keyed by id(), so keep each rules object referenced while its plan is
+        compiled: Dict[int, Tuple[Any, List[_FieldRule]]] = {}
+        results = []
+        for item in items:
+            entity = item.get("entity")
+            error = _check_entity(entity)
+            if error:
+                results.append(error)
                 continue
-
-            value = normalized[field]
-
-            # Handle string operations
-            if isinstance(value, str):
-                if "trim" in operations:
-                    value = value.strip()
-                if "lowercase" in operations:
-                    value = value.lower()
-                if "uppercase" in operations:
-                    value = value.upper()
-                if "title" in operations:
-                    value = value.title()
-
-                normalized[field] = value
-
-            # Handle list operations
-            elif isinstance(value, list):
-                if "unique" in operations:
-                    # Remove duplicates while preserving order
-                    seen = set()
-                    unique_list = []
-                    for item in value:
-                        if item not in seen:
-                            seen.add(item)
-                            unique_list.append(item)
-                    value = unique_list
-
-                if "sort" in operations:
-                    value = sorted(value)
-
-                normalized[field] = value
-
-        return {"result": normalized}
+            rules = item.get("rules", {})
+            entry = compiled.get(id(rules))
+            if entry is None:
+                entry = compiled[id(rules)] = (rules, _compile_rules(rules))
+            results.append(_normalize(entity, entry[1]))
+        return results
+
+
+def _compile_rules(rules: Dict[str, Any]) -> List[_FieldRule]:
+    """Turn {field: operations} into (field, string ops, unique, sort) tuples."""
+    return [
+        (
+            field,
+            [operation for name, operation in _STRING_OPERATIONS if name in operations],
+            "unique" in operations,
+            "sort" in operations,
+        )
+        for field, operations in rules.items()
+    ]
+
+
+def _check_entity(entity: Any) -> Optional[Dict[str, str]]:
+    """Return an error result if entity is missing or not a dictionary."""
+    if not entity:
+        return {"error": "entity is required"}
+
+    if not isinstance(entity, dict):
+        return {"error": "entity must be a dictionary"}
+    return None
+
+
+def _normalize(entity: Dict[str, Any], plan: List[_FieldRule]) -> Dict[str, Any]:
+    """Apply compiled rules to a copy of entity."""
+    # Clone entity to avoid mutation
+    normalized = entity.copy()
+
+    for field, string_ops, unique, sort in plan:
+        if field not in normalized:
+            continue
+
+        value = normalized[field]
+
+        # Handle string operations
+        if isinstance(value, str):
+            for operation in string_ops:
+                value = operation(value)
+            normalized[field] = value
+
+        # Handle list operations
+        elif isinstance(value, list):
+            if unique:
+                # Remove duplicates while preserving order
+                seen = set()
+                value = [item for item in value if not (item in seen or seen.add(item))]
+            if sort:
+                value = sorted(value)
+            normalized[field] = value
+
+    return {"result": normalized}
@@ -0,0 +1,37 @@
+"""Tests for NormalizeEntity plugin."""
+
+import unittest
+
+from .normalize_entity import NormalizeEntity
+
+RULES = {"name": ["trim", "lowercase"], "tags": ["unique", "sort"], "title": ["title"]}
+
+
+class TestNormalizeEntity(unittest.TestCase):
+    """Test cases for single and batch normalization."""
+
+    def setUp(self):
+        """Set up the plugin."""
+        self.plugin = NormalizeEntity()
+
+    def test_execute(self):
+        """Test that string and list rules are applied to a copy of the entity."""
+        entity = {"name": "  MyPkg ", "tags": ["b", "a", "b"], "title": "hello world", "other": " x "}
+        result = self.plugin.execute({"entity": entity, "rules": RULES})
+        self.assertEqual(result["result"], {"name": "mypkg", "tags": ["a", "b"], "title": "Hello World", "other": " x "})
+        self.assertEqual(entity["name"], "  MyPkg ")
+
+    def test_batch_matches_execute(self):
+        """Test that execute_batch gives the same result and errors as execute per item."""
+        items = [
+            {"entity": {"name": " A ", "tags": [3, 1, 3]}, "rules": RULES},
+            {"entity": {"name": " B "}, "rules": {"name": ["uppercase"]}},
+            {"entity": None, "rules": RULES},
+            {"entity": ["not", "a", "dict"], "rules": RULES},
+            {"entity": {"name": " C "}, "rules": RULES},
+        ]
+        self.assertEqual(self.plugin.execute_batch(items), [self.plugin.execute(item) for item in items])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""Tests for serving blobs with range and conditional requests."""
+
+import shutil
+import tempfile
+import unittest
+
+from .blob_serving import RangeFile, RangeNotSatisfiable, parse_range, prepare_blob_response
+from .blob_store import BlobStore
+
+DATA = bytes(range(100))
+
+
+class TestParseRange(unittest.TestCase):
+    """Test cases for parse_range."""
+
+    def test_table(self):
+        """Test that each Range header maps to its inclusive byte range."""
+        cases = [
+            (None, 100, None),
+            ("", 100, None),
+            ("bytes=0-9", 100, (0, 9)),
+            ("bytes=90-", 100, (90, 99)),
+            ("bytes=-10", 100, (90, 99)),
+            ("bytes=-500", 100, (0, 99)),
+            ("bytes=50-500", 100, (50, 99)),
+            ("BYTES = 5 - 6", 100, (5, 6)),
+            ("bytes=0-1,5-6", 100, None),
+            ("bytes=9-3", 100, None),
+            ("bytes=-", 100, None),
+            ("items=0-9", 100, None),
+        ]
+        for header, size, expected in cases:
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, size), expected)
+
+    def test_unsatisfiable(self):
+        """Test that ranges outside the blob raise RangeNotSatisfiable."""
+        for header, size in [("bytes=100-", 100), ("bytes=150-200", 100), ("bytes=-0", 100),
+                             ("bytes=0-", 0), ("bytes=-5", 0)]:
+            with self.subTest(header=header, size=size), self.assertRaises(RangeNotSatisfiable):
+                parse_range(header, size)
+
+
+class TestPrepareBlobResponse(unittest.TestCase):
+    """Test cases for prepare_blob_response."""
+
+    def setUp(self):
+        """Set up a store holding a 100-byte blob and an empty one."""
+        self.root = tempfile.mkdtemp(prefix="blob-serving-test-")
+        self.store = BlobStore(self.root)
+        self.digest = self.store.put(DATA).digest
+        self.empty = self.store.put(b"").digest
+        self.etag = f'"sha256:{self.digest}"'
+
+    def tearDown(self):
+        """Remove the store directory."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def respond(self, digest=None, **kwargs):
+        return prepare_blob_response(self.store, digest or self.digest, **kwargs)
+
+    def test_table(self):
+        """Test status, range and length for range and conditional headers."""
+        stale = '"sha256:' + "0" * 64 + '"'
+        cases = [
+            ({}, 200, 0, 100, None),
+            ({"range_header": "bytes=10-19"}, 206, 10, 10, "bytes 10-19/100"),
+            ({"range_header": "bytes=-5"}, 206, 95, 5, "bytes 95-99/100"),
+            ({"range_header": "bytes=40-"}, 206, 40, 60, "bytes 40-99/100"),
+            ({"range_header": "bytes=0-4,10-14"}, 200, 0, 100, None),
+            ({"range_header": "bytes=100-"}, 416, 0, 0, "bytes */100"),
+            ({"range_header": "bytes=10-19", "if_range": self.etag}, 206, 10, 10, "bytes 10-19/100"),
+            ({"range_header": "bytes=10-19", "if_range": stale}, 200, 0, 100, None),
+            ({"range_header": "bytes=10-19", "if_range": f"W/{self.etag}"}, 200, 0, 100, None),
+        ]
+        for kwargs, status, offset, length, content_range in cases:
+            with self.subTest(**kwargs):
+                response = self.respond(**kwargs)
+                self.assertEqual(response.status, status)
+                self.assertEqual(response.headers["ETag"], self.etag)
+                self.assertEqual(response.headers.get("Content-Range"), content_range)
+                if status == 416:
+                    self.assertIsNone(response.path)
+                    continue
+                self.assertEqual((response.offset, response.length), (offset, length))
+                self.assertEqual(response.headers["Content-Length"], str(length))
+
+    def test_empty_blob(self):
+        """Test that any range of an empty blob is unsatisfiable but a plain GET is not."""
+        self.assertEqual(self.respond(self.empty).status, 200)
+        response = self.respond(self.empty, range_header="bytes=0-")
+        self.assertEqual(response.status, 416)
+        self.assertEqual(response.headers["Content-Range"], "bytes */0")
+
+    def test_if_none_match(self):
+        """Test that a matching If-None-Match, weak or in a list, yields 304 without a body."""
+        for header in (self.etag, f"W/{self.etag}", f'"other", {self.etag}', "*"):
+            with self.subTest(header=header):
+                response = self.respond(if_none_match=header, range_header="bytes=0-1")
+                self.assertEqual(response.status, 304)
+                self.assertNotIn("file", response.to_dict())
+        self.assertEqual(self.respond(if_none_match='"other"').status, 200)
+
+    def test_missing_blob(self):
+        """Test that an unknown digest returns None."""
+        self.assertIsNone(self.respond("f" * 64))
+
+
+class TestRangeFile(unittest.TestCase):
+    """Test cases for RangeFile."""
+
+    def setUp(self):
+        """Set up a file holding DATA."""
+        self.directory = tempfile.mkdtemp(prefix="range-file-test-")
+        self.path = f"{self.directory}/blob"
+        with open(self.path, "wb") as f:
+            f.write(DATA)
+
+    def tearDown(self):
+        """Remove the file."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_reads_stop_at_length(self):
+        """Test that reads of any size never go past the range."""
+        for size in (-1, None, 1, 3, 7, 1000):
+            with self.subTest(size=size):
+                handle = RangeFile(self.path, 10, 20)
+                chunks = []
+                while True:
+                    chunk = handle.read(size)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                handle.close()
+                self.assertEqual(b"".join(chunks), DATA[10:30])
+
+    def test_whole_file_from_offset(self):
+        """Test that without a length the rest of the file is read."""
+        handle = RangeFile(self.path, 95)
+        self.assertEqual(handle.read(), DATA[95:])
+        self.assertEqual(handle.read(), b"")
+        handle.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
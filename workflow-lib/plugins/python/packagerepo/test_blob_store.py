@@ -0,0 +1,122 @@
+"""Tests for the content-addressed blob store."""
+
+import base64
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from .blob_store import BlobStore
+
+
+class TestBlobStorePut(unittest.TestCase):
+    """Test cases for streaming blobs into the store."""
+
+    def setUp(self):
+        """Set up a store with a small chunk size."""
+        self.root = tempfile.mkdtemp(prefix="blob-store-test-")
+        self.store = BlobStore(self.root, chunk_size=4)
+
+    def tearDown(self):
+        """Remove the store directory."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def temp_files(self):
+        return os.listdir(self.store.tmp_dir)
+
+    def test_put_stores_by_digest(self):
+        """Test that content is stored under its SHA-256 digest."""
+        data = b"hello blob store"
+        info = self.store.put(data)
+        digest = hashlib.sha256(data).hexdigest()
+        self.assertEqual(info.digest, digest)
+        self.assertEqual(info.size, len(data))
+        self.assertEqual(info.path, self.store.path_for(digest))
+        self.assertEqual(info.path.read_bytes(), data)
+        self.assertTrue(info.created)
+
+    def test_duplicate_content_deduplicated(self):
+        """Test that storing the same content again keeps the first file."""
+        first = self.store.put(b"same bytes")
+        inode = first.path.stat().st_ino
+        second = self.store.put(["same ", "bytes"], "utf-8")
+        self.assertEqual(second.digest, first.digest)
+        self.assertFalse(second.created)
+        self.assertTrue(second.to_dict()["deduplicated"])
+        self.assertEqual(second.path.stat().st_ino, inode)
+        self.assertEqual(self.temp_files(), [])
+
+    def test_base64_split_across_chunks(self):
+        """Test that base64 text is decoded correctly whatever the chunk boundaries."""
+        data = bytes(range(256)) * 3
+        text = base64.encodebytes(data).decode("ascii")
+        pieces = [text[start:start + 7] for start in range(0, len(text), 7)]
+        info = self.store.put(pieces, "base64")
+        self.assertEqual(info.path.read_bytes(), data)
+        self.assertEqual(self.store.put(text, "base64").digest, info.digest)
+
+    def test_bad_base64_padding(self):
+        """Test that base64 text not padded to a multiple of 4 is rejected."""
+        with self.assertRaises(ValueError):
+            self.store.put("QUJD" + "RA", "base64")
+        self.assertEqual(self.temp_files(), [])
+
+    def test_file_objects(self):
+        """Test that binary and text file objects are read in chunks."""
+        data = b"binary file contents " * 10
+        self.assertEqual(self.store.put(io.BytesIO(data)).path.read_bytes(), data)
+        text = self.store.put(io.StringIO("text file"), "utf-8")
+        self.assertEqual(text.path.read_bytes(), b"text file")
+
+    def test_failing_iterator_removes_temp_file(self):
+        """Test that a source failing midway leaves neither a blob nor a temp file."""
+        def chunks():
+            yield b"partial "
+            yield b"data"
+            raise IOError("connection reset")
+
+        with self.assertRaises(IOError):
+            self.store.put(chunks())
+        self.assertEqual(self.temp_files(), [])
+        self.assertFalse((self.store.root / "sha256").exists())
+
+    def test_binary_encoding_rejects_text(self):
+        """Test that text chunks are refused when the encoding is binary."""
+        with self.assertRaises(TypeError):
+            self.store.put(["text"], "binary")
+        self.assertEqual(self.temp_files(), [])
+
+
+class TestBlobRefs(unittest.TestCase):
+    """Test cases for key references to blobs."""
+
+    def setUp(self):
+        """Set up a store."""
+        self.root = tempfile.mkdtemp(prefix="blob-refs-test-")
+        self.store = BlobStore(self.root)
+
+    def tearDown(self):
+        """Remove the store directory."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_ref_follows_latest_put(self):
+        """Test that a key resolves to the digest it was last pointed at."""
+        first = self.store.put(b"v1")
+        second = self.store.put(b"v2")
+        self.store.set_ref("pkg/1.0/archive.tgz", first.digest)
+        self.assertEqual(self.store.resolve_ref("pkg/1.0/archive.tgz"), first.digest)
+        self.store.set_ref("pkg/1.0/archive.tgz", f"sha256:{second.digest}")
+        self.assertEqual(self.store.resolve_ref("pkg/1.0/archive.tgz"), second.digest)
+        self.assertIsNone(self.store.resolve_ref("pkg/missing"))
+
+    def test_keys_outside_refs_rejected(self):
+        """Test that keys escaping the refs directory are refused."""
+        for key in ("", "/etc/passwd", "../escape", "a/../../b", "a\\b"):
+            with self.subTest(key=key), self.assertRaises(ValueError):
+                self.store.ref_path(key)
+
+
+if __name__ == "__main__":
+    unittest.main()
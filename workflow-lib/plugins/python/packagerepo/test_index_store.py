@@ -0,0 +1,111 @@
+"""Tests for the segment-merging inverted index store."""
+
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from . import index_store
+from .index_store import InvertedIndexStore
+
+
+def _document(number, size=1):
+    return {"name": f"package-{number}", "description": "padding " * size}
+
+
+class TestSegmentMerging(unittest.TestCase):
+    """Test cases for size-tiered segment merges."""
+
+    def setUp(self):
+        """Set up an index directory with a small merge floor."""
+        self.directory = tempfile.mkdtemp(prefix="index-store-test-")
+        floor = mock.patch.object(index_store, "MERGE_FLOOR_BYTES", 1024)
+        floor.start()
+        self.addCleanup(floor.stop)
+
+    def tearDown(self):
+        """Remove the index directory."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def open(self, threshold=4):
+        return InvertedIndexStore(self.directory, {"pkgs": ["name"]}, merge_threshold=threshold)
+
+    def segments(self):
+        return sorted(path.name for path in (Path(self.directory) / "pkgs").iterdir())
+
+    def test_small_segments_merged_without_large_one(self):
+        """Test that single upserts do not rewrite the large base segment."""
+        store = self.open()
+        store.upsert_batch("pkgs", [(f"p{n}", _document(n, size=50)) for n in range(50)])
+        base = Path(self.directory) / "pkgs" / "seg-00000001-00000001.json"
+        inode = base.stat().st_ino
+        for number in range(7):
+            store.upsert("pkgs", f"new{number}", _document(number))
+            store.close()
+        self.assertEqual(base.stat().st_ino, inode)
+        self.assertEqual(self.segments(), ["seg-00000001-00000001.json", "seg-00000002-00000008.json"])
+        self.assertEqual(self.open().count("pkgs"), 57)
+
+    def test_partial_merge_keeps_deletes(self):
+        """Test that a delete merged apart from its document stays applied."""
+        store = self.open()
+        store.upsert_batch("pkgs", [(f"p{n}", _document(n, size=50)) for n in range(50)])
+        store.delete("pkgs", "p0")
+        for number in range(3):
+            store.upsert("pkgs", f"new{number}", {"name": f"new-{number}"})
+        store.close()
+        self.assertEqual(len(self.segments()), 2)
+        reopened = self.open()
+        self.assertEqual(reopened.count("pkgs"), 52)
+        self.assertEqual(reopened.query("pkgs", "package-0", prefix=False)["total"], 0)
+
+    def test_full_merge(self):
+        """Test that merge leaves one segment of live documents."""
+        store = self.open(threshold=100)
+        store.upsert_batch("pkgs", [(f"p{n}", _document(n)) for n in range(5)])
+        store.delete("pkgs", "p1")
+        store.upsert("pkgs", "p2", {"name": "renamed"})
+        store.merge("pkgs")
+        self.assertEqual(self.segments(), ["seg-00000001-00000003.json"])
+        reopened = self.open()
+        self.assertEqual(reopened.count("pkgs"), 4)
+        self.assertEqual(reopened.query("pkgs", "renamed")["hits"][0]["key"], "p2")
+
+    def test_concurrent_writers(self):
+        """Test that writes racing with background merges lose nothing."""
+        store = self.open(threshold=3)
+
+        def write(worker):
+            for number in range(30):
+                store.upsert("pkgs", f"w{worker}-{number}", _document(number))
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.close()
+        self.assertEqual(self.open().count("pkgs"), 120)
+
+
+class TestDocumentCopies(unittest.TestCase):
+    """Test cases for isolating stored documents from callers."""
+
+    def test_stored_and_returned_documents_are_copies(self):
+        """Test that changing an upserted dict or a returned hit leaves the index unchanged."""
+        store = InvertedIndexStore(fields={"pkgs": ["name"]})
+        document = {"name": "left-pad", "tags": ["string"]}
+        store.upsert("pkgs", "p1", document)
+        document["tags"].append("changed")
+        document["name"] = "right-pad"
+
+        hit = store.query("pkgs", "left")["hits"][0]["document"]
+        self.assertEqual(hit, {"name": "left-pad", "tags": ["string"]})
+        hit["tags"].append("changed")
+        self.assertEqual(store.query("pkgs", "left")["hits"][0]["document"]["tags"], ["string"])
+
+
+if __name__ == "__main__":
+    unittest.main()
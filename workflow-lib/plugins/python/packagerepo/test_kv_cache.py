@@ -0,0 +1,121 @@
+"""Tests for the in-process KV cache and its registry."""
+
+import gc
+import shutil
+import tempfile
+import types
+import unittest
+import weakref
+from pathlib import Path
+
+from . import kv_store
+from .kv_cache import CachedKVStore, get_decoded, get_many_decoded
+from .kv_store import LogKVStore, decode_value, encode_value, get_kv_store
+
+
+class DictStore:
+    """Minimal kv_store over a dict, counting reads."""
+
+    def __init__(self):
+        self.data = {}
+        self.reads = 0
+
+    def get(self, key):
+        self.reads += 1
+        return self.data.get(key)
+
+    def put(self, key, value):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class TestCachedKVStore(unittest.TestCase):
+    """Test cases for cached reads."""
+
+    def setUp(self):
+        """Set up a cache over a store holding one manifest."""
+        self.store = DictStore()
+        self.store.put(b"m", encode_value({"name": "pkg", "files": ["a.py"]}))
+        self.store.put(b"s", b"text")
+        self.cache = CachedKVStore(self.store, max_entries=10, ttl=60)
+
+    def test_hits_skip_the_store(self):
+        """Test that a cached key is read from the store once."""
+        for _ in range(3):
+            self.assertEqual(get_decoded(self.cache, b"m", decode_value)[1]["name"], "pkg")
+        self.assertEqual(get_decoded(self.cache, b"s", decode_value), (True, "text"))
+        self.assertEqual(get_decoded(self.cache, b"missing", decode_value), (False, None))
+        self.assertEqual(self.store.reads, 3)
+
+    def test_mutating_a_result_leaves_the_cache(self):
+        """Test that readers get their own copies of cached containers."""
+        first = get_decoded(self.cache, b"m", decode_value)[1]
+        first["files"].append("b.py")
+        second = get_decoded(self.cache, b"m", decode_value)[1]
+        second["name"] = "changed"
+        third = get_many_decoded(self.cache, [b"m", b"m"], decode_value)
+        self.assertEqual(third[0][1], {"name": "pkg", "files": ["a.py"]})
+        self.assertIsNot(third[0][1], third[1][1])
+
+    def test_many_decoded_copies_misses(self):
+        """Test that a value returned on a miss is not the cached one."""
+        _, value = get_many_decoded(self.cache, [b"m"], decode_value)[0]
+        value["files"].clear()
+        self.assertEqual(get_decoded(self.cache, b"m", decode_value)[1]["files"], ["a.py"])
+
+    def test_write_invalidates(self):
+        """Test that writes through the cache are seen by the next read."""
+        get_decoded(self.cache, b"s", decode_value)
+        self.cache.put(b"s", b"new")
+        self.assertEqual(get_decoded(self.cache, b"s", decode_value), (True, "new"))
+
+
+class TestGetKVStore(unittest.TestCase):
+    """Test cases for choosing the cache of a runtime's store."""
+
+    def setUp(self):
+        """Set up a KV directory."""
+        self.directory = tempfile.mkdtemp(prefix="kv-cache-test-")
+
+    def tearDown(self):
+        """Close the shared store and remove its directory."""
+        key = str(Path(self.directory).resolve())
+        kv_store._caches.pop(key, None)
+        store = kv_store._stores.pop(key, None)
+        if store is not None:
+            store.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_directory_cache_shared_and_rebuilt(self):
+        """Test that runtimes share a directory's cache until its settings change."""
+        first = get_kv_store(types.SimpleNamespace(kv_dir=self.directory, kv_cache={"max_entries": 5}))
+        second = get_kv_store(types.SimpleNamespace(kv_dir=self.directory, kv_cache={"max_entries": 5}))
+        self.assertIsInstance(first, CachedKVStore)
+        self.assertIs(first, second)
+
+        resized = get_kv_store(types.SimpleNamespace(kv_dir=self.directory, kv_cache={"max_entries": 9, "ttl": 2}))
+        self.assertIsNot(resized, first)
+        self.assertEqual((resized.max_entries, resized.ttl), (9, 2.0))
+        self.assertIs(resized.store, first.store)
+
+        uncached = get_kv_store(types.SimpleNamespace(kv_dir=self.directory, kv_cache={"max_entries": 0}))
+        self.assertIsInstance(uncached, LogKVStore)
+
+    def test_host_store_cache_released_with_runtime(self):
+        """Test that the cache over a host store is not kept by the module."""
+        runtime = types.SimpleNamespace(kv_store=DictStore(), kv_cache={"max_entries": 5})
+        cache = get_kv_store(runtime)
+        self.assertIs(get_kv_store(runtime), cache)
+        runtime.kv_cache = {"max_entries": 5, "ttl": 1}
+        self.assertEqual(get_kv_store(runtime).ttl, 1.0)
+
+        store = weakref.ref(runtime.kv_store)
+        del runtime, cache
+        gc.collect()
+        self.assertIsNone(store())
+
+
+if __name__ == "__main__":
+    unittest.main()
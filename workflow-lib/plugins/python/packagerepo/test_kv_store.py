@@ -0,0 +1,75 @@
+"""Tests for the append-only KV log store."""
+
+import random
+import shutil
+import tempfile
+import unittest
+
+from .kv_store import LogKVStore
+
+
+class TestLogKVStore(unittest.TestCase):
+    """Test cases for LogKVStore."""
+
+    def setUp(self):
+        """Set up a store in a temporary directory."""
+        self.directory = tempfile.mkdtemp(prefix="kv-store-test-")
+        self.store = LogKVStore(self.directory, sync=False)
+
+    def tearDown(self):
+        """Close the store and remove its directory."""
+        self.store.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def reopen(self, **kwargs):
+        self.store.close()
+        self.store = LogKVStore(self.directory, sync=False, **kwargs)
+
+    def test_scan_prefix_sorted(self):
+        """Test that a scan returns matching keys in order and stops at the prefix end."""
+        self.store.write_batch([(b"b/2", b"2"), (b"a/1", b"x"), (b"b/1", b"1"), (b"b0", b"y"), (b"b/3", b"3")])
+        self.assertEqual(self.store.scan_prefix(b"b/"), [(b"b/1", b"1"), (b"b/2", b"2"), (b"b/3", b"3")])
+        self.assertEqual(self.store.scan_prefix(b"b/", limit=2), [(b"b/1", b"1"), (b"b/2", b"2")])
+        self.assertEqual(self.store.scan_prefix(b"b/", limit=0), [])
+        self.assertEqual(self.store.scan_prefix(b"c"), [])
+        self.assertEqual(len(self.store.scan_prefix(b"")), 5)
+
+    def test_deleted_and_overwritten_keys(self):
+        """Test that deletes leave the scan and overwrites are listed once."""
+        self.store.put(b"k/1", b"old")
+        self.store.put(b"k/2", b"2")
+        self.store.put(b"k/1", b"new")
+        self.store.delete(b"k/2")
+        self.store.delete(b"k/missing")
+        self.assertEqual(self.store.scan_prefix(b"k/"), [(b"k/1", b"new")])
+
+    def test_scan_after_reopen_and_compaction(self):
+        """Test that the key order is rebuilt from the log."""
+        self.store.write_batch([(b"k/%d" % n, b"v") for n in (3, 1, 2)])
+        self.store.delete(b"k/2")
+        self.reopen()
+        self.assertEqual([key for key, _ in self.store.scan_prefix(b"k/")], [b"k/1", b"k/3"])
+        self.store.compact()
+        self.store.put(b"k/0", b"v")
+        self.assertEqual([key for key, _ in self.store.scan_prefix(b"k/")], [b"k/0", b"k/1", b"k/3"])
+
+    def test_matches_full_sort(self):
+        """Test scans against sorting every key after random writes."""
+        rng = random.Random(7)
+        expected = {}
+        for _ in range(500):
+            key = b"%s/%d" % (rng.choice([b"a", b"ab", b"b"]), rng.randrange(60))
+            if rng.random() < 0.3:
+                self.store.delete(key)
+                expected.pop(key, None)
+            else:
+                value = str(rng.random()).encode()
+                self.store.put(key, value)
+                expected[key] = value
+        for prefix in (b"", b"a", b"ab/", b"b/1"):
+            want = sorted((key, value) for key, value in expected.items() if key.startswith(prefix))
+            self.assertEqual(self.store.scan_prefix(prefix), want)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Tests for the plugin manifest index."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from . import manifest_index
+from .manifest_index import INDEX_FILENAME, build_manifest_index, load_manifest_index
+
+
+def write_plugin(root, category, name, plugin_type, **metadata):
+    """Create a plugin directory with a package.json manifest."""
+    directory = Path(root) / category / name
+    directory.mkdir(parents=True)
+    manifest = {
+        "name": f"@metabuilder/{name}",
+        "main": f"{name}.py",
+        "metadata": {"plugin_type": plugin_type, "category": category, **metadata},
+    }
+    (directory / "package.json").write_text(json.dumps(manifest))
+    return directory
+
+
+class TestManifestIndex(unittest.TestCase):
+    """Test cases for building and loading the index."""
+
+    def setUp(self):
+        """Set up a plugins tree outside the bundled directory."""
+        self.root = Path(tempfile.mkdtemp(prefix="manifest-index-test-"))
+        write_plugin(self.root, "math", "math_add", "math.add", **{"class": "MathAdd", "capabilities": ["pure"]})
+        write_plugin(self.root, "string", "string_upper", "string.upper", label="Upper")
+
+    def tearDown(self):
+        """Remove the plugins tree."""
+        shutil.rmtree(self.root, ignore_errors=True)
+        manifest_index._loaded.pop(str(self.root.resolve()), None)
+
+    def test_entries_hold_lookup_fields_only(self):
+        """Test that entries carry what lookups need, not whole manifests."""
+        index = build_manifest_index(self.root)
+        self.assertEqual(index["categories"], ["math", "string"])
+        self.assertEqual(index["plugins"]["math.add"], {
+            "module": "autometabuilder.workflow.plugins.math.math_add.math_add",
+            "class": "MathAdd",
+            "category": "math",
+            "capabilities": ["pure"],
+            "label": None,
+            "path": "math/math_add",
+        })
+
+    def test_packages_stored_beside_entries(self):
+        """Test that each package.json is kept in its own section, keyed by node type."""
+        index = build_manifest_index(self.root)
+        self.assertEqual(sorted(index["packages"]), ["math.add", "string.upper"])
+        self.assertEqual(index["packages"]["string.upper"]["metadata"]["label"], "Upper")
+
+    def test_other_directories_not_written(self):
+        """Test that indexing a user directory leaves it untouched."""
+        index = load_manifest_index(self.root)
+        self.assertIn("string.upper", index["plugins"])
+        self.assertEqual(sorted(os.listdir(self.root)), ["math", "string"])
+
+    def test_environment_path_only_for_bundled_directory(self):
+        """Test that WORKFLOW_PLUGIN_INDEX does not receive other directories' indexes."""
+        target = self.root / "elsewhere.json"
+        with mock.patch.dict(os.environ, {manifest_index.INDEX_ENV_VAR: str(target)}):
+            load_manifest_index(self.root)
+        self.assertFalse(target.exists())
+
+    def test_explicit_index_path_written(self):
+        """Test that an explicit index path is written and reused."""
+        target = Path(tempfile.mkdtemp(prefix="manifest-index-out-")) / INDEX_FILENAME
+        try:
+            load_manifest_index(self.root, index_path=target)
+            self.assertTrue(target.exists())
+            manifest_index._loaded.clear()
+            with mock.patch.object(manifest_index, "build_manifest_index") as build:
+                index = load_manifest_index(self.root, index_path=target)
+            build.assert_not_called()
+            self.assertIn("math.add", index["plugins"])
+        finally:
+            shutil.rmtree(target.parent, ignore_errors=True)
+
+    def test_index_file_mode_follows_umask(self):
+        """Test that the written index is 0644 less the umask, not mkstemp's 0600."""
+        directory = Path(tempfile.mkdtemp(prefix="manifest-index-out-"))
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        for umask, mode in ((0o022, 0o644), (0o027, 0o640)):
+            with self.subTest(umask=oct(umask)):
+                previous = os.umask(umask)
+                try:
+                    manifest_index.write_manifest_index(build_manifest_index(self.root), directory / INDEX_FILENAME)
+                finally:
+                    os.umask(previous)
+                self.assertEqual((directory / INDEX_FILENAME).stat().st_mode & 0o777, mode)
+
+    def test_added_plugin_rebuilds_index(self):
+        """Test that a new plugin directory makes the cached index stale."""
+        load_manifest_index(self.root)
+        write_plugin(self.root, "math", "math_abs", "math.abs")
+        self.assertIn("math.abs", load_manifest_index(self.root)["plugins"])
+
+    def test_old_index_version_rebuilt(self):
+        """Test that an index holding full manifests is replaced."""
+        target = self.root.parent / f"{self.root.name}.json"
+        try:
+            index = build_manifest_index(self.root)
+            index["version"] = 1
+            index["plugins"]["math.add"]["manifest"] = {"name": "old"}
+            target.write_text(json.dumps(index))
+            loaded = load_manifest_index(self.root, index_path=target)
+            self.assertNotIn("manifest", loaded["plugins"]["math.add"])
+            self.assertEqual(json.loads(target.read_text())["version"], manifest_index.INDEX_VERSION)
+        finally:
+            target.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    unittest.main()